@@ -0,0 +1,260 @@
+"""Benchmarks for Signal parsing, operations and plot rendering.
+
+Each case runs for every size and index distribution (``dense``: contiguous
+indices, ``sparse``: unique indices spread over a range 100x the size). Lazy
+operations (multiply, shift, fold) are timed together with materializing
+their result so the work is actually done. Plotting renders selected series
+on an off-screen Agg canvas.
+
+Results are written as JSON and compared with a stored baseline; a case is a
+regression when its best time grows by more than ``--threshold``. Timings
+are machine-specific, so the baseline is not part of the repository: create
+one with ``--update-baseline`` on the machine that runs the comparison. A run
+without a baseline exits with status 2 rather than passing silently.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.bench_signal --output bench.json
+    python -m benchmarks.bench_signal --update-baseline
+    python -m benchmarks.bench_signal --sizes 1e2,1e4 --quick
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from signal_app.signals import Signal
+from signal_app.storage import from_arrays
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DISTRIBUTIONS = ("dense", "sparse")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Stop repeating a case once it has used this much time.
+TIME_BUDGET = 2.0
+# Cases faster than this are too noisy to flag as regressions.
+NOISE_FLOOR = 20e-6
+
+
+def make_arrays(size: int, dist: str, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted indices and random values for one benchmark input."""
+    rng = np.random.default_rng(seed)
+    if dist == "dense":
+        indices = np.arange(-(size // 2), size - size // 2, dtype=np.int64)
+    else:
+        indices = np.sort(rng.choice(100 * size, size=size, replace=False)).astype(np.int64)
+    return indices, rng.standard_normal(size)
+
+
+def make_lines(indices: np.ndarray, values: np.ndarray) -> List[str]:
+    """TXT format lines (with the ``0 / 0`` prefix) for the arrays."""
+    rows = [f"{i} {v!r}" for i, v in zip(indices.tolist(), values.tolist())]
+    return ["0", "0", str(len(rows))] + rows
+
+
+def time_case(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Best and median wall time of ``fn`` over up to ``repeat`` runs."""
+    times = []
+    spent = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        spent += elapsed
+        if spent > TIME_BUDGET:
+            break
+    return {"min": min(times), "median": statistics.median(times), "runs": len(times)}
+
+
+def _plot_case(sig: Signal) -> Callable[[], object]:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from signal_app.plotting import LodPlotter
+
+    fig = Figure(figsize=(6, 4), dpi=100)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    plotter = LodPlotter(ax)
+
+    def render() -> None:
+        plotter.detach()
+        ax.clear()
+        plotter.set_series([("sig", *sig.to_sorted_arrays())])
+        fig.canvas.draw()
+
+    return render
+
+
+class CaseInputs:
+    """Inputs for one size and distribution, each built on first use.
+
+    Cases only touch the inputs they measure, so a run filtered with
+    ``--case`` does not pay for text lines, files or figures it never uses.
+    """
+
+    def __init__(self, size: int, dist: str, workdir: str) -> None:
+        self.size = size
+        self.dist = dist
+        self.workdir = workdir
+
+    @functools.cached_property
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        return make_arrays(self.size, self.dist)
+
+    @functools.cached_property
+    def lines(self) -> List[str]:
+        return make_lines(*self.arrays)
+
+    @functools.cached_property
+    def path(self) -> str:
+        path = os.path.join(self.workdir, f"{self.dist}_{self.size}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.lines))
+        return path
+
+    @functools.cached_property
+    def sig(self) -> Signal:
+        return Signal(from_arrays(*self.arrays))
+
+    @functools.cached_property
+    def other(self) -> Signal:
+        return Signal(from_arrays(*make_arrays(self.size, self.dist, seed=1)))
+
+
+# Case name -> function building the timed callable from its inputs.
+CASES: Dict[str, Callable[[CaseInputs], Callable[[], object]]] = {
+    "from_txt_lines": lambda inp: functools.partial(Signal.from_txt_lines, inp.lines),
+    "from_txt_file": lambda inp: functools.partial(Signal.from_txt_file, inp.path),
+    "add": lambda inp: functools.partial(inp.sig.add, inp.other),
+    "subtract": lambda inp: functools.partial(inp.sig.subtract, inp.other),
+    "multiply": lambda inp: lambda: inp.sig.multiply(1.5).materialize(),
+    "shift": lambda inp: lambda: inp.sig.shift(3).materialize(),
+    "fold": lambda inp: lambda: inp.sig.fold().materialize(),
+    "clone": lambda inp: inp.sig.clone,
+    "to_sorted_series": lambda inp: inp.sig.to_sorted_series,
+    "plot": lambda inp: _plot_case(inp.sig),
+}
+
+
+def run(sizes: Sequence[int], repeat: int, cases: Sequence[str] | None) -> Dict[str, dict]:
+    """Run the suite and return results keyed by ``case/dist/size``."""
+    unknown = sorted(set(cases or ()) - set(CASES))
+    if unknown:
+        raise ValueError(
+            f"Unknown case(s) {', '.join(unknown)}; choose from {', '.join(CASES)}"
+        )
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            for dist in DISTRIBUTIONS:
+                inputs = CaseInputs(size, dist, workdir)
+                for case, setup in CASES.items():
+                    if cases and case not in cases:
+                        continue
+                    key = f"{case}/{dist}/{size}"
+                    results[key] = time_case(setup(inputs), repeat)
+                    print(f"{key:40s} {results[key]['min'] * 1e3:12.3f} ms", flush=True)
+    return results
+
+
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    threshold: float,
+) -> List[str]:
+    """Return descriptions of cases slower than baseline by over ``threshold``."""
+    regressions = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if base is None or max(res["min"], base["min"]) < NOISE_FLOOR:
+            continue
+        ratio = res["min"] / base["min"]
+        if ratio > 1.0 + threshold:
+            regressions.append(
+                f"{key}: {base['min'] * 1e3:.3f} ms -> {res['min'] * 1e3:.3f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def _metadata() -> Dict[str, str]:
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="comma-separated sample counts (e.g. 1e2,1e4)",
+    )
+    parser.add_argument("--quick", action="store_true", help="only sizes up to 1e5")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case")
+    parser.add_argument("--case", action="append", help="only run the named case(s)")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)"
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="store these results as the baseline"
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(s)) for s in args.sizes.split(",") if s.strip()]
+    if args.quick:
+        sizes = [s for s in sizes if s <= 100_000]
+    try:
+        results = run(sizes, args.repeat, args.case)
+    except ValueError as exc:
+        parser.error(str(exc))
+    report = {"meta": _metadata(), "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(
+            f"error: no baseline at {args.baseline}; run with --update-baseline to create one",
+            file=sys.stderr,
+        )
+        return 2
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    missing = sorted(set(report["results"]) - set(baseline))
+    if missing:
+        print(f"{len(missing)} case(s) not in the baseline: {', '.join(missing)}")
+    regressions = compare(report["results"], baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,11 @@
-from signal_app.app import main
+import sys
 
 if __name__ == "__main__":
-	   main()
+	if len(sys.argv) > 1:
+		# Arguments select the headless batch mode (see signal_app.batch).
+		from signal_app.batch import main as batch_main
+
+		sys.exit(batch_main(sys.argv[1:]))
+	from signal_app.app import main
+
+	main()
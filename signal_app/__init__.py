@@ -2,6 +2,24 @@
 
 __all__ = [
 	"signals",
+	"storage",
+	"txtio",
+	"binio",
+	"cache",
+	"instrument",
+	"multichannel",
+	"outofcore",
+	"convolution",
+	"filters",
+	"resample",
+	"spectral",
+	"graph",
+	"plotting",
+	"streaming",
+	"jobs",
+	"watch",
+	"batch",
+	"verify",
 	"app",
 ]
 
@@ -1,22 +1,43 @@
 from __future__ import annotations
 
+import importlib.util
+import os
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-
-try:
-    from matplotlib.backends.backend_tkagg import (
-        FigureCanvasTkAgg,
-        NavigationToolbar2Tk,
-    )
-    from matplotlib.figure import Figure
-    _MATPLOTLIB_IMPORT_ERROR: Exception | None = None
-except ImportError as _exc:  # noqa: N816 - keep name consistent for clarity
-    FigureCanvasTkAgg = None  # type: ignore[assignment]
-    NavigationToolbar2Tk = None  # type: ignore[assignment]
-    Figure = None  # type: ignore[assignment]
-    _MATPLOTLIB_IMPORT_ERROR = _exc
-
+from tkinter import filedialog, messagebox, simpledialog, ttk
+from typing import Callable
+
+import numpy as np
+
+from signal_app import instrument
+from signal_app.binio import BINARY_SUFFIX
+from signal_app.cache import ParseCache
+from signal_app.filters import FILTER_KINDS, make_filter
+from signal_app.graph import Node, SignalGraph
+from signal_app.jobs import Job, JobManager
+from signal_app.multichannel import SignalBatch, parse_channels
+from signal_app.plotting import LodPlotter, ScrollingPlot
 from signal_app.signals import Signal
+from signal_app.spectral import SpectrumCache
+from signal_app.streaming import (
+    Delay,
+    Filtered,
+    Scale,
+    StreamPipeline,
+    open_stream,
+    parse_stream_expression,
+)
+from signal_app.watch import FileWatcher
+
+
+# Milliseconds between stream plot updates.
+STREAM_POLL_MS = 50
+# Plot mode -> y-axis label (the time mode draws the samples themselves).
+PLOT_MODES = {
+    "Time": "x[n]",
+    "Magnitude": "|X(f)|",
+    "Phase": "arg X(f) (rad)",
+    "PSD": "PSD (dB)",
+}
 
 
 class SignalApp(tk.Tk):
@@ -26,19 +47,40 @@ class SignalApp(tk.Tk):
         self.title("DSP Signal Tool")
         self.geometry("1000x650")
 
-        self.signals: list[Signal] = []
+        self.graph = SignalGraph()
+        self.nodes: list[Node] = []
         self.selected_indices: set[int] = set()
-
-        if _MATPLOTLIB_IMPORT_ERROR is not None:
+        self.jobs = JobManager(self.after, on_change=self._refresh_jobs)
+        # Node key -> job computing that node and the callbacks waiting for
+        # it, so deriving and saving the same node share one computation.
+        self.pending: dict[str, tuple[Job, list[tuple[Callable, Callable]]]] = {}
+        self.parse_cache = ParseCache()
+        self.spectrum_cache = SpectrumCache()
+        self.watcher = FileWatcher(self.after, self._on_source_changed)
+        self.watch_var = tk.BooleanVar(value=False)
+        self.profile_var = tk.BooleanVar(value=instrument.is_enabled())
+        self.batches: list[SignalBatch] = []
+        self.stream: StreamPipeline | None = None
+        self.stream_plot: ScrollingPlot | None = None
+
+        # The plot is built once the window is on screen (see `_ensure_plot`).
+        self.ax = None
+        self.canvas = None
+        self.plotter: LodPlotter | None = None
+
+        if importlib.util.find_spec("matplotlib") is None:
             raise RuntimeError(
                 "Matplotlib is required for plotting. Please install it with 'pip install matplotlib'."
-            ) from _MATPLOTLIB_IMPORT_ERROR
+            )
 
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.bind("<Map>", self._on_map, add="+")
 
     def _build_ui(self) -> None:
         """Construct the menu, left controls, and right plotting canvas."""
         self._build_menu()
+        self._build_status()
 
         root_pane = ttk.PanedWindow(self, orient=tk.HORIZONTAL)
         root_pane.pack(fill=tk.BOTH, expand=True)
@@ -54,9 +96,12 @@ class SignalApp(tk.Tk):
         header_row = ttk.Frame(left_frame)
         header_row.pack(fill=tk.X, padx=8, pady=(8, 0))
         ttk.Label(header_row, text="Signals").pack(side=tk.LEFT)
-        ttk.Button(header_row, text="Load TXT...", command=self._load_signal).pack(
+        ttk.Button(header_row, text="Load...", command=self._load_signal).pack(
             side=tk.RIGHT
         )
+        ttk.Button(header_row, text="Remove", command=self._on_remove).pack(
+            side=tk.RIGHT, padx=4
+        )
 
         self.signal_list = tk.Listbox(left_frame, selectmode=tk.EXTENDED)
         self.signal_list.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
@@ -90,7 +135,95 @@ class SignalApp(tk.Tk):
         ttk.Button(shift_row, text="Apply", command=self._on_shift).pack(side=tk.LEFT)
         ttk.Button(shift_row, text="Fold x(-n)", command=self._on_fold).pack(side=tk.LEFT, padx=6)
 
-        # Right: Matplotlib Figure
+        # Convolve / Correlate
+        conv_row = ttk.Frame(ops)
+        conv_row.pack(fill=tk.X, padx=8, pady=4)
+        ttk.Button(conv_row, text="Convolve selected", command=self._on_convolve).pack(side=tk.LEFT)
+        ttk.Button(conv_row, text="Correlate (1st, 2nd)", command=self._on_correlate).pack(side=tk.LEFT, padx=6)
+
+        # Resample
+        resample_row = ttk.Frame(ops)
+        resample_row.pack(fill=tk.X, padx=8, pady=4)
+        ttk.Label(resample_row, text="Resample L").pack(side=tk.LEFT)
+        self.resample_up_var = tk.StringVar(value="1")
+        ttk.Entry(resample_row, width=4, textvariable=self.resample_up_var).pack(side=tk.LEFT, padx=4)
+        ttk.Label(resample_row, text="/ M").pack(side=tk.LEFT)
+        self.resample_down_var = tk.StringVar(value="2")
+        ttk.Entry(resample_row, width=4, textvariable=self.resample_down_var).pack(side=tk.LEFT, padx=4)
+        ttk.Button(resample_row, text="Apply", command=self._on_resample).pack(side=tk.LEFT)
+
+        # Filter
+        filter_row = ttk.Frame(ops)
+        filter_row.pack(fill=tk.X, padx=8, pady=4)
+        self.filter_combo = ttk.Combobox(
+            filter_row, state="readonly", width=22, values=list(FILTER_KINDS)
+        )
+        self.filter_combo.current(0)
+        self.filter_combo.pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar(value="5")
+        ttk.Entry(filter_row, width=6, textvariable=self.filter_var).pack(side=tk.LEFT, padx=4)
+        ttk.Button(filter_row, text="Apply", command=self._on_filter).pack(side=tk.LEFT)
+        self.filter_stream_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filter_row, text="Streams", variable=self.filter_stream_var).pack(
+            side=tk.LEFT, padx=6
+        )
+
+        # Left: Multichannel batches
+        batches = ttk.LabelFrame(left_frame, text="Batches")
+        batches.pack(fill=tk.X, padx=8, pady=(0, 8))
+        batch_row = ttk.Frame(batches)
+        batch_row.pack(fill=tk.X, padx=8, pady=4)
+        self.batch_combo = ttk.Combobox(batch_row, state="readonly", width=28)
+        self.batch_combo.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Button(batch_row, text="Load...", command=self._load_batch).pack(side=tk.LEFT, padx=4)
+
+        chan_row = ttk.Frame(batches)
+        chan_row.pack(fill=tk.X, padx=8, pady=4)
+        ttk.Label(chan_row, text="Channels").pack(side=tk.LEFT)
+        self.channels_var = tk.StringVar(value="0-3")
+        ttk.Entry(chan_row, width=10, textvariable=self.channels_var).pack(side=tk.LEFT, padx=4)
+        ttk.Button(chan_row, text="Plot", command=self._on_plot_channels).pack(side=tk.LEFT)
+
+        batch_ops = ttk.Frame(batches)
+        batch_ops.pack(fill=tk.X, padx=8, pady=4)
+        ttk.Button(batch_ops, text="Multiply", command=self._on_batch_multiply).pack(side=tk.LEFT)
+        ttk.Button(batch_ops, text="Shift", command=self._on_batch_shift).pack(side=tk.LEFT, padx=6)
+        ttk.Button(batch_ops, text="Fold", command=self._on_batch_fold).pack(side=tk.LEFT)
+
+        # Right: plot mode
+        mode_row = ttk.Frame(right_frame)
+        mode_row.pack(fill=tk.X, padx=8, pady=(8, 0))
+        ttk.Label(mode_row, text="View").pack(side=tk.LEFT)
+        self.plot_mode = ttk.Combobox(mode_row, state="readonly", width=12, values=list(PLOT_MODES))
+        self.plot_mode.current(0)
+        self.plot_mode.pack(side=tk.LEFT, padx=4)
+        self.plot_mode.bind("<<ComboboxSelected>>", lambda _e: self._plot_selected())
+
+        # Right: Matplotlib figure, built by `_ensure_plot`
+        self.plot_frame = right_frame
+        self.plot_placeholder = ttk.Label(right_frame, text="Loading plot...", anchor=tk.CENTER)
+        self.plot_placeholder.pack(fill=tk.BOTH, expand=True)
+
+    def _on_map(self, event) -> None:
+        if event.widget is self and self.canvas is None:
+            self.after_idle(self._ensure_plot)
+
+    def _ensure_plot(self) -> None:
+        """Build the Matplotlib canvas on first use.
+
+        Importing Matplotlib and its Tk backend is the slowest part of
+        startup, so it happens after the window is first shown (or when
+        something needs the axes earlier).
+        """
+        if self.canvas is not None:
+            return
+        from matplotlib.backends.backend_tkagg import (
+            FigureCanvasTkAgg,
+            NavigationToolbar2Tk,
+        )
+        from matplotlib.figure import Figure
+
+        self.plot_placeholder.destroy()
         fig = Figure(figsize=(6, 4), dpi=100)
         self.ax = fig.add_subplot(111)
         self.ax.set_title("Signal Plot")
@@ -98,10 +231,11 @@ class SignalApp(tk.Tk):
         self.ax.set_ylabel("x[n]")
         self.ax.grid(True, linestyle=":", alpha=0.6)
 
-        self.canvas = FigureCanvasTkAgg(fig, master=right_frame)
+        self.canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
+        self.plotter = LodPlotter(self.ax, schedule=self.after_idle)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        toolbar = NavigationToolbar2Tk(self.canvas, right_frame)
+        toolbar = NavigationToolbar2Tk(self.canvas, self.plot_frame)
         toolbar.update()
 
     def _build_menu(self) -> None:
@@ -109,29 +243,327 @@ class SignalApp(tk.Tk):
         menubar = tk.Menu(self)
         file_menu = tk.Menu(menubar, tearoff=False)
         file_menu.add_command(
-            label="Load Signal from TXT...",
+            label="Load Signal...",
             command=self._load_signal,
             accelerator="Ctrl+O",
         )
+        file_menu.add_command(
+            label="Save Selected As...",
+            command=self._save_signal,
+        )
+        file_menu.add_command(label="Open Stream...", command=self._open_stream)
+        file_menu.add_command(label="Stop Stream", command=self._stop_stream)
+        file_menu.add_checkbutton(
+            label="Watch Source Files",
+            variable=self.watch_var,
+            command=self._toggle_watch,
+        )
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.destroy)
+        file_menu.add_command(label="Exit", command=self._on_close)
         menubar.add_cascade(label="File", menu=file_menu)
 
+        tools_menu = tk.Menu(menubar, tearoff=False)
+        tools_menu.add_checkbutton(
+            label="Instrumentation",
+            variable=self.profile_var,
+            command=self._toggle_profiling,
+        )
+        tools_menu.add_command(label="Dump Stats...", command=self._dump_stats)
+        tools_menu.add_command(label="Reset Stats", command=self._reset_stats)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+
         self.config(menu=menubar)
         # Keyboard shortcut
         self.bind_all("<Control-o>", lambda _e: self._load_signal())
 
+    def _build_status(self) -> None:
+        """Create the bottom status area listing background jobs."""
+        status = ttk.Frame(self)
+        status.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=(0, 8))
+        top_row = ttk.Frame(status)
+        top_row.pack(fill=tk.X)
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(top_row, textvariable=self.status_var).pack(side=tk.LEFT)
+        ttk.Button(top_row, text="Cancel job", command=self._on_cancel_job).pack(side=tk.RIGHT)
+        self.perf_var = tk.StringVar(value="")
+        ttk.Label(top_row, textvariable=self.perf_var).pack(side=tk.RIGHT, padx=8)
+
+        self.job_view = ttk.Treeview(
+            status, columns=("progress", "status"), height=3, selectmode=tk.BROWSE
+        )
+        self.job_view.heading("#0", text="Job")
+        self.job_view.heading("progress", text="Progress")
+        self.job_view.heading("status", text="Status")
+        self.job_view.column("progress", width=80, anchor=tk.E, stretch=False)
+        self.job_view.column("status", width=90, stretch=False)
+        self.job_view.pack(fill=tk.X)
+
+    def _refresh_jobs(self) -> None:
+        """Redraw the job list and summary from the job manager."""
+        self.job_view.delete(*self.job_view.get_children())
+        for job in self.jobs.jobs:
+            self.job_view.insert(
+                "",
+                tk.END,
+                iid=str(job.id),
+                text=job.title,
+                values=(f"{job.progress:.0%}", job.status),
+            )
+        active = len(self.jobs.active())
+        cache = self.parse_cache.stats
+        self.status_var.set(
+            (f"{active} job(s) running" if active else "Ready")
+            + f" | parse cache: {cache.hits} hit(s), {cache.misses} miss(es)"
+        )
+        self._refresh_perf()
+
+    def _refresh_perf(self) -> None:
+        """Show the last instrumented call and the memory held by signals."""
+        text = f"signals: {self._signals_memory() / 2**20:.1f} MiB"
+        last = instrument.last_call()
+        if instrument.is_enabled() and last is not None:
+            name, seconds = last
+            text = f"last: {name} {seconds * 1e3:.1f} ms | " + text
+        self.perf_var.set(text)
+
+    def _signals_memory(self) -> int:
+        """Bytes of loaded signals plus cached derived results."""
+        sources = sum(
+            node.result.memory_usage()
+            for node in self.nodes
+            if node.is_source and node.result is not None
+        )
+        return sources + self.graph.memory_usage()
+
+    def _toggle_profiling(self) -> None:
+        if self.profile_var.get():
+            instrument.enable()
+        else:
+            instrument.disable()
+        self._refresh_perf()
+
+    def _dump_stats(self) -> None:
+        """Write the instrumentation totals as JSON or CSV (by extension)."""
+        path = filedialog.asksaveasfilename(
+            title="Dump Stats",
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("CSV", "*.csv")],
+        )
+        if not path:
+            return
+        try:
+            if path.lower().endswith(".csv"):
+                instrument.dump_csv(path)
+            else:
+                instrument.dump_json(path)
+        except OSError as exc:
+            messagebox.showerror("Dump Stats", str(exc))
+
+    def _reset_stats(self) -> None:
+        instrument.reset()
+        self._refresh_perf()
+
+    def _on_cancel_job(self) -> None:
+        """Cancel the job selected in the status area."""
+        for iid in self.job_view.selection():
+            for job in self.jobs.active():
+                if str(job.id) == iid:
+                    self.jobs.cancel(job)
+
+    def _on_close(self) -> None:
+        """Cancel background jobs and close the window."""
+        self.watcher.stop()
+        self._stop_stream()
+        self.jobs.shutdown()
+        self.destroy()
+
+    def _derive(self, title: str, node: Node) -> None:
+        """Compute ``node`` in the background and list it.
+
+        A node that is already listed is only selected: the graph returned
+        the existing node for an identical request.
+        """
+        if node in self.nodes:
+            self._select_node(node)
+            return
+        self._when_computed(
+            title,
+            node,
+            lambda _sig: self._add_node(node),
+            lambda exc: messagebox.showerror(title, str(exc)),
+        )
+
+    def _when_computed(
+        self,
+        title: str,
+        node: Node,
+        on_done: Callable[[Signal], None],
+        on_error: Callable[[BaseException], None],
+    ) -> None:
+        """Call ``on_done`` with the result of ``node`` once it is computed.
+
+        Requests made while a job for ``node`` is still active wait for that
+        job instead of starting another one.
+        """
+        entry = self.pending.get(node.key)
+        if entry is None or entry[0] not in self.jobs.active():
+            job = self.jobs.submit(
+                title,
+                lambda job: self.graph.evaluate(node, progress=job.report),
+                on_done=lambda sig: self._on_computed(node, sig, None),
+                on_error=lambda exc: self._on_computed(node, None, exc),
+            )
+            entry = self.pending[node.key] = (job, [])
+        entry[1].append((on_done, on_error))
+
+    def _on_computed(self, node: Node, sig: Signal | None, exc: BaseException | None) -> None:
+        _job, waiting = self.pending.pop(node.key)
+        for on_done, on_error in waiting:
+            if exc is None:
+                on_done(sig)
+            else:
+                on_error(exc)
+
     def _on_select(self, _event=None) -> None:
         """Handle list selection changes and update plot."""
         self.selected_indices = set(self.signal_list.curselection())
+        self._stop_stream()
         self._plot_selected()
 
-    def _add_signal(self, sig: Signal) -> None:
-        """Append a new signal to the list and display name in the UI."""
-        self.signals.append(sig)
-        display_name = sig.name or f"Signal {len(self.signals)}"
+    # Streaming
+    def _open_stream(self) -> None:
+        """Show a live stream as a scrolling plot.
+
+        Sources are a growing file, ``tcp://host:port`` or ``-`` for stdin;
+        ``a + b`` / ``a - b`` combine aligned streams. The Multiply and Shift
+        entries (k >= 0) are applied block by block, then the chosen filter
+        if its "Streams" box is ticked.
+        """
+        text = simpledialog.askstring(
+            "Open Stream",
+            "Source: file path, tcp://host:port or - (stdin).\n"
+            "Join sources with ' + ' or ' - ' to combine them.",
+            parent=self,
+        )
+        if not text:
+            return
+        sources = []
+        try:
+            specs, weights = parse_stream_expression(text)
+            scalar = self._parse_float(self.multiply_var.get(), default=1.0)
+            k = self._parse_int(self.shift_var.get(), default=0)
+            operations = [Scale(scalar)] if scalar != 1.0 else []
+            if k:
+                operations.append(Delay(k))
+            if self.filter_stream_var.get():
+                kind = FILTER_KINDS[self.filter_combo.get()]
+                value = self._parse_float(self.filter_var.get(), default=0.0)
+                operations.append(Filtered(make_filter(kind, value)))
+            for spec in specs:
+                sources.append(open_stream(spec))
+        except ValueError as exc:
+            for src in sources:
+                src.close()
+            messagebox.showerror("Open Stream", str(exc))
+            return
+        self._stop_stream()
+        self.signal_list.selection_clear(0, tk.END)
+        self.selected_indices = set()
+        self.stream = StreamPipeline(sources, weights, operations)
+        self._ensure_plot()
+        self.plotter.detach()
+        self.ax.clear()
+        self.ax.set_title(f"Stream: {text}")
+        self.ax.set_xlabel("n")
+        self.ax.set_ylabel("x[n]")
+        self.ax.grid(True, linestyle=":", alpha=0.6)
+        self.stream_plot = ScrollingPlot(self.ax, self.stream.buffer.capacity, label=text)
+        self.after(STREAM_POLL_MS, self._poll_stream)
+
+    def _poll_stream(self) -> None:
+        """Move new stream samples through the pipeline and blit the plot."""
+        stream = self.stream
+        if stream is None:
+            return
+        if stream.step():
+            self.stream_plot.update(*stream.buffer.arrays())
+        errors = [src.error for src in stream.sources if src.error is not None]
+        if errors or stream.ended:
+            self.status_var.set(f"Stream ended{': ' + str(errors[0]) if errors else ''}")
+            stream.close()
+            self.stream = None
+            return
+        self.after(STREAM_POLL_MS, self._poll_stream)
+
+    def _stop_stream(self) -> None:
+        """Close the current stream and remove its plot."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        if self.stream_plot is not None:
+            self.stream_plot.close()
+            self.stream_plot = None
+
+    def _add_node(self, node: Node) -> None:
+        """Append a graph node to the signal list (once)."""
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        display_name = node.name or f"Signal {len(self.nodes)}"
         self.signal_list.insert(tk.END, display_name)
 
+    def _add_source(self, path: str, sig: Signal) -> None:
+        """Register a loaded signal as a source node and list it."""
+        node = self.graph.source(sig, os.path.abspath(path), name=sig.name)
+        if node in self.nodes:
+            # Reloaded: derived results were updated or dropped, so redraw.
+            self._plot_selected()
+        else:
+            self.watcher.watch(os.path.abspath(path))
+        self._add_node(node)
+
+    def _toggle_watch(self) -> None:
+        """Start or stop polling the files of loaded signals for changes."""
+        if self.watch_var.get():
+            self.watcher.start()
+        else:
+            self.watcher.stop()
+
+    def _on_source_changed(self, path: str) -> None:
+        """Re-parse a changed source file; only its descendants are updated."""
+        self.jobs.submit(
+            f"Reload {os.path.basename(path)}",
+            self._load_job,
+            path,
+            self.parse_cache,
+            on_done=lambda sig: self._add_source(path, sig),
+            on_error=lambda exc: self.status_var.set(f"Reload of {path} failed: {exc}"),
+        )
+
+    def _select_node(self, node: Node) -> None:
+        """Select the list entry of ``node`` and plot it."""
+        idx = self.nodes.index(node)
+        self.signal_list.selection_clear(0, tk.END)
+        self.signal_list.selection_set(idx)
+        self.signal_list.see(idx)
+        self._on_select()
+
+    def _on_remove(self) -> None:
+        """Remove the selected signals and everything derived from them."""
+        for idx in sorted(self.selected_indices, reverse=True):
+            if idx < len(self.nodes):
+                node = self.nodes[idx]
+                if node.is_source:
+                    self.watcher.unwatch(node.params[0])
+                self.graph.remove(node)
+        keep = [n for n in self.nodes if n.key in self.graph.nodes]
+        self.nodes = []
+        self.signal_list.delete(0, tk.END)
+        for node in keep:
+            self._add_node(node)
+        self.selected_indices = set()
+        self._plot_selected()
+
     def _parse_float(self, s: str, default: float | None = None) -> float:
         """Parse string to float; return default if provided on failure."""
         try:
@@ -152,19 +584,170 @@ class SignalApp(tk.Tk):
 
     # Menu actions
     def _load_signal(self) -> None:
-        """Open a file dialog, parse a TXT signal, and add it to the list."""
-        path = filedialog.askopenfilename(
-            title="Select Signal TXT",
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")],
+        """Open a file dialog and load the chosen signal files in parallel.
+
+        Each file is parsed by a background job that reports progress and can
+        be cancelled from the status area.
+        """
+        paths = filedialog.askopenfilenames(
+            title="Select Signal Files",
+            filetypes=[
+                ("Signal Files", f"*.txt *{BINARY_SUFFIX}"),
+                ("Text Files", "*.txt"),
+                ("Binary Signal Files", f"*{BINARY_SUFFIX}"),
+                ("All Files", "*.*"),
+            ],
         )
-        if not path:
+        for path in paths:
+            self.jobs.submit(
+                f"Load {os.path.basename(path)}",
+                self._load_job,
+                path,
+                self.parse_cache,
+                on_done=lambda sig, p=path: self._add_source(p, sig),
+                on_error=lambda exc, p=path: messagebox.showerror(
+                    "Load Error", f"{p}: {exc}"
+                ),
+            )
+
+    @staticmethod
+    def _load_job(job: Job, path: str, cache: ParseCache) -> Signal:
+        """Worker: parse ``path`` (or fetch it from ``cache``) with progress."""
+        size = max(os.path.getsize(path), 1)
+        return Signal.from_file(
+            path, progress=lambda done: job.report(done / size), cache=cache
+        )
+
+    # Multichannel batches
+    def _load_batch(self) -> None:
+        """Load multi-column TXT or multichannel binary files as batches."""
+        paths = filedialog.askopenfilenames(
+            title="Select Multichannel Files",
+            filetypes=[
+                ("Signal Files", f"*.txt *{BINARY_SUFFIX}"),
+                ("All Files", "*.*"),
+            ],
+        )
+        for path in paths:
+            self.jobs.submit(
+                f"Load batch {os.path.basename(path)}",
+                self._load_batch_job,
+                path,
+                on_done=self._add_batch,
+                on_error=lambda exc, p=path: messagebox.showerror(
+                    "Load Error", f"{p}: {exc}"
+                ),
+            )
+
+    @staticmethod
+    def _load_batch_job(job: Job, path: str) -> SignalBatch:
+        """Worker: parse a multichannel file while reporting progress."""
+        size = max(os.path.getsize(path), 1)
+        return SignalBatch.from_file(path, progress=lambda done: job.report(done / size))
+
+    def _add_batch(self, batch: SignalBatch) -> None:
+        """List a batch in the Batches box and select it."""
+        self.batches.append(batch)
+        self.batch_combo["values"] = [
+            f"{b.name or 'batch'} ({b.channels} ch)" for b in self.batches
+        ]
+        self.batch_combo.current(len(self.batches) - 1)
+
+    def _current_batch(self, title: str) -> SignalBatch | None:
+        idx = self.batch_combo.current()
+        if idx < 0:
+            messagebox.showinfo(title, "Load a multichannel batch first.")
+            return None
+        return self.batches[idx]
+
+    def _on_plot_channels(self) -> None:
+        """Plot the chosen channels of the current batch as separate series."""
+        batch = self._current_batch("Plot Channels")
+        if batch is None:
             return
         try:
-            sig = Signal.from_txt_file(path)
-        except (OSError, ValueError) as exc:
-            messagebox.showerror("Load Error", str(exc))
+            channels = parse_channels(self.channels_var.get(), batch.channels)
+        except ValueError as exc:
+            messagebox.showerror("Plot Channels", str(exc))
             return
-        self._add_signal(sig)
+        self._stop_stream()
+        self.signal_list.selection_clear(0, tk.END)
+        self.selected_indices = set()
+        self._draw_series(
+            [
+                (f"{batch.name or 'batch'}[{batch.channel_names[c]}]", batch.indices, batch.values[c])
+                for c in channels
+            ]
+        )
+
+    def _on_batch_multiply(self) -> None:
+        """Scale the batch by one scalar or comma-separated per-channel scalars."""
+        batch = self._current_batch("Multiply")
+        if batch is None:
+            return
+        try:
+            scalars = [float(v) for v in self.multiply_var.get().split(",")]
+            factor = scalars[0] if len(scalars) == 1 else scalars
+            name = f"({batch.name or 'batch'})*{self.multiply_var.get()}"
+        except ValueError as exc:
+            messagebox.showerror("Multiply", str(exc))
+            return
+        self.jobs.submit(
+            f"Multiply {name}",
+            lambda _job: batch.multiply(factor, name=name),
+            on_done=self._add_batch,
+            on_error=lambda exc: messagebox.showerror("Multiply", str(exc)),
+        )
+
+    def _on_batch_shift(self) -> None:
+        batch = self._current_batch("Shift")
+        if batch is not None:
+            k = self._parse_int(self.shift_var.get(), default=0)
+            self._add_batch(batch.shift(k, name=f"{batch.name or 'batch'} shifted {k}"))
+
+    def _on_batch_fold(self) -> None:
+        batch = self._current_batch("Fold")
+        if batch is not None:
+            self._add_batch(batch.fold(name=f"fold({batch.name or 'batch'})"))
+
+    def _save_signal(self) -> None:
+        """Write the first selected signal as TXT or binary, chosen by extension.
+
+        Saving runs in background jobs, since an evicted derived signal is
+        recomputed first (sharing a computation already under way).
+        """
+        if not self.selected_indices:
+            messagebox.showinfo("Save", "Select a signal to save.")
+            return
+        node = self.nodes[min(self.selected_indices)]
+        path = filedialog.asksaveasfilename(
+            title="Save Signal",
+            defaultextension=BINARY_SUFFIX,
+            filetypes=[
+                ("Binary Signal Files", f"*{BINARY_SUFFIX}"),
+                ("Text Files", "*.txt"),
+            ],
+        )
+        if not path:
+            return
+        title = f"Save {os.path.basename(path)}"
+
+        def show_error(exc: BaseException) -> None:
+            messagebox.showerror("Save Error", str(exc))
+
+        self._when_computed(
+            title,
+            node,
+            lambda sig: self.jobs.submit(title, self._save_job, sig, path, on_error=show_error),
+            show_error,
+        )
+
+    def _save_job(self, _job: Job, sig: Signal, path: str) -> None:
+        """Worker: write ``sig`` to ``path``."""
+        if path.endswith(BINARY_SUFFIX):
+            sig.to_binary_file(path)
+        else:
+            sig.to_txt_file(path)
 
     # Operations
     def _on_multiply(self) -> None:
@@ -174,9 +757,10 @@ class SignalApp(tk.Tk):
             return
         scalar = self._parse_float(self.multiply_var.get(), default=1.0)
         for i in sorted(self.selected_indices):
-            base = self.signals[i]
-            res = base.multiply(scalar, name=f"({base.name or 'sig'})*{scalar}")
-            self._add_signal(res)
+            base = self.nodes[i]
+            name = f"({base.name or 'sig'})*{scalar}"
+            node = self.graph.derive("multiply", [base], (scalar,), name=name)
+            self._derive(f"Multiply {name}", node)
 
     def _on_add(self) -> None:
         """Add all selected signals together and append the sum signal."""
@@ -184,11 +768,10 @@ class SignalApp(tk.Tk):
         if len(idxs) < 2:
             messagebox.showinfo("Add", "Select two or more signals to add.")
             return
-        acc = self.signals[idxs[0]].clone(name="sum")
-        for j in idxs[1:]:
-            acc = acc.add(self.signals[j])
-        acc.name = " + ".join((self.signal_list.get(i) for i in idxs))
-        self._add_signal(acc)
+        parts = [self.nodes[i] for i in idxs]
+        name = " + ".join((self.signal_list.get(i) for i in idxs))
+        node = self.graph.derive("sum", parts, ((1.0,) * len(parts),), name=name)
+        self._derive(f"Add {len(parts)} signals", node)
 
     def _on_subtract(self) -> None:
         """Subtract the rest of selected signals from the first one."""
@@ -199,11 +782,11 @@ class SignalApp(tk.Tk):
                 "Select two or more signals: first minus rest.",
             )
             return
-        acc = self.signals[idxs[0]].clone(name="diff")
-        for j in idxs[1:]:
-            acc = acc.subtract(self.signals[j])
-        acc.name = " - ".join((self.signal_list.get(i) for i in idxs))
-        self._add_signal(acc)
+        parts = [self.nodes[i] for i in idxs]
+        weights = (1.0,) + (-1.0,) * (len(idxs) - 1)
+        name = " - ".join((self.signal_list.get(i) for i in idxs))
+        node = self.graph.derive("sum", parts, (weights,), name=name)
+        self._derive(f"Subtract {len(parts)} signals", node)
 
     def _on_shift(self) -> None:
         """Shift each selected signal by k steps (delay if k>0, advance if k<0)."""
@@ -212,9 +795,9 @@ class SignalApp(tk.Tk):
             return
         k = self._parse_int(self.shift_var.get(), default=0)
         for i in sorted(self.selected_indices):
-            base = self.signals[i]
-            res = base.shift(k, name=f"{base.name or 'sig'} shifted {k}")
-            self._add_signal(res)
+            base = self.nodes[i]
+            name = f"{base.name or 'sig'} shifted {k}"
+            self._derive(f"Shift {name}", self.graph.derive("shift", [base], (k,), name=name))
 
     def _on_fold(self) -> None:
         """Fold (time-reverse) each selected signal: x(-n)."""
@@ -222,26 +805,164 @@ class SignalApp(tk.Tk):
             messagebox.showinfo("Fold", "Select at least one signal.")
             return
         for i in sorted(self.selected_indices):
-            base = self.signals[i]
-            res = base.fold(name=f"fold({base.name or 'sig'})")
-            self._add_signal(res)
+            base = self.nodes[i]
+            name = f"fold({base.name or 'sig'})"
+            self._derive(name, self.graph.derive("fold", [base], name=name))
+
+    def _on_convolve(self) -> None:
+        """Convolve all selected signals together and append the result."""
+        idxs = sorted(self.selected_indices)
+        if len(idxs) < 2:
+            messagebox.showinfo("Convolve", "Select two or more signals to convolve.")
+            return
+        parts = [self.nodes[i] for i in idxs]
+        name = " * ".join((self.signal_list.get(i) for i in idxs))
+        node = self.graph.derive("convolve", parts, name=name)
+        self._derive(f"Convolve {len(parts)} signals", node)
+
+    def _on_correlate(self) -> None:
+        """Cross-correlate the first selected signal with the second."""
+        idxs = sorted(self.selected_indices)
+        if len(idxs) != 2:
+            messagebox.showinfo("Correlate", "Select exactly two signals to correlate.")
+            return
+        parts = [self.nodes[i] for i in idxs]
+        name = f"xcorr({self.signal_list.get(idxs[0])}, {self.signal_list.get(idxs[1])})"
+        self._derive(name, self.graph.derive("correlate", parts, name=name))
+
+    def _on_resample(self) -> None:
+        """Resample each selected signal by L/M (index n moves to n*L/M)."""
+        if not self.selected_indices:
+            messagebox.showinfo("Resample", "Select at least one signal.")
+            return
+        up = self._parse_int(self.resample_up_var.get(), default=1)
+        down = self._parse_int(self.resample_down_var.get(), default=1)
+        if up < 1 or down < 1:
+            messagebox.showerror("Resample", "L and M must be positive integers.")
+            return
+        for i in sorted(self.selected_indices):
+            base = self.nodes[i]
+            name = f"{base.name or 'sig'} resampled {up}/{down}"
+            node = self.graph.derive("resample", [base], (up, down), name=name)
+            self._derive(f"Resample {name}", node)
+
+    def _on_filter(self) -> None:
+        """Filter each selected signal with the chosen filter and parameter."""
+        if not self.selected_indices:
+            messagebox.showinfo("Filter", "Select at least one signal.")
+            return
+        label = self.filter_combo.get()
+        kind = FILTER_KINDS[label]
+        value = self._parse_float(self.filter_var.get(), default=0.0)
+        try:
+            make_filter(kind, value)
+        except ValueError as exc:
+            messagebox.showerror("Filter", str(exc))
+            return
+        for i in sorted(self.selected_indices):
+            base = self.nodes[i]
+            name = f"{kind}[{value:g}]({base.name or 'sig'})"
+            self._derive(f"Filter {name}", self.graph.derive("filter", [base], (kind, value), name=name))
 
     def _plot_selected(self) -> None:
-        """Render selected signals to the Matplotlib axes."""
+        """Render selected signals to the Matplotlib axes.
+
+        Long signals are decimated to the canvas width by `LodPlotter`, which
+        also re-decimates the visible range on zoom and pan. Selected signals
+        whose results were evicted from the graph are recomputed in the
+        background first. With instrumentation on, data preparation and
+        drawing are recorded separately (``SignalApp._plot_selected.prepare``
+        and ``.draw``).
+        """
+        if self.stream_plot is not None:
+            return  # the stream owns the axes until another signal is selected
+        idxs = sorted(i for i in self.selected_indices if i < len(self.nodes))
+        nodes = [self.nodes[i] for i in idxs]
+        signals = [self.graph.cached(node) for node in nodes]
+        if any(sig is None for sig in signals):
+            self.jobs.submit(
+                "Recompute for plot",
+                lambda job: [self.graph.evaluate(node, progress=job.report) for node in nodes],
+                on_done=lambda sigs: self._draw_signals(idxs, nodes, sigs),
+                on_error=lambda exc: messagebox.showerror("Plot", str(exc)),
+            )
+            return
+        self._draw_signals(idxs, nodes, signals)
+
+    def _draw_signals(self, idxs: list[int], nodes: list[Node], signals: list[Signal]) -> None:
+        """Draw computed ``signals`` unless the selection changed meanwhile.
+
+        Spectral views are computed in a job through `self.spectrum_cache`,
+        so returning to a view already shown is immediate.
+        """
+        if not self._is_selected(idxs, nodes):
+            return
+        labels = [self.signal_list.get(idx) for idx in idxs]
+        mode = self.plot_mode.get()
+        if mode == "Time":
+            with instrument.timed("SignalApp._plot_selected.prepare") as t:
+                series = [(label, *sig.to_sorted_arrays()) for label, sig in zip(labels, signals)]
+                t.samples = sum(len(xs) for _label, xs, _ys in series)
+            self._draw_series(series)
+            return
+        self.jobs.submit(
+            f"{mode} spectrum",
+            lambda _job: self._spectral_series(mode, labels, signals),
+            on_done=lambda series: self._draw_spectra(idxs, nodes, series, mode),
+            on_error=lambda exc: messagebox.showerror("Plot", str(exc)),
+        )
+
+    def _draw_spectra(
+        self,
+        idxs: list[int],
+        nodes: list[Node],
+        series: list[tuple[str, np.ndarray, np.ndarray]],
+        mode: str,
+    ) -> None:
+        if self._is_selected(idxs, nodes) and self.plot_mode.get() == mode:
+            self._draw_series(series, mode)
+
+    def _is_selected(self, idxs: list[int], nodes: list[Node]) -> bool:
+        current = sorted(i for i in self.selected_indices if i < len(self.nodes))
+        return current == idxs and [self.nodes[i] for i in current] == nodes
+
+    def _spectral_series(
+        self,
+        mode: str,
+        labels: list[str],
+        signals: list[Signal],
+    ) -> list[tuple[str, np.ndarray, np.ndarray]]:
+        series = []
+        with instrument.timed("SignalApp._plot_selected.prepare") as t:
+            for label, sig in zip(labels, signals):
+                if mode == "PSD":
+                    spectrum = self.spectrum_cache.welch_psd(sig)
+                    ys = 10 * np.log10(np.maximum(spectrum.values, 1e-300))
+                else:
+                    spectrum = self.spectrum_cache.dft(sig)
+                    ys = spectrum.magnitude if mode == "Magnitude" else spectrum.phase
+                series.append((label, spectrum.freqs, ys))
+                t.samples += len(ys)
+        return series
+
+    def _draw_series(self, series: list[tuple[str, np.ndarray, np.ndarray]], mode: str = "Time") -> None:
+        """Replace the plot with ``(label, xs, ys)`` series."""
+        self._ensure_plot()
+        self.plotter.detach()
         self.ax.clear()
-        self.ax.set_title("Signal Plot")
-        self.ax.set_xlabel("n")
-        self.ax.set_ylabel("x[n]")
+        self.ax.set_title("Signal Plot" if mode == "Time" else f"{mode} Spectrum")
+        self.ax.set_xlabel("n" if mode == "Time" else "f (cycles/sample)")
+        self.ax.set_ylabel(PLOT_MODES[mode])
         self.ax.grid(True, linestyle=":", alpha=0.6)
 
-        for idx in sorted(self.selected_indices) or []:
-            sig = self.signals[idx]
-            xs, ys = sig.to_sorted_series()
-            if xs:
-                self.ax.stem(xs, ys, label=self.signal_list.get(idx))
-        if self.selected_indices:
-            self.ax.legend(loc="best")
-        self.canvas.draw_idle()
+        with instrument.timed("SignalApp._plot_selected.draw") as t:
+            self.plotter.set_series(series)
+            if instrument.is_enabled():
+                self.canvas.draw()  # render now so the draw time is measured
+            else:
+                self.canvas.draw_idle()
+            t.samples = sum(len(xs) for _label, xs, _ys in series)
+        self._refresh_perf()
 
 
 def main() -> None:
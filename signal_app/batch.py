@@ -0,0 +1,330 @@
+"""Headless batch mode: run a signal pipeline over many files in parallel.
+
+A pipeline is a comma- or newline-separated list of steps operating on a
+stack of signals, for example::
+
+    load A, load B, add, shift 3, fold, write
+
+Steps:
+
+- ``load NAME``: push the file bound to input ``NAME`` for this job
+- ``add [K]`` / ``subtract [K]``: replace the top K signals (default 2) by
+  their sum, or by the first minus the rest
+- ``multiply C``, ``shift K``, ``fold``: transform the top signal
+- ``convolve``, ``correlate``: combine the top two signals
+- ``write [SUFFIX]``: write the top signal to the output directory; each
+  write in a pipeline needs its own suffix
+
+Each ``--input NAME=GLOB`` expands to a set of files. Files from different
+inputs are paired by the text their wildcards matched, so ``--input
+A='caps/*_a.txt' --input B='caps/*_b.txt'`` pairs ``x_a.txt`` with
+``x_b.txt``. Every pairing is one job; jobs run in a process pool and each
+worker writes its outputs directly to disk. A throughput and latency summary
+is printed at the end.
+
+Usage::
+
+    python -m signal_app.batch -p "load A, shift 3, write" -i 'caps/*.txt' -o out
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+from signal_app.binio import BINARY_SUFFIX
+from signal_app.signals import Signal
+
+Step = Tuple[str, Tuple[str, ...]]
+
+# op -> (number of arguments allowed, signals popped, signals pushed)
+_ARITY = {
+    "load": ((1,), 0, 1),
+    "add": ((0, 1), 2, 1),
+    "subtract": ((0, 1), 2, 1),
+    "multiply": ((1,), 1, 1),
+    "shift": ((1,), 1, 1),
+    "fold": ((0,), 1, 1),
+    "convolve": ((0,), 2, 1),
+    "correlate": ((0,), 2, 1),
+    "write": ((0, 1), 1, 1),
+}
+# Appended to output names by a ``write`` step without a suffix.
+DEFAULT_SUFFIX = "_out"
+
+
+def parse_pipeline(text: str, inputs: Sequence[str]) -> List[Step]:
+    """Parse and validate pipeline text; raise ValueError on mistakes."""
+    steps: List[Step] = []
+    depth = 0
+    suffixes = set()
+    for raw in re.split(r"[,\n]", text):
+        words = raw.split()
+        if not words:
+            continue
+        op, args = words[0].lower(), tuple(words[1:])
+        if op not in _ARITY:
+            raise ValueError(f"Unknown pipeline step {op!r}")
+        arg_counts, pops, pushes = _ARITY[op]
+        if len(args) not in arg_counts:
+            raise ValueError(f"Wrong number of arguments for {raw.strip()!r}")
+        if op == "load" and args[0] not in inputs:
+            raise ValueError(f"Step {raw.strip()!r} uses undefined input {args[0]!r}")
+        if op in ("add", "subtract") and args:
+            if not args[0].isdigit() or int(args[0]) < 2:
+                raise ValueError(f"{op} needs a count of at least two signals")
+            pops = int(args[0])
+        try:
+            if op == "multiply":
+                float(args[0])
+            elif op == "shift":
+                int(args[0])
+        except ValueError as exc:
+            raise ValueError(f"Invalid argument in {raw.strip()!r}") from exc
+        if depth < pops:
+            raise ValueError(f"Step {raw.strip()!r} needs {pops} signal(s) on the stack")
+        if op == "write":
+            suffix = args[0] if args else DEFAULT_SUFFIX
+            if suffix in suffixes:
+                raise ValueError(f"Step {raw.strip()!r} would overwrite an earlier write")
+            suffixes.add(suffix)
+        depth += pushes - pops
+        steps.append((op, args))
+    if not any(op == "write" for op, _ in steps):
+        raise ValueError("Pipeline never writes a result; add a 'write' step")
+    return steps
+
+
+def _glob_regex(pattern: str) -> re.Pattern:
+    """Regex for a glob pattern that captures what each wildcard matched."""
+    parts = []
+    for ch in pattern:
+        if ch == "*":
+            parts.append("(.*)")
+        elif ch == "?":
+            parts.append("(.)")
+        else:
+            parts.append(re.escape(ch))
+    return re.compile("".join(parts) + r"\Z")
+
+
+def match_inputs(patterns: Dict[str, str]) -> Tuple[List[Dict[str, str]], List[str]]:
+    """Expand input globs and pair files across inputs by wildcard matches.
+
+    Returns the paired jobs (input name -> path) and the unpaired files.
+    """
+    by_key: Dict[str, Dict[Tuple[str, ...], str]] = {}
+    for name, pattern in patterns.items():
+        regex = _glob_regex(os.path.normpath(pattern))
+        by_key[name] = {}
+        for path in sorted(glob.glob(pattern)):
+            m = regex.match(os.path.normpath(path))
+            by_key[name][m.groups() if m else (path,)] = path
+    names = list(patterns)
+    common = set.intersection(*(set(keys) for keys in by_key.values())) if names else set()
+    jobs = [{name: by_key[name][key] for name in names} for key in sorted(common)]
+    unpaired = sorted(
+        path for keys in by_key.values() for key, path in keys.items() if key not in common
+    )
+    return jobs, unpaired
+
+
+def output_stems(jobs: Sequence[Dict[str, str]]) -> List[str]:
+    """Output file stem for each job, unique within the run.
+
+    The stem is the first input's file name without its extension. Jobs
+    whose stems collide (same name in different directories) get parent
+    directory names prepended until they differ.
+    """
+    parts = [
+        os.path.splitext(os.path.normpath(next(iter(job.values()))))[0].split(os.sep)
+        for job in jobs
+    ]
+    depths = [1] * len(parts)
+    while True:
+        keys = [tuple(p[-d:]) for p, d in zip(parts, depths)]
+        counts = Counter(keys)
+        grow = [
+            i for i, key in enumerate(keys) if counts[key] > 1 and depths[i] < len(parts[i])
+        ]
+        if not grow:
+            break
+        for i in grow:
+            depths[i] += 1
+    stems = ["_".join(key) for key in keys]
+    counts = Counter(stems)
+    return [f"{stem}_{i}" if counts[stem] > 1 else stem for i, stem in enumerate(stems)]
+
+
+@dataclass
+class JobResult:
+    """Outcome of one pipeline run, sent back from the worker process."""
+
+    inputs: Dict[str, str]
+    outputs: List[str] = field(default_factory=list)
+    samples: int = 0
+    bytes_read: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def run_pipeline(
+    steps: Sequence[Step],
+    inputs: Dict[str, str],
+    out_dir: str,
+    fmt: str = "txt",
+    stem: str | None = None,
+) -> JobResult:
+    """Run ``steps`` for one set of input files (executed in a worker).
+
+    Outputs are named ``<stem><suffix>``; ``stem`` defaults to the first
+    input's file name (see `output_stems` for names unique across jobs).
+    """
+    start = time.perf_counter()
+    result = JobResult(inputs=inputs)
+    if stem is None:
+        stem = os.path.splitext(os.path.basename(next(iter(inputs.values()))))[0]
+    stack: List[Signal] = []
+    try:
+        for op, args in steps:
+            if op == "load":
+                path = inputs[args[0]]
+                sig = Signal.from_file(path)
+                result.samples += len(sig.samples)
+                result.bytes_read += os.path.getsize(path)
+                stack.append(sig)
+            elif op in ("add", "subtract"):
+                count = int(args[0]) if args else 2
+                parts, stack[-count:] = stack[-count:], []
+                weights = [1.0] * count if op == "add" else [1.0] + [-1.0] * (count - 1)
+                stack.append(Signal.sum(parts, weights=weights))
+            elif op == "multiply":
+                stack.append(stack.pop().multiply(float(args[0])))
+            elif op == "shift":
+                stack.append(stack.pop().shift(int(args[0])))
+            elif op == "fold":
+                stack.append(stack.pop().fold())
+            elif op in ("convolve", "correlate"):
+                second, first = stack.pop(), stack.pop()
+                stack.append(getattr(first, op)(second))
+            elif op == "write":
+                suffix = args[0] if args else DEFAULT_SUFFIX
+                ext = BINARY_SUFFIX if fmt == "bin" else ".txt"
+                path = os.path.join(out_dir, f"{stem}{suffix}{ext}")
+                stack[-1].name = f"{stem}{suffix}"
+                if fmt == "bin":
+                    stack[-1].to_binary_file(path)
+                else:
+                    stack[-1].to_txt_file(path)
+                result.outputs.append(path)
+    except (OSError, ValueError) as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    pos = min(int(round(q * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[pos]
+
+
+def summarize(results: Sequence[JobResult], wall: float) -> str:
+    """Format throughput and latency statistics for finished jobs."""
+    ok = [r for r in results if r.error is None]
+    latencies = sorted(r.seconds for r in results)
+    samples = sum(r.samples for r in ok)
+    megabytes = sum(r.bytes_read for r in ok) / 1e6
+    wall = max(wall, 1e-9)
+    return "\n".join(
+        [
+            f"jobs: {len(ok)} ok, {len(results) - len(ok)} failed in {wall:.2f}s",
+            f"throughput: {len(results) / wall:.1f} jobs/s, "
+            f"{samples / wall:,.0f} samples/s, {megabytes / wall:.1f} MB/s",
+            f"latency: p50 {_percentile(latencies, 0.5) * 1e3:.1f} ms, "
+            f"p95 {_percentile(latencies, 0.95) * 1e3:.1f} ms, "
+            f"max {(latencies[-1] if latencies else 0.0) * 1e3:.1f} ms",
+        ]
+    )
+
+
+def _parse_inputs(values: Sequence[str]) -> Dict[str, str]:
+    inputs: Dict[str, str] = {}
+    for value in values:
+        name, sep, pattern = value.partition("=")
+        if not sep:
+            name, pattern = "A", value
+        inputs[name] = pattern
+    return inputs
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point; returns the process exit code."""
+    parser = argparse.ArgumentParser(
+        prog="python -m signal_app.batch",
+        description="Run a signal pipeline over many input files in parallel.",
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("-p", "--pipeline", help="pipeline steps, e.g. 'load A, fold, write'")
+    source.add_argument("--pipeline-file", help="file with one pipeline step per line")
+    parser.add_argument(
+        "-i",
+        "--input",
+        action="append",
+        required=True,
+        metavar="NAME=GLOB",
+        help="input glob bound to NAME (a bare GLOB is bound to A)",
+    )
+    parser.add_argument("-o", "--output-dir", required=True, help="directory for results")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--format", choices=("txt", "bin"), default="txt", help="output format")
+    args = parser.parse_args(argv)
+
+    inputs = _parse_inputs(args.input)
+    text = args.pipeline
+    if args.pipeline_file:
+        with open(args.pipeline_file, "r", encoding="utf-8") as f:
+            text = f.read()
+    try:
+        steps = parse_pipeline(text, list(inputs))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    jobs, unpaired = match_inputs(inputs)
+    for path in unpaired:
+        print(f"warning: no matching files for {path}; skipped", file=sys.stderr)
+    if not jobs:
+        print("error: no input files matched", file=sys.stderr)
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    results: List[JobResult] = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(run_pipeline, steps, job, args.output_dir, args.format, stem): job
+            for job, stem in zip(jobs, output_stems(jobs))
+        }
+        for future in as_completed(futures):
+            try:
+                res = future.result()
+            except Exception as exc:  # worker crashed; report and keep going
+                res = JobResult(inputs=futures[future], error=f"{type(exc).__name__}: {exc}")
+            results.append(res)
+            if res.error:
+                print(f"error: {', '.join(res.inputs.values())}: {res.error}", file=sys.stderr)
+    print(summarize(results, time.perf_counter() - start))
+    return 0 if all(r.error is None for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+"""Binary, memory-mappable container for `Signal` samples.
+
+Layout (little endian)::
+
+    header   magic, version, kind (sparse/dense), flags, value dtype,
+             start index, length, name length
+    name     UTF-8 bytes, padded so the arrays start on a 64-byte boundary
+    sparse:  int64 indices[length], values[length]
+    dense:   values[length], then uint8 mask[length] if FLAG_MASK is set
+    multi:   int64 indices[length], then values[channels, length] with one
+             row per channel; ``start`` holds the channel count and the name
+             holds the batch name and channel names, one per line
+
+Dense files store only the start index; sample ``i`` of the value array sits
+at index ``start + i``. Values are always float64 (the header records
+``<f8``), so reading maps the arrays with `numpy.memmap` and wraps them
+without copying; the file opens in constant time.
+
+Files are written to a temporary file next to the target and moved over it
+when complete. Overwriting a file therefore never changes the data of
+signals still mapped from it (truncating a mapped file in place would crash
+the process when they are next read).
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import secrets
+import struct
+from contextlib import contextmanager
+from collections.abc import Mapping
+from typing import BinaryIO, Iterator, List, Sequence
+
+import numpy as np
+
+from signal_app.storage import (
+    DenseSamples,
+    SparseSamples,
+    from_pairs,
+    materialize,
+    sorted_arrays,
+)
+from signal_app.txtio import read_txt_file, write_txt_file
+
+BINARY_SUFFIX = ".sigbin"
+MAGIC = b"DSPSIG\x00\x00"
+VERSION = 1
+
+KIND_SPARSE = 0
+KIND_DENSE = 1
+KIND_MULTI = 2
+FLAG_MASK = 0x01
+
+_HEADER = struct.Struct("<8sHBB8sqqI")
+_ALIGN = 64
+# The only value dtype stored; anything else would be copied on every load.
+VALUE_DTYPE = np.dtype("<f8")
+
+
+def _data_offset(name_len: int) -> int:
+    end = _HEADER.size + name_len
+    return (end + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _create_temp(path: str, suffix: str = ".tmp") -> tuple[str, BinaryIO]:
+    """A new file next to ``path``, created with the usual permissions.
+
+    (`tempfile.mkstemp` would make it private to the user, and the target
+    would keep that mode after the replace.)
+    """
+    while True:
+        tmp = f"{path}.{secrets.token_hex(4)}{suffix}"
+        try:
+            return tmp, open(tmp, "xb")
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def _replacing(path: str) -> Iterator[BinaryIO]:
+    """Binary file that replaces ``path`` once written without error."""
+    tmp, f = _create_temp(path)
+    try:
+        with f:
+            yield f
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _value_dtype(path: str, dtype_str: bytes) -> np.dtype:
+    dtype = np.dtype(dtype_str.rstrip(b"\x00").decode("ascii"))
+    if dtype != VALUE_DTYPE:
+        raise ValueError(f"{path}: unsupported value dtype {dtype.str}; only <f8 is stored")
+    return dtype
+
+
+def is_binary_file(path: str) -> bool:
+    """Whether ``path`` starts with the binary signal magic."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_binary(
+    path: str,
+    samples: Mapping[int, float],
+    name: str | None = None,
+) -> None:
+    """Write samples to ``path``; dense samples keep their start + array form."""
+    samples = materialize(samples)
+    value_dtype = VALUE_DTYPE
+    name_bytes = (name or "").encode("utf-8")
+    flags = 0
+    if isinstance(samples, DenseSamples):
+        kind, start, length = KIND_DENSE, samples.start, len(samples.values)
+        arrays = [samples.values.astype(value_dtype, copy=False)]
+        if samples.mask is not None:
+            flags |= FLAG_MASK
+            arrays.append(samples.mask.astype(np.uint8))
+    else:
+        indices, values = sorted_arrays(samples)
+        kind, length = KIND_SPARSE, len(indices)
+        start = int(indices[0]) if length else 0
+        arrays = [indices.astype("<i8", copy=False), values.astype(value_dtype, copy=False)]
+
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        kind,
+        flags,
+        value_dtype.str.encode("ascii"),
+        start,
+        length,
+        len(name_bytes),
+    )
+    offset = _data_offset(len(name_bytes))
+    with _replacing(path) as f:
+        f.write(header)
+        f.write(name_bytes)
+        f.write(b"\x00" * (offset - len(header) - len(name_bytes)))
+        for arr in arrays:
+            f.write(np.ascontiguousarray(arr).tobytes())
+
+
+class BinaryWriter:
+    """Writes a single-channel signal incrementally, in increasing index order.
+
+    Values go to a temporary file next to ``path`` and indices to a side
+    file. `close` finishes a gap-free result as a dense file (the indices are
+    dropped); otherwise the file is rewritten with the indices in front of
+    the values, as the sparse layout requires. Either way the result then
+    replaces ``path``, which is untouched until then (it may be an input).
+    """
+
+    def __init__(self, path: str, name: str | None = None) -> None:
+        self.path = path
+        self.length = 0
+        self._dtype = VALUE_DTYPE
+        self._name_bytes = (name or "").encode("utf-8")
+        self._offset = _data_offset(len(self._name_bytes))
+        self._start: int | None = None
+        self._next: int | None = None
+        self._contiguous = True
+        self._values_path, self._values = _create_temp(path)
+        self._values.write(b"\x00" * self._offset)
+        self._indices_path, self._indices = _create_temp(path, ".indices.tmp")
+
+    def write(self, indices: np.ndarray, values: np.ndarray) -> None:
+        """Append samples whose strictly increasing indices follow earlier ones."""
+        if len(indices) == 0:
+            return
+        indices = np.asarray(indices, dtype="<i8")
+        first, last = int(indices[0]), int(indices[-1])
+        if self._next is not None and first < self._next:
+            raise ValueError("BinaryWriter needs samples in increasing index order")
+        if self._start is None:
+            self._start = first
+        self._contiguous &= (self._next is None or first == self._next) and (
+            last - first + 1 == len(indices)
+        )
+        self._indices.write(np.ascontiguousarray(indices).tobytes())
+        self._values.write(np.ascontiguousarray(values, dtype=self._dtype).tobytes())
+        self.length += len(indices)
+        self._next = last + 1
+
+    def close(self) -> None:
+        if self._values.closed:
+            return
+        self._indices.close()
+        if self._contiguous:
+            self._values.seek(0)
+            self._values.write(self._header(KIND_DENSE, self._start or 0))
+            self._values.close()
+            os.replace(self._values_path, self.path)
+        else:
+            self._values.close()
+            with _replacing(self.path) as out:
+                out.write(self._header(KIND_SPARSE, self._start or 0))
+                out.write(b"\x00" * (self._offset - out.tell()))
+                with open(self._indices_path, "rb") as f:
+                    shutil.copyfileobj(f, out)
+                with open(self._values_path, "rb") as f:
+                    f.seek(self._offset)
+                    shutil.copyfileobj(f, out)
+        self._remove_temps()
+
+    def abort(self) -> None:
+        """Close and delete everything written so far; ``path`` is left as it was."""
+        for f in (self._values, self._indices):
+            f.close()
+        self._remove_temps()
+
+    def _remove_temps(self) -> None:
+        for path in (self._values_path, self._indices_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _header(self, kind: int, start: int) -> bytes:
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            kind,
+            0,
+            self._dtype.str.encode("ascii"),
+            start,
+            self.length,
+            len(self._name_bytes),
+        )
+        return header + self._name_bytes
+
+    def __enter__(self) -> "BinaryWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _read_header(path: str) -> tuple:
+    """Return ``(kind, flags, dtype_str, start, length, name_len, name)``."""
+    with open(path, "rb") as f:
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            raise ValueError(f"{path}: truncated binary signal header")
+        magic, version, kind, flags, dtype_str, start, length, name_len = (
+            _HEADER.unpack(raw)
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a binary signal file")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported binary signal version {version}")
+        name = f.read(name_len).decode("utf-8")
+    return kind, flags, dtype_str, start, length, name_len, name
+
+
+def read_binary(path: str) -> tuple[Mapping[int, float], str]:
+    """Memory-map ``path`` and return ``(samples, stored_name)``."""
+    kind, flags, dtype_str, start, length, name_len, name = _read_header(path)
+    if kind == KIND_MULTI:
+        raise ValueError(f"{path}: multichannel file; load it as a batch")
+    if length == 0:
+        return {}, name
+    value_dtype = _value_dtype(path, dtype_str)
+    offset = _data_offset(name_len)
+    if kind == KIND_DENSE:
+        values = np.memmap(path, dtype=value_dtype, mode="r", offset=offset, shape=(length,))
+        mask = None
+        if flags & FLAG_MASK:
+            mask = np.memmap(
+                path,
+                dtype=np.bool_,
+                mode="r",
+                offset=offset + length * value_dtype.itemsize,
+                shape=(length,),
+            )
+        return DenseSamples(start, values, mask), name
+    if kind == KIND_SPARSE:
+        indices = np.memmap(path, dtype="<i8", mode="r", offset=offset, shape=(length,))
+        values = np.memmap(
+            path, dtype=value_dtype, mode="r", offset=offset + length * 8, shape=(length,)
+        )
+        return SparseSamples(indices, values), name
+    raise ValueError(f"{path}: unknown binary signal kind {kind}")
+
+
+def write_binary_columns(
+    path: str,
+    indices: np.ndarray,
+    values: np.ndarray,
+    name: str | None = None,
+    channel_names: Sequence[str] = (),
+) -> None:
+    """Write a multichannel signal: sorted ``indices`` and (C, N) ``values``."""
+    value_dtype = VALUE_DTYPE
+    values = np.asarray(values)
+    channels, length = values.shape
+    name_bytes = "\n".join([name or "", *channel_names]).encode("utf-8")
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        KIND_MULTI,
+        0,
+        value_dtype.str.encode("ascii"),
+        channels,
+        length,
+        len(name_bytes),
+    )
+    offset = _data_offset(len(name_bytes))
+    with _replacing(path) as f:
+        f.write(header)
+        f.write(name_bytes)
+        f.write(b"\x00" * (offset - len(header) - len(name_bytes)))
+        f.write(np.ascontiguousarray(indices, dtype="<i8").tobytes())
+        f.write(np.ascontiguousarray(values, dtype=value_dtype).tobytes())
+
+
+def read_binary_columns(path: str) -> tuple[np.ndarray, np.ndarray, str, List[str]]:
+    """Memory-map a multichannel file: ``(indices, values[C, N], name, channel_names)``."""
+    kind, _flags, dtype_str, channels, length, name_len, name = _read_header(path)
+    if kind != KIND_MULTI:
+        raise ValueError(f"{path}: not a multichannel signal file")
+    stored_name, *channel_names = name.split("\n")
+    if length == 0:
+        return (
+            np.empty(0, dtype=np.int64),
+            np.empty((channels, 0), dtype=np.float64),
+            stored_name,
+            channel_names,
+        )
+    value_dtype = _value_dtype(path, dtype_str)
+    offset = _data_offset(name_len)
+    indices = np.memmap(path, dtype="<i8", mode="r", offset=offset, shape=(length,))
+    values = np.memmap(
+        path,
+        dtype=value_dtype,
+        mode="r",
+        offset=offset + length * 8,
+        shape=(channels, length),
+    )
+    return indices, values, stored_name, channel_names
+
+
+def is_multichannel_file(path: str) -> bool:
+    """Whether ``path`` is a binary multichannel signal file."""
+    try:
+        return is_binary_file(path) and _read_header(path)[0] == KIND_MULTI
+    except (OSError, ValueError):
+        return False
+
+
+def txt_to_binary(txt_path: str, bin_path: str, name: str | None = None) -> None:
+    """Convert a TXT signal file to the binary format."""
+    indices, values, _stats = read_txt_file(txt_path)
+    write_binary(bin_path, from_pairs(indices, values), name=name or txt_path)
+
+
+def binary_to_txt(bin_path: str, txt_path: str) -> None:
+    """Convert a binary signal file to the TXT format."""
+    samples, _name = read_binary(bin_path)
+    write_txt_file(txt_path, *sorted_arrays(samples))
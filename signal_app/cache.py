@@ -0,0 +1,217 @@
+"""Persistent cache of parsed TXT signals.
+
+Parsing a large TXT capture dominates load time, so `ParseCache` stores each
+parsed file in the binary format of `signal_app.binio`. Entries are keyed by
+absolute path, modification time and size, plus a hash of the content when
+``hash_content`` is set, so an edited file is parsed again. The cache
+directory is kept under ``max_bytes`` by evicting the least recently used
+entries (a hit refreshes the entry's mtime). An in-process memo in front of
+the directory returns the same samples for repeated loads in one session.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable
+
+from signal_app.binio import BINARY_SUFFIX, read_binary, write_binary
+from signal_app.storage import compact, from_pairs
+from signal_app.txtio import read_txt_file
+
+logger = logging.getLogger(__name__)
+
+# Overrides the default cache directory when set.
+CACHE_DIR_ENV = "DSP_SIGNAL_CACHE"
+DEFAULT_MAX_BYTES = 1 << 30
+DEFAULT_MEMO_ENTRIES = 32
+_HASH_BLOCK = 1 << 20
+
+
+def default_cache_dir() -> str:
+    """``$DSP_SIGNAL_CACHE`` or ``~/.cache/dsp_signal``."""
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "dsp_signal"
+    )
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of a `ParseCache`."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hit(s) ({self.memory_hits} memory, {self.disk_hits} disk), "
+            f"{self.misses} miss(es), {self.evictions} eviction(s)"
+        )
+
+
+class ParseCache:
+    """Two-level cache (memory, then disk) of parsed TXT signal files.
+
+    Safe to share between threads; separate processes may share a directory
+    because entries are written to a temporary file and renamed into place.
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        memo_entries: int = DEFAULT_MEMO_ENTRIES,
+        hash_content: bool = False,
+    ) -> None:
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.memo_entries = memo_entries
+        self.hash_content = hash_content
+        self.stats = CacheStats()
+        self._memo: OrderedDict[str, Mapping[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, path: str) -> str:
+        """Cache key of ``path`` in its current state on disk."""
+        st = os.stat(path)
+        digest = hashlib.sha1(
+            f"{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}".encode("utf-8")
+        )
+        if self.hash_content:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + BINARY_SUFFIX)
+
+    def load(
+        self,
+        path: str,
+        progress: Callable[[int], None] | None = None,
+    ) -> Mapping[int, float]:
+        """Samples of the TXT file ``path``, parsed only on a cache miss.
+
+        ``progress`` is passed to the parser on a miss; on a hit it is called
+        once with the file size.
+        """
+        key = self.key(path)
+        with self._lock:
+            samples = self._memo.get(key)
+            if samples is not None:
+                self._memo.move_to_end(key)
+                self.stats.memory_hits += 1
+        if samples is None:
+            samples = self._load_entry(key)
+            if samples is not None:
+                with self._lock:
+                    self.stats.disk_hits += 1
+        if samples is not None:
+            logger.debug("Parse cache hit for %s", path)
+            if progress is not None:
+                progress(os.path.getsize(path))
+        else:
+            with self._lock:
+                self.stats.misses += 1
+            indices, values, stats = read_txt_file(path, progress=progress)
+            logger.debug("Parse cache miss for %s: %s", path, stats)
+            samples = compact(from_pairs(indices, values))
+            self._store(key, samples, path)
+        with self._lock:
+            self._memo[key] = samples
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.memo_entries:
+                self._memo.popitem(last=False)
+        return samples
+
+    def _load_entry(self, key: str) -> Mapping[int, float] | None:
+        entry = self._entry_path(key)
+        try:
+            samples, _name = read_binary(entry)
+            os.utime(entry)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Discarding unreadable cache entry %s: %s", entry, exc)
+            self._remove(entry)
+            return None
+        return samples
+
+    def _store(self, key: str, samples: Mapping[int, float], path: str) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                write_binary(tmp, samples, name=path)
+                os.replace(tmp, self._entry_path(key))
+            except BaseException:
+                self._remove(tmp)
+                raise
+        except OSError as exc:
+            # A cache that cannot be written must not break loading.
+            logger.warning("Could not write parse cache entry for %s: %s", path, exc)
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under ``max_bytes``."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return 0
+        entries = []
+        for name in names:
+            if not name.endswith(BINARY_SUFFIX):
+                continue
+            full = os.path.join(self.directory, name)
+            try:
+                st = os.stat(full)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, full))
+        total = sum(size for _mtime, size, _full in entries)
+        removed = 0
+        for _mtime, size, full in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if self._remove(full):
+                total -= size
+                removed += 1
+        with self._lock:
+            self.stats.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        """Drop the memo and every entry in the cache directory."""
+        with self._lock:
+            self._memo.clear()
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(BINARY_SUFFIX):
+                self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+        except OSError:
+            # Missing, or still mapped by a reader on platforms that forbid it.
+            return False
+        return True
@@ -0,0 +1,175 @@
+"""Linear convolution and cross-correlation of integer-indexed samples.
+
+Convolving samples on ``[a0, a1]`` with samples on ``[b0, b1]`` gives output
+on ``[a0 + b0, a1 + b1]``. Cross-correlation follows the DSP definition
+``r[l] = sum_n a[n] * b[n - l]``, i.e. convolution with ``b`` folded, so its
+output covers lags ``[a0 - b1, a1 - b0]``.
+
+Each operand is split into clusters of nearby samples (gaps inside a cluster
+count as zeros), so sparse inputs are never densified across large empty
+gaps. Each pair of clusters is convolved with direct evaluation for short
+kernels, a single FFT for comparable lengths, or FFT overlap-add when one
+side is much longer than the other.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import List, Tuple
+
+import numpy as np
+
+from signal_app.storage import (
+    DenseSamples,
+    TransformedSamples,
+    from_arrays,
+    materialize,
+    sorted_arrays,
+    weighted_sum,
+)
+
+METHODS = ("auto", "direct", "fft", "overlap-add")
+
+# Kernels up to this length are always evaluated directly.
+DIRECT_MAX_KERNEL = 64
+# Direct evaluation is also used while n * m stays below this.
+DIRECT_MAX_WORK = 1 << 16
+# Overlap-add is used when the long side is this many times the short side.
+OVERLAP_ADD_RATIO = 16
+# Gaps longer than this split a signal into separate clusters.
+CLUSTER_GAP = 256
+# Above this many cluster pairs, sparse points are combined pairwise instead.
+MAX_CLUSTER_PAIRS = 4096
+# Pairwise products are formed in chunks of about this many elements.
+_PAIRWISE_CHUNK = 1 << 20
+
+
+def next_fast_len(n: int) -> int:
+    """Smallest length >= n whose only prime factors are 2, 3 and 5."""
+    if n <= 1:
+        return 1
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            length = p35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def _choose_method(n: int, m: int) -> str:
+    """Pick an evaluation method for lengths ``n >= m``."""
+    if m <= DIRECT_MAX_KERNEL or n * m <= DIRECT_MAX_WORK:
+        return "direct"
+    if n >= OVERLAP_ADD_RATIO * m:
+        return "overlap-add"
+    return "fft"
+
+
+def _fft_convolve(x: np.ndarray, h: np.ndarray) -> np.ndarray:
+    size = len(x) + len(h) - 1
+    nfft = next_fast_len(size)
+    spectrum = np.fft.rfft(x, nfft) * np.fft.rfft(h, nfft)
+    return np.fft.irfft(spectrum, nfft)[:size]
+
+
+def _overlap_add(x: np.ndarray, h: np.ndarray) -> np.ndarray:
+    m = len(h)
+    nfft = next_fast_len(8 * m)
+    block = nfft - m + 1
+    kernel = np.fft.rfft(h, nfft)
+    out = np.zeros(len(x) + m - 1, dtype=np.float64)
+    for lo in range(0, len(x), block):
+        seg = x[lo : lo + block]
+        y = np.fft.irfft(np.fft.rfft(seg, nfft) * kernel, nfft)
+        count = len(seg) + m - 1
+        out[lo : lo + count] += y[:count]
+    return out
+
+
+def convolve_arrays(x: np.ndarray, h: np.ndarray, method: str = "auto") -> np.ndarray:
+    """Full linear convolution of two contiguous arrays."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown convolution method {method!r}; use one of {METHODS}")
+    if len(x) == 0 or len(h) == 0:
+        return np.zeros(0, dtype=np.float64)
+    if len(x) < len(h):
+        x, h = h, x
+    if method == "auto":
+        method = _choose_method(len(x), len(h))
+    if method == "direct":
+        return np.convolve(x, h)
+    if method == "overlap-add":
+        return _overlap_add(x, h)
+    return _fft_convolve(x, h)
+
+
+def _clusters(samples: Mapping[int, float]) -> List[Tuple[int, np.ndarray]]:
+    """Split samples into ``(start, contiguous values)`` runs at large gaps."""
+    samples = materialize(samples)
+    if isinstance(samples, DenseSamples):
+        if samples.mask is None:
+            return [(samples.start, samples.values)]
+    idx, vals = sorted_arrays(samples)
+    if len(idx) == 0:
+        return []
+    cuts = np.flatnonzero(np.diff(idx) > CLUSTER_GAP) + 1
+    clusters = []
+    for run_idx, run_vals in zip(np.split(idx, cuts), np.split(vals, cuts)):
+        start = int(run_idx[0])
+        dense = np.zeros(int(run_idx[-1]) - start + 1, dtype=np.float64)
+        dense[run_idx - start] = run_vals
+        clusters.append((start, dense))
+    return clusters
+
+
+def _convolve_pairwise(a: Mapping[int, float], b: Mapping[int, float]) -> Mapping[int, float]:
+    """Convolve very sparse samples by summing products of all sample pairs."""
+    a_idx, a_val = sorted_arrays(a)
+    b_idx, b_val = sorted_arrays(b)
+    step = max(1, _PAIRWISE_CHUNK // max(len(b_idx), 1))
+    parts = []
+    for lo in range(0, len(a_idx), step):
+        idx = np.add.outer(a_idx[lo : lo + step], b_idx).ravel()
+        vals = np.multiply.outer(a_val[lo : lo + step], b_val).ravel()
+        uniq, inverse = np.unique(idx, return_inverse=True)
+        parts.append(from_arrays(uniq, np.bincount(inverse, weights=vals)))
+    return weighted_sum(parts)
+
+
+def convolve(
+    a: Mapping[int, float],
+    b: Mapping[int, float],
+    method: str = "auto",
+) -> Mapping[int, float]:
+    """Linear convolution ``(a * b)[n] = sum_k a[k] * b[n - k]``."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown convolution method {method!r}; use one of {METHODS}")
+    a_clusters = _clusters(a)
+    b_clusters = _clusters(b)
+    if not a_clusters or not b_clusters:
+        return {}
+    if len(a_clusters) * len(b_clusters) > MAX_CLUSTER_PAIRS:
+        return _convolve_pairwise(materialize(a), materialize(b))
+    parts = [
+        DenseSamples(a_start + b_start, convolve_arrays(x, h, method))
+        for a_start, x in a_clusters
+        for b_start, h in b_clusters
+    ]
+    if len(parts) == 1:
+        return parts[0]
+    return weighted_sum(parts)
+
+
+def correlate(
+    a: Mapping[int, float],
+    b: Mapping[int, float],
+    method: str = "auto",
+) -> Mapping[int, float]:
+    """Cross-correlation ``r[l] = sum_n a[n] * b[n - l]`` indexed by lag ``l``."""
+    return convolve(a, TransformedSamples.of(b).folded(), method)
@@ -0,0 +1,408 @@
+"""Stateful FIR, IIR and running-statistics filters with block processing.
+
+Every `Filter` keeps its state between calls to ``process``, so feeding a
+signal block by block gives the same output as filtering it in one piece.
+That lets long signals (`filter_signal`) and live streams
+(`signal_app.streaming.Filtered`) be filtered in bounded memory.
+
+- `FIRFilter`: direct or FFT convolution with a history of ``taps - 1``
+  inputs (overlap-save).
+- `Biquad` / `IIRFilter`: cascaded second-order sections in transposed
+  direct form II. Each block is computed without a per-sample Python loop:
+  the zero-state response is the block convolved with the section's impulse
+  response, plus the response to the carried-over state.
+- `MovingAverage` and `RunningStats`: windowed sums from cumulative sums,
+  O(1) work per sample.
+
+A filter is `settled` once more zero input would only output zeros and
+leave its state unchanged. `filter_signal` uses that to skip the rest of a
+gap in a sparse signal, so its memory follows the occupied samples rather
+than the index span.
+
+Cutoff frequencies are fractions of the sampling rate (``0 < f < 0.5``).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from signal_app.convolution import convolve_arrays
+from signal_app.instrument import instrumented
+from signal_app.signals import Signal
+from signal_app.storage import DenseSamples, from_arrays
+
+# Samples of a signal filtered per block by `filter_signal`.
+DEFAULT_BLOCK_SIZE = 1 << 16
+# Block length for IIR sections; their basis responses have this length.
+IIR_BLOCK = 4096
+DEFAULT_FIR_TAPS = 101
+DEFAULT_IIR_ORDER = 4
+# An IIR state this small relative to the largest value seen has decayed away.
+IIR_SETTLE_TOLERANCE = 1e-15
+# First run of zeros fed into a gap by `filter_signal`; doubles up to a block.
+GAP_CHUNK = 64
+
+
+class Filter:
+    """Base class: ``process`` consecutive blocks, ``reset`` to start over."""
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+    def settled(self) -> bool:
+        """Whether zero input would from now on give zero output and keep the state."""
+        raise NotImplementedError
+
+
+class FIRFilter(Filter):
+    """``y[n] = sum_k taps[k] x[n - k]`` with ``method`` as in `convolve_arrays`."""
+
+    def __init__(self, taps: Sequence[float], method: str = "auto") -> None:
+        self.taps = np.asarray(taps, dtype=np.float64)
+        if len(self.taps) == 0:
+            raise ValueError("An FIR filter needs at least one tap")
+        self.method = method
+        self.reset()
+
+    def reset(self) -> None:
+        self._history = np.zeros(len(self.taps) - 1, dtype=np.float64)
+
+    def settled(self) -> bool:
+        return not self._history.any()
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float64)
+        if len(x) == 0:
+            return x.copy()
+        m = len(self.taps) - 1
+        buf = np.concatenate((self._history, x))
+        y = convolve_arrays(buf, self.taps, self.method)[m : m + len(x)]
+        self._history = buf[len(buf) - m :]
+        return y
+
+
+class Biquad(Filter):
+    """One second-order section ``(b0 + b1 z^-1 + b2 z^-2) / (a0 + a1 z^-1 + a2 z^-2)``."""
+
+    def __init__(
+        self,
+        b0: float,
+        b1: float,
+        b2: float,
+        a0: float,
+        a1: float,
+        a2: float,
+    ) -> None:
+        if a0 == 0:
+            raise ValueError("a0 must be non-zero")
+        self.b = (b0 / a0, b1 / a0, b2 / a0)
+        self.a = (a1 / a0, a2 / a0)
+        self._basis: Tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        self._z1 = 0.0
+        self._z2 = 0.0
+        self._peak = 0.0
+
+    def settled(self) -> bool:
+        """Whether the state is zero; a state decayed to rounding level is cleared."""
+        limit = IIR_SETTLE_TOLERANCE * self._peak
+        if abs(self._z1) <= limit and abs(self._z2) <= limit:
+            self._z1 = self._z2 = 0.0
+        return self._z1 == 0.0 and self._z2 == 0.0
+
+    def _responses(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Impulse response and responses to a unit ``z1`` / ``z2`` state."""
+        if self._basis is None:
+            self._basis = (
+                self._run(1.0, 0.0, 0.0),
+                self._run(0.0, 1.0, 0.0),
+                self._run(0.0, 0.0, 1.0),
+            )
+        return self._basis
+
+    def _run(self, impulse: float, z1: float, z2: float) -> np.ndarray:
+        (b0, b1, b2), (a1, a2) = self.b, self.a
+        out = np.empty(IIR_BLOCK, dtype=np.float64)
+        x = impulse
+        for n in range(IIR_BLOCK):
+            y = b0 * x + z1
+            z1 = b1 * x - a1 * y + z2
+            z2 = b2 * x - a2 * y
+            out[n] = y
+            x = 0.0
+        return out
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float64)
+        h, g1, g2 = self._responses()
+        (_b0, b1, b2), (a1, a2) = self.b, self.a
+        out = np.empty(len(x), dtype=np.float64)
+        for lo in range(0, len(x), IIR_BLOCK):
+            xs = x[lo : lo + IIR_BLOCK]
+            n = len(xs)
+            y = convolve_arrays(xs, h[:n])[:n]
+            y += self._z1 * g1[:n] + self._z2 * g2[:n]
+            # State after the last sample, from the last two inputs/outputs.
+            z2_before = b2 * xs[-2] - a2 * y[-2] if n >= 2 else self._z2
+            self._z1 = b1 * xs[-1] - a1 * y[-1] + z2_before
+            self._z2 = b2 * xs[-1] - a2 * y[-1]
+            out[lo : lo + n] = y
+        if len(x):
+            self._peak = max(self._peak, float(np.abs(x).max()), float(np.abs(out).max()))
+        return out
+
+
+class IIRFilter(Filter):
+    """Cascade of `Biquad` sections applied in order."""
+
+    def __init__(self, sections: Sequence[Biquad]) -> None:
+        if not sections:
+            raise ValueError("An IIR filter needs at least one section")
+        self.sections = list(sections)
+
+    @staticmethod
+    def from_sos(sos: Sequence[Sequence[float]]) -> "IIRFilter":
+        """Build from rows ``[b0, b1, b2, a0, a1, a2]``."""
+        return IIRFilter([Biquad(*row) for row in sos])
+
+    def reset(self) -> None:
+        for section in self.sections:
+            section.reset()
+
+    def settled(self) -> bool:
+        # A list, not a generator: every section gets to clear a decayed state.
+        return all([section.settled() for section in self.sections])
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        y = np.asarray(x, dtype=np.float64)
+        for section in self.sections:
+            y = section.process(y)
+        return y
+
+
+class MovingAverage(Filter):
+    """Mean of the last ``n`` samples (samples before the start count as 0).
+
+    As in `RunningStats`, values are centred on a per-block reference before
+    the cumulative sum, so a large offset does not swamp the window sums.
+    """
+
+    def __init__(self, n: int) -> None:
+        if n < 1:
+            raise ValueError("Window length must be at least 1")
+        self.n = n
+        self.reset()
+
+    def reset(self) -> None:
+        self._history = np.zeros(self.n - 1, dtype=np.float64)
+
+    def settled(self) -> bool:
+        return not self._history.any()
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float64)
+        if len(x) == 0:
+            return x.copy()
+        buf = np.concatenate((self._history, x))
+        ref = float(x.mean())
+        sums = np.concatenate(([0.0], np.cumsum(buf - ref)))
+        self._history = buf[len(buf) - (self.n - 1) :]
+        return (sums[self.n :] - sums[: len(sums) - self.n]) / self.n + ref
+
+
+class RunningStats(Filter):
+    """Mean, variance or standard deviation of the last ``n`` samples.
+
+    Until ``n`` samples have been seen the window covers what has arrived.
+    Values are centred on a per-block reference before summing squares, to
+    limit cancellation in the variance.
+    """
+
+    STATS = ("mean", "var", "std")
+
+    def __init__(self, n: int, stat: str = "mean") -> None:
+        if n < 1:
+            raise ValueError("Window length must be at least 1")
+        if stat not in self.STATS:
+            raise ValueError(f"Unknown statistic {stat!r}; use one of {self.STATS}")
+        self.n = n
+        self.stat = stat
+        self.reset()
+
+    def reset(self) -> None:
+        self._history = np.zeros(self.n - 1, dtype=np.float64)
+        self._seen = 0
+
+    def settled(self) -> bool:
+        # The window must also have filled up, or its length still changes.
+        return self._seen >= self.n - 1 and not self._history.any()
+
+    def process(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float64)
+        if len(x) == 0:
+            return x.copy()
+        m = self.n - 1
+        buf = np.concatenate((self._history, x))
+        valid = np.arange(len(buf)) >= m - min(self._seen, m)
+        ref = float(x.mean())
+        d = np.where(valid, buf - ref, 0.0)
+        s1 = np.concatenate(([0.0], np.cumsum(d)))
+        s2 = np.concatenate(([0.0], np.cumsum(d * d)))
+        w1 = s1[self.n :] - s1[: len(s1) - self.n]
+        w2 = s2[self.n :] - s2[: len(s2) - self.n]
+        count = np.minimum(self._seen + np.arange(1, len(x) + 1), self.n)
+        self._history = buf[len(buf) - m :]
+        self._seen += len(x)
+        mean = w1 / count
+        if self.stat == "mean":
+            return mean + ref
+        var = np.maximum(w2 / count - mean * mean, 0.0)
+        return var if self.stat == "var" else np.sqrt(var)
+
+
+def fir_lowpass(cutoff: float, taps: int = DEFAULT_FIR_TAPS) -> np.ndarray:
+    """Hamming-windowed sinc low-pass taps with unit gain at DC."""
+    _check_cutoff(cutoff)
+    n = np.arange(taps) - (taps - 1) / 2
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+    return h / h.sum()
+
+
+def fir_highpass(cutoff: float, taps: int = DEFAULT_FIR_TAPS) -> np.ndarray:
+    """High-pass taps by spectral inversion of `fir_lowpass` (``taps`` made odd)."""
+    taps |= 1
+    h = -fir_lowpass(cutoff, taps)
+    h[taps // 2] += 1.0
+    return h
+
+
+def lowpass_biquad(cutoff: float, q: float = 1 / math.sqrt(2)) -> Biquad:
+    """Second-order low-pass section (audio EQ cookbook)."""
+    cos_w, alpha = _cookbook(cutoff, q)
+    return Biquad((1 - cos_w) / 2, 1 - cos_w, (1 - cos_w) / 2, 1 + alpha, -2 * cos_w, 1 - alpha)
+
+
+def highpass_biquad(cutoff: float, q: float = 1 / math.sqrt(2)) -> Biquad:
+    """Second-order high-pass section (audio EQ cookbook)."""
+    cos_w, alpha = _cookbook(cutoff, q)
+    return Biquad((1 + cos_w) / 2, -(1 + cos_w), (1 + cos_w) / 2, 1 + alpha, -2 * cos_w, 1 - alpha)
+
+
+def butterworth(order: int, cutoff: float, kind: str = "lowpass") -> IIRFilter:
+    """Butterworth low- or high-pass filter as cascaded sections."""
+    if order < 1:
+        raise ValueError("Filter order must be at least 1")
+    if kind not in ("lowpass", "highpass"):
+        raise ValueError(f"Unknown filter kind {kind!r}")
+    design = lowpass_biquad if kind == "lowpass" else highpass_biquad
+    # Pole pairs sit at angles theta from the negative real axis, each one a
+    # section with Q = 1 / (2 cos theta); an odd order adds the real pole.
+    if order % 2:
+        angles = [k * math.pi / order for k in range(1, (order - 1) // 2 + 1)]
+    else:
+        angles = [(2 * k + 1) * math.pi / (2 * order) for k in range(order // 2)]
+    sections: List[Biquad] = [design(cutoff, 1 / (2 * math.cos(theta))) for theta in angles]
+    if order % 2:
+        _check_cutoff(cutoff)
+        k = math.tan(math.pi * cutoff)
+        if kind == "lowpass":
+            sections.append(Biquad(k, k, 0.0, k + 1, k - 1, 0.0))
+        else:
+            sections.append(Biquad(1.0, -1.0, 0.0, k + 1, k - 1, 0.0))
+    return IIRFilter(sections)
+
+
+def _check_cutoff(cutoff: float) -> None:
+    if not 0 < cutoff < 0.5:
+        raise ValueError("Cutoff must be a fraction of the sampling rate in (0, 0.5)")
+
+
+def _cookbook(cutoff: float, q: float) -> Tuple[float, float]:
+    _check_cutoff(cutoff)
+    w0 = 2 * math.pi * cutoff
+    return math.cos(w0), math.sin(w0) / (2 * q)
+
+
+# GUI label -> filter kind accepted by `make_filter`
+FILTER_KINDS: Dict[str, str] = {
+    "Moving average (N)": "moving-average",
+    "Running std (N)": "running-std",
+    "FIR low-pass (cutoff)": "fir-lowpass",
+    "FIR high-pass (cutoff)": "fir-highpass",
+    "IIR low-pass (cutoff)": "iir-lowpass",
+    "IIR high-pass (cutoff)": "iir-highpass",
+}
+
+
+def make_filter(kind: str, value: float) -> Filter:
+    """Filter for ``kind`` (see `FILTER_KINDS`) with window length or cutoff ``value``."""
+    if not math.isfinite(value) or value <= 0:
+        raise ValueError(f"Filter parameter must be a positive number, got {value!r}")
+    if kind == "moving-average":
+        return MovingAverage(int(value))
+    if kind in ("running-mean", "running-var", "running-std"):
+        return RunningStats(int(value), kind.split("-")[1])
+    if kind == "fir-lowpass":
+        return FIRFilter(fir_lowpass(value))
+    if kind == "fir-highpass":
+        return FIRFilter(fir_highpass(value))
+    if kind == "iir-lowpass":
+        return butterworth(DEFAULT_IIR_ORDER, value, "lowpass")
+    if kind == "iir-highpass":
+        return butterworth(DEFAULT_IIR_ORDER, value, "highpass")
+    raise ValueError(f"Unknown filter {kind!r}")
+
+
+@instrumented("filters.filter_signal")
+def filter_signal(
+    sig: Signal,
+    filt: Filter,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    name: str | None = None,
+) -> Signal:
+    """Filter ``sig`` over its index range, one block at a time.
+
+    Missing samples inside the range count as 0; the output covers the same
+    range as the input (the filter's tail after the last sample is dropped),
+    except that once the filter has `settled` in a gap the rest of the gap is
+    skipped: its output would be 0. The filter is reset first.
+    """
+    filt.reset()
+    idx, vals = sig.to_sorted_arrays()
+    if len(idx) == 0:
+        return Signal({}, name=name or sig.name)
+    pos, stop = int(idx[0]), int(idx[-1]) + 1
+    starts: List[int] = []
+    outputs: List[np.ndarray] = []
+    a = 0
+    while pos < stop:
+        nxt = int(idx[a])
+        size = GAP_CHUNK
+        while pos < nxt and not filt.settled():
+            n = min(size, nxt - pos, block_size)
+            starts.append(pos)
+            outputs.append(filt.process(np.zeros(n, dtype=np.float64)))
+            pos += n
+            size *= 2
+        pos = nxt
+        b = int(np.searchsorted(idx, min(pos + block_size, stop)))
+        hi = int(idx[b - 1]) + 1  # zeros after the last sample are a gap
+        block = np.zeros(hi - pos, dtype=np.float64)
+        block[idx[a:b] - pos] = vals[a:b]
+        starts.append(pos)
+        outputs.append(filt.process(block))
+        pos, a = hi, b
+    if len(outputs) == 1:
+        return Signal(DenseSamples(starts[0], outputs[0]), name=name or sig.name)
+    indices = np.concatenate(
+        [np.arange(s, s + len(y), dtype=np.int64) for s, y in zip(starts, outputs)]
+    )
+    return Signal(from_arrays(indices, np.concatenate(outputs)), name=name or sig.name)
@@ -0,0 +1,409 @@
+"""Operation graph of loaded and derived signals.
+
+Every signal in the application is a `Node`: a source (a loaded file) or an
+operation with parameters applied to parent nodes. A node's identity is a
+structural hash of its operation, parameters and parents' hashes, so asking
+for the same derived signal twice returns the existing node and its cached
+result. Derived results are kept under a memory budget: the least recently
+used ones are dropped and recomputed from their parents when next needed.
+Source signals are never evicted.
+
+When a source is replaced (for example its file changed on disk), only its
+descendants are touched. If just a few sample values changed, the change is
+pushed through as a delta: sums and differences add the weighted delta to
+their cached result, and shift, fold and multiply re-wrap their parent.
+Anything else is dropped and recomputed on demand.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from signal_app.filters import filter_signal, make_filter
+from signal_app.resample import resample
+from signal_app.signals import Signal
+from signal_app.storage import (
+    DenseSamples,
+    SparseSamples,
+    TransformedSamples,
+    samples_nbytes,
+    sorted_arrays,
+)
+
+DEFAULT_MEMORY_BUDGET = 512 << 20
+# A source update is applied as a delta when at most this fraction of its
+# samples changed value (and no index was added or removed).
+DELTA_MAX_FRACTION = 0.1
+
+# Changed sample indices and the amount added to each value.
+Delta = Tuple[np.ndarray, np.ndarray]
+
+SOURCE = "source"
+
+
+def _sum(parents: Sequence[Signal], params: tuple, name: str) -> Signal:
+    (weights,) = params
+    return Signal.sum(parents, weights=list(weights), name=name)
+
+
+def _convolve(parents: Sequence[Signal], params: tuple, name: str) -> Signal:
+    acc = parents[0]
+    for sig in parents[1:]:
+        acc = acc.convolve(sig)
+    return Signal(acc.samples, name=name)
+
+
+def _filter(parents: Sequence[Signal], params: tuple, name: str) -> Signal:
+    kind, value = params
+    return filter_signal(parents[0], make_filter(kind, value), name=name)
+
+
+# op -> function(parent signals, params, name) computing the result
+OPERATIONS: Dict[str, Callable[[Sequence[Signal], tuple, str], Signal]] = {
+    "sum": _sum,
+    "multiply": lambda ps, params, name: ps[0].multiply(params[0], name=name),
+    "shift": lambda ps, params, name: ps[0].shift(params[0], name=name),
+    "fold": lambda ps, params, name: ps[0].fold(name=name),
+    "convolve": _convolve,
+    "correlate": lambda ps, params, name: ps[0].correlate(ps[1], name=name),
+    "filter": _filter,
+    "resample": lambda ps, params, name: resample(ps[0], params[0], params[1], name=name),
+}
+
+
+@dataclass(eq=False)
+class Node:
+    """One signal in the graph; ``result`` is None while evicted."""
+
+    key: str
+    op: str
+    params: tuple
+    parents: Tuple["Node", ...]
+    name: str
+    result: Signal | None = None
+    children: List["Node"] = field(default_factory=list)
+    last_used: int = 0
+    # Bumped whenever the result is replaced or dropped because an input
+    # changed, so a computation started earlier can tell it is stale.
+    generation: int = 0
+
+    @property
+    def is_source(self) -> bool:
+        return self.op == SOURCE
+
+    def descendants(self) -> List["Node"]:
+        """Nodes derived from this one, each listed after its parents."""
+        order: List[Node] = []
+        seen: set = set()
+
+        def visit(node: Node) -> None:
+            for child in node.children:
+                if child.key not in seen:
+                    seen.add(child.key)
+                    visit(child)
+                    order.append(child)
+
+        visit(self)
+        return order[::-1]
+
+
+def sample_delta(old: Signal, new: Signal) -> Delta | None:
+    """Delta turning ``old`` into ``new``, or None if indices differ or too much changed."""
+    old_idx, old_val = sorted_arrays(old.samples)
+    new_idx, new_val = sorted_arrays(new.samples)
+    if len(old_idx) != len(new_idx) or not np.array_equal(old_idx, new_idx):
+        return None
+    changed = np.flatnonzero(old_val != new_val)
+    if len(changed) > DELTA_MAX_FRACTION * len(old_idx):
+        return None
+    return old_idx[changed], new_val[changed] - old_val[changed]
+
+
+def apply_delta(sig: Signal, delta: Delta) -> Signal | None:
+    """``sig`` with ``delta`` added, or None if it lacks one of the indices.
+
+    The arrays are copied, never modified, since other signals may share them.
+    """
+    idx, add = delta
+    samples = sig.samples
+    if isinstance(samples, TransformedSamples):
+        samples = samples.materialize()
+    if isinstance(samples, DenseSamples):
+        pos = idx - samples.start
+        ok = (pos >= 0) & (pos < len(samples.values))
+        if not ok.all() or (samples.mask is not None and not samples.mask[pos].all()):
+            return None
+        values = samples.values.copy()
+        np.add.at(values, pos, add)
+        return Signal(DenseSamples(samples.start, values, samples.mask), name=sig.name)
+    indices, values = sorted_arrays(samples)
+    pos = np.searchsorted(indices, idx)
+    if (pos >= len(indices)).any() or not np.array_equal(indices[pos], idx):
+        return None
+    values = values.copy()
+    np.add.at(values, pos, add)
+    return Signal(SparseSamples(indices, values), name=sig.name)
+
+
+def _transform_delta(op: str, params: tuple, delta: Delta) -> Delta:
+    """Delta of a shift, fold or multiply result given its parent's delta."""
+    idx, add = delta
+    if op == "multiply":
+        return idx, add * params[0]
+    if op == "shift":
+        return idx + params[0], add
+    return -idx[::-1], add[::-1]
+
+
+def structural_key(op: str, params: tuple, parents: Sequence[Node]) -> str:
+    """Hash identifying the signal produced by ``op`` on ``parents``."""
+    text = repr((op, params, tuple(p.key for p in parents)))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _storage(sig: Signal) -> object:
+    """The object owning the sample arrays of ``sig`` (views share their base)."""
+    samples = sig.samples
+    return samples.base if isinstance(samples, TransformedSamples) else samples
+
+
+class SignalGraph:
+    """Nodes by structural key, with memoized results under a memory budget.
+
+    Results may be computed from worker threads; bookkeeping is locked but
+    the computation itself is not, so two jobs may occasionally compute the
+    same node and the later result simply replaces the earlier one. A result
+    whose inputs changed while it was being computed (a source was reloaded
+    or invalidated) is returned to its caller but not cached, so it cannot
+    overwrite the updated node.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> None:
+        self.memory_budget = memory_budget
+        self.nodes: Dict[str, Node] = {}
+        self.evictions = 0
+        self._clock = itertools.count(1)
+        self._lock = threading.RLock()
+
+    def source(self, signal: Signal, identity: str, name: str | None = None) -> Node:
+        """Node for a loaded signal; ``identity`` (e.g. the path) names the source.
+
+        Loading the same source again replaces its signal and updates the
+        results derived from it (see `update_source`).
+        """
+        key = structural_key(SOURCE, (identity,), ())
+        with self._lock:
+            node = self.nodes.get(key)
+            if node is None:
+                node = Node(key, SOURCE, (identity,), (), name or signal.name or identity)
+                self.nodes[key] = node
+                node.result = signal
+            else:
+                self.update_source(node, signal)
+            node.last_used = next(self._clock)
+        return node
+
+    def update_source(self, node: Node, signal: Signal) -> List[Node]:
+        """Replace the signal of source ``node`` and update what depends on it.
+
+        Returns the descendants whose results changed or were dropped.
+        """
+        with self._lock:
+            old = node.result
+            node.result = signal
+            stale = node.descendants()
+            for changed_node in [node] + stale:
+                changed_node.generation += 1
+            # key -> delta of a changed node (None: changed in an unknown way)
+            changed: Dict[str, Delta | None] = {
+                node.key: sample_delta(old, signal) if old is not None else None
+            }
+            for child in stale:
+                changed[child.key] = self._propagate(child, changed)
+            return stale
+
+    def _propagate(self, child: Node, changed: Dict[str, Delta | None]) -> Delta | None:
+        """Update ``child`` from its changed parents; return its own delta."""
+        deltas = [(i, changed[p.key]) for i, p in enumerate(child.parents) if p.key in changed]
+        if child.result is None or any(d is None for _i, d in deltas):
+            child.result = None
+            return None
+        if all(len(d[0]) == 0 for _i, d in deltas):
+            return deltas[0][1]
+        if child.op == "sum":
+            (weights,) = child.params
+            delta = (
+                np.concatenate([d[0] for _i, d in deltas]),
+                np.concatenate([weights[i] * d[1] for i, d in deltas]),
+            )
+            child.result = apply_delta(child.result, delta)
+            return delta if child.result is not None else None
+        if child.op in ("multiply", "shift", "fold"):
+            parent = child.parents[0].result
+            if parent is None:
+                child.result = None
+                return None
+            child.result = OPERATIONS[child.op]([parent], child.params, child.name)
+            return _transform_delta(child.op, child.params, deltas[0][1])
+        child.result = None
+        return None
+
+    def derive(
+        self,
+        op: str,
+        parents: Sequence[Node],
+        params: tuple = (),
+        name: str | None = None,
+    ) -> Node:
+        """Node for ``op`` applied to ``parents``; existing nodes are reused."""
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown operation {op!r}")
+        key = structural_key(op, params, parents)
+        with self._lock:
+            node = self.nodes.get(key)
+            if node is None:
+                node = Node(key, op, tuple(params), tuple(parents), name or op)
+                self.nodes[key] = node
+                for parent in parents:
+                    parent.children.append(node)
+        return node
+
+    def cached(self, node: Node) -> Signal | None:
+        """The result of ``node`` if it is in memory, without computing it."""
+        with self._lock:
+            if node.result is not None:
+                node.last_used = next(self._clock)
+            return node.result
+
+    def evaluate(
+        self,
+        node: Node,
+        progress: Callable[[float], None] | None = None,
+    ) -> Signal:
+        """Return the result of ``node``, recomputing evicted ancestors.
+
+        A cached node is returned as is; otherwise only the ancestors without
+        a cached result on the way to one are computed. ``progress`` receives
+        the fraction of those done before each step (a job's ``report`` also
+        stops the work when the job is cancelled).
+        """
+        sig = self.cached(node)
+        if sig is not None:
+            return sig
+        results: Dict[str, Signal] = {}
+        generations: Dict[str, int] = {}
+        order: List[Node] = []  # nodes to compute, parents first
+        stack: List[Tuple[Node, bool]] = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                order.append(current)
+                continue
+            if current.key in results or current.key in generations:
+                continue
+            sig = self.cached(current)
+            if sig is not None:
+                results[current.key] = sig
+                continue
+            if current.is_source:
+                raise ValueError(f"Source {current.name!r} is not loaded")
+            with self._lock:
+                generations[current.key] = current.generation
+            stack.append((current, True))
+            stack.extend((parent, False) for parent in current.parents)
+        for step, current in enumerate(order):
+            if progress is not None:
+                progress(step / len(order))
+            parents = [results[p.key] for p in current.parents]
+            sig = OPERATIONS[current.op](parents, current.params, current.name)
+            self._store(current, sig, generations)
+            results[current.key] = sig
+        return results[node.key]
+
+    def _store(self, node: Node, sig: Signal, generations: Dict[str, int]) -> None:
+        """Cache ``sig`` unless ``node`` changed after ``generations`` was taken.
+
+        Updating or invalidating an ancestor bumps the generation of every
+        descendant, so checking ``node`` itself is enough.
+        """
+        with self._lock:
+            if node.generation != generations[node.key]:
+                return
+            node.result = sig
+            node.last_used = next(self._clock)
+            self._evict(keep=node)
+
+    def invalidate(self, node: Node) -> List[Node]:
+        """Drop the cached results derived from ``node``; return those nodes."""
+        with self._lock:
+            stale = node.descendants()
+            for child in stale:
+                child.result = None
+                child.generation += 1
+            return stale
+
+    def memory_usage(self) -> int:
+        """Bytes held by cached derived results not shared with sources."""
+        with self._lock:
+            return self._derived_bytes()
+
+    def _derived_bytes(self) -> int:
+        return sum(self._owned_storage()[0].values())
+
+    def _owned_storage(self) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """Bytes of each storage held only by derived results, and how many hold it."""
+        pinned = {id(_storage(n.result)) for n in self.nodes.values()
+                  if n.is_source and n.result is not None}
+        owned: Dict[int, int] = {}
+        holders: Dict[int, int] = {}
+        for n in self.nodes.values():
+            if n.is_source or n.result is None:
+                continue
+            storage = _storage(n.result)
+            if id(storage) not in pinned:
+                owned[id(storage)] = samples_nbytes(storage)
+                holders[id(storage)] = holders.get(id(storage), 0) + 1
+        return owned, holders
+
+    def _evict(self, keep: Node) -> None:
+        """Drop least recently used derived results until within budget.
+
+        The total is computed once; a storage's bytes are released when the
+        last result holding it is dropped.
+        """
+        owned, holders = self._owned_storage()
+        total = sum(owned.values())
+        if total <= self.memory_budget:
+            return
+        candidates = sorted(
+            (n for n in self.nodes.values()
+             if not n.is_source and n.result is not None and n is not keep),
+            key=lambda n: n.last_used,
+        )
+        for victim in candidates:
+            if total <= self.memory_budget:
+                break
+            storage_id = id(_storage(victim.result))
+            victim.result = None
+            self.evictions += 1
+            if storage_id in holders:
+                holders[storage_id] -= 1
+                if holders[storage_id] == 0:
+                    total -= owned[storage_id]
+
+    def remove(self, node: Node) -> None:
+        """Forget ``node`` and everything derived from it."""
+        with self._lock:
+            for gone in [node] + node.descendants():
+                self.nodes.pop(gone.key, None)
+                gone.result = None
+                gone.generation += 1
+                for parent in gone.parents:
+                    if gone in parent.children:
+                        parent.children.remove(gone)
@@ -0,0 +1,172 @@
+"""Opt-in timing of hot paths.
+
+When enabled (``DSP_PROFILE=1`` in the environment, or `enable()`), functions
+wrapped with `instrumented` and blocks run under `timed` record their call
+count, wall time, samples produced and bytes of sample storage allocated.
+Disabled, a wrapped call costs one flag check.
+
+Samples and bytes are taken from a returned `Signal`: its sample count, and
+the size of its storage unless it is a lazy view sharing its parent's
+arrays (views count 0 bytes). `timed` blocks set them by hand.
+
+`stats()` returns the totals per name; `dump_json` and `dump_csv` write them.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from signal_app.storage import TransformedSamples, samples_nbytes
+
+# Enables instrumentation at import when set to a non-empty value.
+PROFILE_ENV = "DSP_PROFILE"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class OpStats:
+    """Totals recorded under one name."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    samples: int = 0
+    nbytes: int = 0
+    last_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+_enabled = bool(os.environ.get(PROFILE_ENV))
+_stats: Dict[str, OpStats] = {}
+_last: Tuple[str, float] | None = None
+_lock = threading.Lock()
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Forget everything recorded so far."""
+    global _last
+    with _lock:
+        _stats.clear()
+        _last = None
+
+
+def record(name: str, seconds: float, samples: int = 0, nbytes: int = 0) -> None:
+    """Add one call of ``name`` to the totals."""
+    global _last
+    with _lock:
+        entry = _stats.setdefault(name, OpStats())
+        entry.calls += 1
+        entry.seconds += seconds
+        entry.samples += samples
+        entry.nbytes += nbytes
+        entry.last_seconds = seconds
+        _last = (name, seconds)
+
+
+def stats() -> Dict[str, OpStats]:
+    """Snapshot of the totals by name."""
+    with _lock:
+        return {name: replace(entry) for name, entry in _stats.items()}
+
+
+def last_call() -> Tuple[str, float] | None:
+    """Name and duration of the most recently recorded call."""
+    return _last
+
+
+def _result_size(result: Any) -> Tuple[int, int]:
+    samples = getattr(result, "samples", None)
+    if samples is None:
+        return 0, 0
+    nbytes = 0 if isinstance(samples, TransformedSamples) else samples_nbytes(samples)
+    return len(samples), nbytes
+
+
+def instrumented(name: str) -> Callable[[F], F]:
+    """Decorator recording each call of the function under ``name``."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            record(name, elapsed, *_result_size(result))
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class timed:
+    """Context manager recording the enclosed block under ``name``.
+
+    Set ``samples`` and ``nbytes`` on the object inside the block to record
+    them too.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.samples = 0
+        self.nbytes = 0
+        self._start: float | None = None
+
+    def __enter__(self) -> "timed":
+        if _enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._start is not None and exc_type is None:
+            record(self.name, time.perf_counter() - self._start, self.samples, self.nbytes)
+
+
+_FIELDS = ("name", "calls", "seconds", "mean_seconds", "last_seconds", "samples", "nbytes")
+
+
+def _rows() -> list:
+    return [
+        {"name": name, **asdict(entry), "mean_seconds": entry.mean_seconds}
+        for name, entry in sorted(stats().items())
+    ]
+
+
+def dump_json(path: str) -> None:
+    import json
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_rows(), f, indent=2)
+
+
+def dump_csv(path: str) -> None:
+    import csv
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=_FIELDS)
+        writer.writeheader()
+        writer.writerows(_rows())
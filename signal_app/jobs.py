@@ -0,0 +1,195 @@
+"""Background jobs for the Tk application.
+
+Work runs on a thread pool (or a process pool for picklable, CPU-bound
+functions) while the Tk main loop stays responsive. Workers never touch Tk:
+`JobManager` polls the futures from the main loop through ``after()`` and
+runs the completion callbacks there. Thread jobs receive their `Job` so they
+can report progress and stop early when cancelled. A callback that raises is
+reported on stderr (as Tk does) without stopping later deliveries.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import traceback
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+class Job:
+    """Handle for one background task: progress, status and cancellation."""
+
+    def __init__(self, job_id: int, title: str) -> None:
+        self.id = job_id
+        self.title = title
+        self.status = PENDING
+        self.progress = 0.0
+        self.error: BaseException | None = None
+        self.future: Future | None = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation; a job that has not started never runs."""
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def report(self, fraction: float) -> None:
+        """Record progress in ``[0, 1]``; raise `JobCancelled` if cancelled.
+
+        Called from the worker, so long tasks stop at their next report.
+        """
+        self.progress = min(max(fraction, 0.0), 1.0)
+        if self._cancel.is_set():
+            raise JobCancelled(self.title)
+
+
+class JobManager:
+    """Runs jobs on executors and delivers results on the Tk main loop.
+
+    ``after`` is the widget's ``after`` method; ``on_change`` is called on the
+    main loop whenever job statuses or progress may have changed.
+    """
+
+    def __init__(
+        self,
+        after: Callable[[int, Callable[[], None]], Any],
+        on_change: Callable[[], None] | None = None,
+        max_workers: int | None = None,
+        poll_ms: int = 50,
+    ) -> None:
+        self._after = after
+        self._on_change = on_change or (lambda: None)
+        self._max_workers = max_workers
+        self._poll_ms = poll_ms
+        self._threads: Executor | None = None
+        self._processes: Executor | None = None
+        self._ids = itertools.count(1)
+        self._callbacks: Dict[int, tuple] = {}
+        self._polling = False
+        self.jobs: List[Job] = []
+
+    def submit(
+        self,
+        title: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+        process: bool = False,
+    ) -> Job:
+        """Schedule ``fn`` and return its `Job`.
+
+        Thread jobs are called as ``fn(job, *args)``. Process jobs are called
+        as ``fn(*args)`` and must be picklable; they only report start and end.
+        """
+        job = Job(next(self._ids), title)
+        if process:
+            if self._processes is None:
+                # multiprocessing is imported only once a process job is needed
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._processes = ProcessPoolExecutor(max_workers=self._max_workers)
+            job.future = self._processes.submit(fn, *args)
+        else:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="signal-job"
+                )
+            job.future = self._threads.submit(self._run_thread_job, job, fn, args)
+        self.jobs.append(job)
+        self._callbacks[job.id] = (on_done, on_error)
+        self._on_change()
+        if not self._polling:
+            self._polling = True
+            self._after(self._poll_ms, self._poll)
+        return job
+
+    @staticmethod
+    def _run_thread_job(job: Job, fn: Callable[..., Any], args: tuple) -> Any:
+        if job.cancelled:
+            raise JobCancelled(job.title)
+        job.status = RUNNING
+        return fn(job, *args)
+
+    def cancel(self, job: Job) -> None:
+        """Cancel ``job``; its callbacks will not run."""
+        job.cancel()
+        self._on_change()
+
+    def cancel_all(self) -> None:
+        for job in self.active():
+            job.cancel()
+        self._on_change()
+
+    def active(self) -> List[Job]:
+        """Jobs that are pending or running."""
+        return [j for j in self.jobs if j.status in (PENDING, RUNNING)]
+
+    def _poll(self) -> None:
+        try:
+            self._deliver_finished()
+        finally:
+            if self.active():
+                self._after(self._poll_ms, self._poll)
+            else:
+                self._polling = False
+
+    @staticmethod
+    def _call(callback: Callable[[Any], None] | None, value: Any) -> None:
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception:
+            traceback.print_exc()
+
+    def _deliver_finished(self) -> None:
+        for job in self.active():
+            future = job.future
+            if job.status == PENDING and future.running():
+                job.status = RUNNING
+            if not future.done():
+                continue
+            on_done, on_error = self._callbacks.pop(job.id, (None, None))
+            if job.cancelled or future.cancelled():
+                job.status = CANCELLED
+                continue
+            exc = future.exception()
+            if isinstance(exc, JobCancelled):
+                job.status = CANCELLED
+            elif exc is not None:
+                job.status = FAILED
+                job.error = exc
+                self._call(on_error, exc)
+            else:
+                job.status = DONE
+                job.progress = 1.0
+                self._call(on_done, future.result())
+        # Forget old finished jobs so the list only shows recent activity.
+        finished = [j.id for j in self.jobs if j.status not in (PENDING, RUNNING)]
+        keep = set(finished[-20:])
+        self.jobs = [j for j in self.jobs if j.status in (PENDING, RUNNING) or j.id in keep]
+        self._on_change()
+
+    def shutdown(self) -> None:
+        """Cancel outstanding jobs and stop the executors without waiting."""
+        self.cancel_all()
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
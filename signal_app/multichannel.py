@@ -0,0 +1,191 @@
+"""Multichannel signals sharing one index axis.
+
+A `SignalBatch` holds C channels as a (C, N) float64 array over sorted,
+unique int64 indices. Operations follow `Signal` semantics and run on all
+channels in one vectorized call: ``multiply`` takes one scalar or one per
+channel, ``shift`` and ``fold`` move the shared axis without copying, and
+``add`` / ``subtract`` take another batch (one channel broadcasts) or a
+`Signal` (applied to every channel) over the union of indices. On a shared
+axis a channel has a value at every index, so samples missing from one
+operand count as 0.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from signal_app.binio import is_binary_file, read_binary_columns, write_binary_columns
+from signal_app.signals import Signal
+from signal_app.storage import DenseSamples, SparseSamples, sort_unique
+from signal_app.txtio import read_txt_columns_file, write_txt_columns
+
+
+@dataclass(slots=True)
+class SignalBatch:
+    """Channels ``values[c]`` sampled at the shared sorted ``indices``."""
+
+    indices: np.ndarray
+    values: np.ndarray
+    name: str | None = None
+    channel_names: List[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.indices = np.asarray(self.indices, dtype=np.int64)
+        self.values = np.asarray(self.values, dtype=np.float64)
+        if self.values.ndim == 1:
+            self.values = self.values[np.newaxis, :]
+        if self.values.shape[1] != len(self.indices):
+            raise ValueError("values must have one column per index")
+        if len(self.channel_names) != self.channels:
+            self.channel_names = [f"ch{c}" for c in range(self.channels)]
+
+    @property
+    def channels(self) -> int:
+        return self.values.shape[0]
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def memory_usage(self) -> int:
+        """Bytes held by the index and value arrays."""
+        return self.indices.nbytes + self.values.nbytes
+
+    @staticmethod
+    def from_signals(signals: Sequence[Signal], name: str | None = None) -> "SignalBatch":
+        """Stack signals on the union of their indices (missing samples are 0)."""
+        arrays = [sig.to_sorted_arrays() for sig in signals]
+        indices = _union([idx for idx, _ in arrays])
+        values = np.zeros((len(arrays), len(indices)), dtype=np.float64)
+        for row, (idx, vals) in zip(values, arrays):
+            row[np.searchsorted(indices, idx)] = vals
+        return SignalBatch(indices, values, name, [s.name or "" for s in signals])
+
+    @staticmethod
+    def from_txt_file(
+        path: str,
+        name: str | None = None,
+        progress: Callable[[int], None] | None = None,
+    ) -> "SignalBatch":
+        """Parse a multi-column TXT file (rows ``index v1 ... vC``)."""
+        indices, values, _stats = read_txt_columns_file(path, progress=progress)
+        indices, values = sort_unique(indices, values)
+        return SignalBatch(indices, values.T, name or path)
+
+    @staticmethod
+    def from_binary_file(path: str, name: str | None = None) -> "SignalBatch":
+        """Memory-map a multichannel binary file (see `signal_app.binio`)."""
+        indices, values, stored_name, channel_names = read_binary_columns(path)
+        return SignalBatch(indices, values, name or stored_name or path, channel_names)
+
+    @staticmethod
+    def from_file(
+        path: str,
+        name: str | None = None,
+        progress: Callable[[int], None] | None = None,
+    ) -> "SignalBatch":
+        """Load a binary or TXT batch, detected by its leading bytes."""
+        if is_binary_file(path):
+            return SignalBatch.from_binary_file(path, name=name)
+        return SignalBatch.from_txt_file(path, name=name, progress=progress)
+
+    def to_txt_file(self, path: str) -> None:
+        write_txt_columns(path, self.indices, self.values.T)
+
+    def to_binary_file(self, path: str) -> None:
+        write_binary_columns(path, self.indices, self.values, self.name, self.channel_names)
+
+    def channel(self, c: int) -> Signal:
+        """Channel ``c`` as a `Signal` sharing this batch's arrays."""
+        values = self.values[c]
+        idx = self.indices
+        if len(idx) and idx[-1] - idx[0] + 1 == len(idx):
+            samples = DenseSamples(int(idx[0]), values)
+        elif len(idx):
+            samples = SparseSamples(idx, values)
+        else:
+            samples = {}
+        return Signal(samples, name=f"{self.name or 'batch'}[{self.channel_names[c]}]")
+
+    def select(self, channels: Sequence[int]) -> "SignalBatch":
+        """A batch of the chosen channels."""
+        channels = list(channels)
+        return SignalBatch(
+            self.indices,
+            self.values[channels],
+            self.name,
+            [self.channel_names[c] for c in channels],
+        )
+
+    def multiply(self, scalars: float | Sequence[float], name: str | None = None) -> "SignalBatch":
+        """Scale every channel by one scalar, or channel ``c`` by ``scalars[c]``."""
+        factors = np.asarray(scalars, dtype=np.float64)
+        if factors.ndim == 1:
+            if len(factors) != self.channels:
+                raise ValueError(f"Expected {self.channels} scalars, got {len(factors)}")
+            factors = factors[:, np.newaxis]
+        return self._derived(self.indices, self.values * factors, name)
+
+    def shift(self, k: int, name: str | None = None) -> "SignalBatch":
+        """Delay all channels by ``k`` (advance if negative); values are shared."""
+        return self._derived(self.indices + k, self.values, name)
+
+    def fold(self, name: str | None = None) -> "SignalBatch":
+        """Time-reverse all channels; the result views this batch's values."""
+        return self._derived(-self.indices[::-1], self.values[:, ::-1], name)
+
+    def add(self, other: "SignalBatch | Signal", name: str | None = None) -> "SignalBatch":
+        return self._combine(other, 1.0, name)
+
+    def subtract(self, other: "SignalBatch | Signal", name: str | None = None) -> "SignalBatch":
+        return self._combine(other, -1.0, name)
+
+    def _combine(self, other: "SignalBatch | Signal", sign: float, name: str | None) -> "SignalBatch":
+        if isinstance(other, Signal):
+            other_idx, other_vals = other.to_sorted_arrays()
+            other_vals = other_vals[np.newaxis, :]
+        else:
+            other_idx, other_vals = other.indices, other.values
+            if other.channels not in (1, self.channels):
+                raise ValueError(
+                    f"Cannot combine {self.channels} channels with {other.channels}"
+                )
+        if len(other_idx) == len(self.indices) and np.array_equal(other_idx, self.indices):
+            return self._derived(self.indices, self.values + sign * other_vals, name)
+        indices = _union([self.indices, other_idx])
+        values = np.zeros((self.channels, len(indices)), dtype=np.float64)
+        values[:, np.searchsorted(indices, self.indices)] = self.values
+        values[:, np.searchsorted(indices, other_idx)] += sign * other_vals
+        return self._derived(indices, values, name)
+
+    def _derived(self, indices: np.ndarray, values: np.ndarray, name: str | None) -> "SignalBatch":
+        return SignalBatch(indices, values, name or self.name, list(self.channel_names))
+
+
+def _union(index_arrays: Sequence[np.ndarray]) -> np.ndarray:
+    """Sorted union of sorted unique index arrays."""
+    if len(index_arrays) == 1:
+        return index_arrays[0]
+    return np.unique(np.concatenate(index_arrays))
+
+
+def parse_channels(text: str, channels: int) -> List[int]:
+    """Channel numbers from ``"0-3, 7"`` (empty text selects all channels)."""
+    if not text.strip():
+        return list(range(channels))
+    chosen: List[int] = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        try:
+            first, last = int(lo), int(hi) if sep else int(lo)
+        except ValueError as exc:
+            raise ValueError(f"Invalid channel range {part!r}") from exc
+        if not 0 <= first <= last < channels:
+            raise ValueError(f"Channel range {part!r} outside 0-{channels - 1}")
+        chosen.extend(range(first, last + 1))
+    return chosen
@@ -0,0 +1,253 @@
+"""Out-of-core arithmetic on signal files larger than memory.
+
+A `DiskSignal` names a TXT or binary signal file and reads it in chunks of
+at most ``chunk_size`` samples. Operations stream the chunks through and
+write the result as they go, with `BinaryWriter` or `TxtWriter` chosen by
+the output suffix, so peak memory depends on the chunk size, not on the
+file size:
+
+- ``multiply`` and ``shift`` map each chunk;
+- ``fold`` walks the chunks from the end of the file, reversing each one;
+- ``add``, ``subtract`` and `weighted_sum` merge their inputs on index.
+  Each input holds at most one chunk; samples up to the smallest last index
+  held by an unfinished input are summed with `storage.weighted_sum` and
+  written, the rest waits for the next chunk.
+
+Binary files are memory-mapped and read in either direction. TXT files are
+read forwards and must list their indices in increasing order (a repeated
+index keeps its last value, as when loading); folding one first copies it
+to a temporary binary file.
+
+Usage::
+
+    python -m signal_app.outofcore add a.txt b.sigbin -o sum.sigbin
+    python -m signal_app.outofcore shift a.sigbin -3 -o delayed.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from signal_app.binio import BINARY_SUFFIX, BinaryWriter, is_binary_file, read_binary
+from signal_app.signals import Signal
+from signal_app.storage import DenseSamples, SparseSamples, sorted_arrays
+from signal_app.storage import weighted_sum as _sum_samples
+from signal_app.txtio import TxtWriter, iter_txt_file
+
+# Samples per chunk read from an input file.
+DEFAULT_CHUNK_SAMPLES = 1 << 20
+# TXT bytes parsed per chunk, per sample of ``chunk_size``.
+_TXT_BYTES_PER_SAMPLE = 16
+
+Chunk = Tuple[np.ndarray, np.ndarray]
+
+
+def open_writer(path: str, name: str | None = None) -> BinaryWriter | TxtWriter:
+    """Incremental writer for ``path``: binary for ``.sigbin``, TXT otherwise."""
+    if path.lower().endswith(BINARY_SUFFIX):
+        return BinaryWriter(path, name=name)
+    return TxtWriter(path)
+
+
+@dataclass
+class DiskSignal:
+    """A signal file processed in chunks of ``chunk_size`` samples."""
+
+    path: str
+    chunk_size: int = DEFAULT_CHUNK_SAMPLES
+    name: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+
+    @property
+    def is_binary(self) -> bool:
+        return is_binary_file(self.path)
+
+    def chunks(self, reverse: bool = False) -> Iterator[Chunk]:
+        """Sorted ``(indices, values)`` chunks, last chunk first if ``reverse``."""
+        if self.is_binary:
+            return _binary_chunks(self.path, self.chunk_size, reverse)
+        if reverse:
+            raise ValueError(f"{self.path}: TXT files can only be read forwards")
+        return _txt_chunks(self.path, self.chunk_size)
+
+    def to_signal(self) -> Signal:
+        """Load the whole file as an in-memory `Signal`."""
+        return Signal.from_file(self.path, name=self.name)
+
+    def multiply(self, scalar: float, out: str, name: str | None = None) -> "DiskSignal":
+        return self._map(out, name, lambda idx, vals: (idx, vals * scalar))
+
+    def shift(self, k: int, out: str, name: str | None = None) -> "DiskSignal":
+        """x(n - k) written to ``out``."""
+        return self._map(out, name, lambda idx, vals: (idx + k, vals))
+
+    def fold(self, out: str, name: str | None = None) -> "DiskSignal":
+        """x(-n) written to ``out``, reading the input from its last chunk."""
+        if not self.is_binary:
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(out))) as tmp:
+                staged_path = os.path.join(tmp, "staged" + BINARY_SUFFIX)
+                staged = self._map(staged_path, None, lambda idx, vals: (idx, vals))
+                return staged.fold(out, name=name or self.name)
+        with open_writer(out, name or self.name) as writer:
+            for idx, vals in self.chunks(reverse=True):
+                writer.write(-idx[::-1], vals[::-1])
+        return DiskSignal(out, self.chunk_size, name or self.name)
+
+    def add(self, other: "DiskSignal", out: str, name: str | None = None) -> "DiskSignal":
+        return weighted_sum([self, other], [1.0, 1.0], out, name=name)
+
+    def subtract(self, other: "DiskSignal", out: str, name: str | None = None) -> "DiskSignal":
+        return weighted_sum([self, other], [1.0, -1.0], out, name=name)
+
+    def _map(
+        self,
+        out: str,
+        name: str | None,
+        fn: Callable[[np.ndarray, np.ndarray], Chunk],
+    ) -> "DiskSignal":
+        with open_writer(out, name or self.name) as writer:
+            for idx, vals in self.chunks():
+                writer.write(*fn(idx, vals))
+        return DiskSignal(out, self.chunk_size, name or self.name)
+
+
+def _binary_chunks(path: str, chunk_size: int, reverse: bool) -> Iterator[Chunk]:
+    samples, _name = read_binary(path)
+    if not len(samples):
+        return
+    if isinstance(samples, DenseSamples):
+        total = len(samples.values)
+    else:
+        total = len(samples.indices)
+    starts = range(0, total, chunk_size)
+    for lo in reversed(starts) if reverse else starts:
+        hi = min(lo + chunk_size, total)
+        if isinstance(samples, DenseSamples):
+            idx = np.arange(samples.start + lo, samples.start + hi, dtype=np.int64)
+            vals = np.asarray(samples.values[lo:hi], dtype=np.float64)
+            if samples.mask is not None:
+                keep = np.asarray(samples.mask[lo:hi])
+                idx, vals = idx[keep], vals[keep]
+        else:
+            idx = np.asarray(samples.indices[lo:hi], dtype=np.int64)
+            vals = np.asarray(samples.values[lo:hi], dtype=np.float64)
+        yield idx, vals
+
+
+def _txt_chunks(path: str, chunk_size: int) -> Iterator[Chunk]:
+    """TXT rows in chunks, checked for order; repeated indices keep the last value.
+
+    The last sample of each chunk is held back until the next chunk shows
+    whether it repeats.
+    """
+    held: Chunk | None = None
+    for idx, vals in iter_txt_file(path, chunk_size * _TXT_BYTES_PER_SAMPLE):
+        if not len(idx):
+            continue
+        if held is not None:
+            idx = np.concatenate((held[0], idx))
+            vals = np.concatenate((held[1], vals))
+        if (np.diff(idx) < 0).any():
+            raise ValueError(
+                f"{path}: indices must be in increasing order for out-of-core processing"
+            )
+        last = np.ones(len(idx), dtype=bool)
+        last[:-1] = idx[1:] != idx[:-1]
+        if not last.all():
+            idx, vals = idx[last], vals[last]
+        held = (idx[-1:], vals[-1:])
+        if len(idx) > 1:
+            yield idx[:-1], vals[:-1]
+    if held is not None:
+        yield held
+
+
+def weighted_sum(
+    signals: Sequence[DiskSignal],
+    weights: Sequence[float] | None,
+    out: str,
+    name: str | None = None,
+) -> DiskSignal:
+    """``sum(w * s)`` of on-disk signals over the union of indices, to ``out``."""
+    if weights is None:
+        weights = [1.0] * len(signals)
+    elif len(weights) != len(signals):
+        raise ValueError("weights must match the number of signals")
+    sources = [s.chunks() for s in signals]
+    buffers: List[Chunk | None] = [None] * len(sources)
+    done = [False] * len(sources)
+    with open_writer(out, name) as writer:
+        while True:
+            for i, source in enumerate(sources):
+                while not done[i] and (buffers[i] is None or not len(buffers[i][0])):
+                    buffers[i] = next(source, None)
+                    done[i] = buffers[i] is None
+            held = [(i, b) for i, b in enumerate(buffers) if b is not None and len(b[0])]
+            if not held:
+                break
+            # Every unfinished input has reached ``bound``; finished ones have
+            # nothing more to add, so all samples up to it are final.
+            open_ends = [b[0][-1] for i, b in held if not done[i]]
+            bound = min(open_ends) if open_ends else None
+            parts, part_weights = [], []
+            for i, (idx, vals) in held:
+                cut = len(idx) if bound is None else int(np.searchsorted(idx, bound, "right"))
+                if cut:
+                    parts.append(SparseSamples(idx[:cut], vals[:cut]))
+                    part_weights.append(weights[i])
+                buffers[i] = (idx[cut:], vals[cut:])
+            writer.write(*sorted_arrays(_sum_samples(parts, part_weights)))
+    chunk_size = max(s.chunk_size for s in signals) if signals else DEFAULT_CHUNK_SAMPLES
+    return DiskSignal(out, chunk_size, name)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m signal_app.outofcore",
+        description="Arithmetic on signal files too large for memory.",
+    )
+    parser.add_argument("op", choices=("add", "subtract", "multiply", "shift", "fold"))
+    parser.add_argument("inputs", nargs="+", help="input files, then the scalar or k if needed")
+    parser.add_argument("-o", "--output", required=True, help="output file (.sigbin for binary)")
+    parser.add_argument(
+        "--chunk", type=int, default=DEFAULT_CHUNK_SAMPLES, help="samples per chunk"
+    )
+    args = parser.parse_args(argv)
+    inputs = list(args.inputs)
+    try:
+        if args.op in ("multiply", "shift"):
+            if len(inputs) != 2:
+                parser.error(f"{args.op} takes one input file and a number")
+            source = DiskSignal(inputs[0], args.chunk)
+            if args.op == "multiply":
+                source.multiply(float(inputs[1]), args.output)
+            else:
+                source.shift(int(inputs[1]), args.output)
+        elif args.op == "fold":
+            if len(inputs) != 1:
+                parser.error("fold takes one input file")
+            DiskSignal(inputs[0], args.chunk).fold(args.output)
+        else:
+            if len(inputs) < 2:
+                parser.error(f"{args.op} takes two or more input files")
+            signals = [DiskSignal(path, args.chunk) for path in inputs]
+            weights = [1.0] + [1.0 if args.op == "add" else -1.0] * (len(inputs) - 1)
+            weighted_sum(signals, weights, args.output)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
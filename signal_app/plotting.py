@@ -0,0 +1,207 @@
+"""Level-of-detail rendering of long signals on a Matplotlib axes.
+
+Each series is decimated to the axes' pixel width with min/max envelope
+bucketing, so drawing cost depends on the screen size rather than the number
+of samples. Small visible ranges are drawn as stems at full resolution,
+medium ones as a plain line, and large ones as a min/max envelope. When the
+x-limits change (zoom or pan), only the visible index range is re-decimated.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+# Visible samples up to this count are drawn as stems at full resolution.
+STEM_MAX_POINTS = 2000
+# Samples per pixel column above which a min/max envelope replaces the line.
+ENVELOPE_POINTS_PER_PIXEL = 2
+
+
+def minmax_envelope(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    buckets: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce sorted samples to per-bucket min and max, interleaved for a line.
+
+    Buckets split the index range evenly. The result holds two points per
+    non-empty bucket (at the bucket's first index), so drawing it as a line
+    traces the envelope of the original samples.
+    """
+    if len(xs) <= 2 * buckets:
+        return xs, ys
+    edges = np.linspace(xs[0], xs[-1], buckets + 1)
+    starts = np.unique(np.searchsorted(xs, edges[:-1]))
+    starts = starts[starts < len(xs)]
+    lows = np.minimum.reduceat(ys, starts)
+    highs = np.maximum.reduceat(ys, starts)
+    env_x = np.repeat(xs[starts], 2)
+    env_y = np.empty(2 * len(starts), dtype=np.float64)
+    env_y[0::2] = lows
+    env_y[1::2] = highs
+    return env_x, env_y
+
+
+def visible_slice(xs: np.ndarray, x0: float, x1: float) -> slice:
+    """Slice of sorted ``xs`` inside ``[x0, x1]``, plus one sample each side."""
+    lo = max(int(np.searchsorted(xs, x0, side="left")) - 1, 0)
+    hi = min(int(np.searchsorted(xs, x1, side="right")) + 1, len(xs))
+    return slice(lo, hi)
+
+
+@dataclass
+class _Series:
+    label: str
+    xs: np.ndarray
+    ys: np.ndarray
+    color: str
+    mode: str = ""
+    artist: object = None
+
+
+class LodPlotter:
+    """Draws series on ``ax`` and re-decimates them when the view changes.
+
+    ``schedule`` runs a callback later (for example Tk's ``after_idle``) so
+    artists are not replaced while Matplotlib is drawing; by default the
+    callback runs immediately.
+    """
+
+    def __init__(
+        self,
+        ax,
+        schedule: Callable[[Callable[[], None]], object] | None = None,
+    ) -> None:
+        self.ax = ax
+        self.schedule = schedule or (lambda fn: fn())
+        self.series: List[_Series] = []
+        self._cid: int | None = None
+        self._rendered_xlim: Tuple[float, float] | None = None
+        self._pending = False
+
+    def set_series(self, series: Sequence[Tuple[str, np.ndarray, np.ndarray]]) -> None:
+        """Replace the plotted series with ``(label, xs, ys)`` sorted arrays."""
+        self.detach()
+        self.series = [
+            _Series(label, np.asarray(xs), np.asarray(ys, dtype=np.float64), f"C{i % 10}")
+            for i, (label, xs, ys) in enumerate(series)
+        ]
+        self._render(full=True)
+        self._cid = self.ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+
+    def detach(self) -> None:
+        """Stop listening to the axes (call before clearing it)."""
+        if self._cid is not None:
+            self.ax.callbacks.disconnect(self._cid)
+            self._cid = None
+        self.series = []
+        self._rendered_xlim = None
+
+    def _pixel_width(self) -> int:
+        return max(int(self.ax.get_window_extent().width), 100)
+
+    def _on_xlim_changed(self, _ax=None) -> None:
+        if self._pending:
+            return
+        self._pending = True
+
+        def run() -> None:
+            self._pending = False
+            if tuple(self.ax.get_xlim()) != self._rendered_xlim:
+                self._render(full=False)
+                self.ax.figure.canvas.draw_idle()
+
+        self.schedule(run)
+
+    def _render(self, full: bool) -> None:
+        width = self._pixel_width()
+        xlim = None if full else self.ax.get_xlim()
+        for s in self.series:
+            if len(s.xs) == 0:
+                continue
+            window = slice(None) if xlim is None else visible_slice(s.xs, *xlim)
+            xs, ys = s.xs[window], s.ys[window]
+            if len(xs) <= STEM_MAX_POINTS:
+                mode = "stem"
+            elif len(xs) <= ENVELOPE_POINTS_PER_PIXEL * width:
+                mode = "line"
+            else:
+                mode = "envelope"
+                xs, ys = minmax_envelope(xs, ys, width)
+            self._draw(s, mode, xs, ys)
+        if self.series:
+            self.ax.legend(loc="best")
+        if full:
+            self.ax.relim()
+            self.ax.autoscale_view()
+        self._rendered_xlim = tuple(self.ax.get_xlim())
+
+    def _draw(self, s: _Series, mode: str, xs: np.ndarray, ys: np.ndarray) -> None:
+        if s.mode != "stem" and mode != "stem" and s.artist is not None:
+            s.artist.set_data(xs, ys)
+            s.mode = mode
+            return
+        if s.artist is not None:
+            s.artist.remove()
+        if mode == "stem":
+            s.artist = self.ax.stem(
+                xs, ys, linefmt=f"{s.color}-", markerfmt=f"{s.color}o", label=s.label
+            )
+        else:
+            (s.artist,) = self.ax.plot(xs, ys, color=s.color, linewidth=0.8, label=s.label)
+        s.mode = mode
+
+
+class ScrollingPlot:
+    """Live line plot of the newest ``window`` samples, updated by blitting.
+
+    The axes and grid are drawn once into a cached background; each update
+    only restores that background and draws the line. The x-range moves in
+    steps of a quarter window, and the y-range grows when data leaves it;
+    only those changes trigger a full redraw.
+    """
+
+    def __init__(self, ax, window: int, label: str = "stream") -> None:
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.window = window
+        (self.line,) = ax.plot([], [], color="C0", linewidth=0.8, label=label, animated=True)
+        self._background = None
+        self._cid = self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, _event=None) -> None:
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
+
+    def update(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Show sorted samples ``xs, ys`` (the stream's retained window)."""
+        if len(xs) == 0:
+            return
+        width = max(int(self.ax.get_window_extent().width), 100)
+        self.line.set_data(*minmax_envelope(xs, ys, width))
+        redraw = self._background is None
+        x0, x1 = self.ax.get_xlim()
+        last = float(xs[-1])
+        if last > x1 or last < x0:
+            self.ax.set_xlim(last - 0.75 * self.window, last + 0.25 * self.window)
+            redraw = True
+        y0, y1 = self.ax.get_ylim()
+        lo, hi = float(ys.min()), float(ys.max())
+        if lo < y0 or hi > y1:
+            pad = 0.1 * max(hi - lo, 1e-12)
+            self.ax.set_ylim(min(lo - pad, y0), max(hi + pad, y1))
+            redraw = True
+        if redraw:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+
+    def close(self) -> None:
+        """Stop drawing and remove the line from the axes."""
+        self.canvas.mpl_disconnect(self._cid)
+        self.line.remove()
@@ -0,0 +1,188 @@
+"""Rational resampling of integer-indexed signals.
+
+Resampling by ``up / down`` puts input index ``n`` at output time
+``n * up / down``: output index ``m`` is the input at time ``m * down / up``,
+so index 0 stays at index 0 and signals captured at different rates land
+on a common grid. The output covers the indices whose time lies within the
+input's index range.
+
+`resample` is a polyphase FIR filter: conceptually the input is upsampled
+by ``up`` with zeros, low-pass filtered at the lower of the two Nyquist
+rates and every ``down``-th sample kept, but only the kept outputs are
+computed and only the non-zero inputs are multiplied. Output ``m`` uses the
+taps of phase ``(m * down) % up`` on inputs near ``m * down // up``. The
+zero-phase Hamming-windowed sinc keeps samples aligned (see
+`signal_app.filters.fir_lowpass`) and spans ``half_width`` input samples on
+each side.
+
+`decimate` and `interpolate` are the integer cases; `downsample` and
+`upsample` only move indices, without filtering. Sparse inputs are read
+through their sorted index arrays, and outputs are computed only near input
+samples (further away they are 0).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, Tuple
+
+import numpy as np
+
+from signal_app.filters import fir_lowpass
+from signal_app.instrument import instrumented
+from signal_app.signals import Signal
+from signal_app.storage import DenseSamples, SparseSamples
+
+# Input samples on each side of an output that the anti-alias filter spans.
+DEFAULT_HALF_WIDTH = 10
+# Outputs computed per vectorized step.
+OUTPUT_BLOCK = 1 << 16
+# Inputs filling less than this fraction of their index range are read sparsely.
+SPARSE_FILL = 0.5
+
+
+def resample_filter(
+    up: int,
+    down: int,
+    half_width: int = DEFAULT_HALF_WIDTH,
+) -> Tuple[np.ndarray, int]:
+    """Taps ``h[-K..K]`` of the anti-alias filter and ``K``.
+
+    The gain is ``up`` so that each phase passes DC with unit gain.
+    """
+    factor = max(up, down)
+    reach = half_width * factor
+    return up * fir_lowpass(0.5 / factor, 2 * reach + 1), reach
+
+
+def _polyphase(h: np.ndarray, reach: int, up: int) -> Tuple[np.ndarray, int]:
+    """Phase matrix ``G[r, t] = h[r + (i0 + t) * up]`` and ``i0``."""
+    i0 = -((reach + up - 1) // up)
+    taps = reach // up - i0 + 1
+    k = np.arange(up)[:, np.newaxis] + (i0 + np.arange(taps)) * up
+    valid = np.abs(k) <= reach
+    phases = np.where(valid, h[np.clip(k + reach, 0, len(h) - 1)], 0.0)
+    return phases, i0
+
+
+def _lookup(idx: np.ndarray, vals: np.ndarray, sparse: bool) -> Callable[[np.ndarray], np.ndarray]:
+    """``x(n)`` for an array of indices, 0 where the signal has no sample."""
+    if sparse:
+
+        def sparse_lookup(n: np.ndarray) -> np.ndarray:
+            pos = np.minimum(np.searchsorted(idx, n), len(idx) - 1)
+            return np.where(idx[pos] == n, vals[pos], 0.0)
+
+        return sparse_lookup
+    start = int(idx[0])
+    dense = np.zeros(int(idx[-1]) - start + 1, dtype=np.float64)
+    dense[idx - start] = vals
+
+    def dense_lookup(n: np.ndarray) -> np.ndarray:
+        pos = n - start
+        inside = (pos >= 0) & (pos < len(dense))
+        return np.where(inside, dense[np.clip(pos, 0, len(dense) - 1)], 0.0)
+
+    return dense_lookup
+
+
+def _output_indices(
+    idx: np.ndarray,
+    up: int,
+    down: int,
+    reach: int,
+    sparse: bool,
+) -> np.ndarray:
+    """Output indices within the input's range (near its samples if sparse)."""
+    lo = -((-int(idx[0]) * up) // down)
+    hi = (int(idx[-1]) * up) // down
+    if not sparse:
+        return np.arange(lo, hi + 1, dtype=np.int64)
+    # Output m depends on input n when |m * down - n * up| <= reach.
+    starts = np.maximum(-((reach - idx * up) // down), lo)
+    ends = np.minimum((idx * up + reach) // down, hi)
+    reach_end = np.maximum.accumulate(ends)
+    new = np.ones(len(starts), dtype=bool)
+    new[1:] = starts[1:] > reach_end[:-1] + 1
+    first = starts[new]
+    last = reach_end[np.append(np.flatnonzero(new)[1:] - 1, len(ends) - 1)]
+    lengths = np.maximum(last - first + 1, 0)
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(lengths.sum(), dtype=np.int64) + np.repeat(first - offsets, lengths)
+
+
+@instrumented("resample.resample")
+def resample(
+    sig: Signal,
+    up: int,
+    down: int,
+    half_width: int = DEFAULT_HALF_WIDTH,
+    name: str | None = None,
+) -> Signal:
+    """Resample ``sig`` by the rational factor ``up / down``."""
+    if up < 1 or down < 1:
+        raise ValueError("Resampling factors must be positive integers")
+    if half_width < 1:
+        raise ValueError("half_width must be at least 1")
+    g = math.gcd(up, down)
+    up, down = up // g, down // g
+    name = name or sig.name
+    idx, vals = sig.to_sorted_arrays()
+    if len(idx) == 0:
+        return Signal({}, name=name)
+    if up == down:
+        return Signal(sig.samples, name=name)
+    h, reach = resample_filter(up, down, half_width)
+    phases, i0 = _polyphase(h, reach, up)
+    sparse = len(idx) < SPARSE_FILL * (int(idx[-1]) - int(idx[0]) + 1)
+    x = _lookup(idx, vals, sparse)
+    out_idx = _output_indices(idx, up, down, reach, sparse)
+    out = np.zeros(len(out_idx), dtype=np.float64)
+    for lo in range(0, len(out_idx), OUTPUT_BLOCK):
+        m = out_idx[lo : lo + OUTPUT_BLOCK]
+        q, r = np.divmod(m * down, up)
+        acc = out[lo : lo + len(m)]
+        for t in range(phases.shape[1]):
+            acc += phases[r, t] * x(q - (i0 + t))
+    if sparse:
+        return Signal(SparseSamples(out_idx, out), name=name)
+    return Signal(DenseSamples(int(out_idx[0]), out) if len(out) else {}, name=name)
+
+
+def decimate(
+    sig: Signal,
+    factor: int,
+    half_width: int = DEFAULT_HALF_WIDTH,
+    name: str | None = None,
+) -> Signal:
+    """Low-pass filter and keep every ``factor``-th sample (index ``n`` -> ``n / factor``)."""
+    return resample(sig, 1, factor, half_width, name)
+
+
+def interpolate(
+    sig: Signal,
+    factor: int,
+    half_width: int = DEFAULT_HALF_WIDTH,
+    name: str | None = None,
+) -> Signal:
+    """Raise the rate by ``factor``, filling new samples by band-limited interpolation."""
+    return resample(sig, factor, 1, half_width, name)
+
+
+def upsample(sig: Signal, factor: int, name: str | None = None) -> Signal:
+    """Move sample ``n`` to index ``n * factor``; the indices between are 0."""
+    if factor < 1:
+        raise ValueError("Upsampling factor must be a positive integer")
+    idx, vals = sig.to_sorted_arrays()
+    return Signal(SparseSamples(idx * factor, vals) if len(idx) else {}, name=name or sig.name)
+
+
+def downsample(sig: Signal, factor: int, name: str | None = None) -> Signal:
+    """Keep the samples at multiples of ``factor``, without anti-alias filtering."""
+    if factor < 1:
+        raise ValueError("Downsampling factor must be a positive integer")
+    idx, vals = sig.to_sorted_arrays()
+    keep = idx % factor == 0
+    if not keep.any():
+        return Signal({}, name=name or sig.name)
+    return Signal(SparseSamples(idx[keep] // factor, vals[keep]), name=name or sig.name)
@@ -1,28 +1,73 @@
 """Signal parsing and operations for discrete-time signals.
 
-This module defines a sparse integer-indexed `Signal` with utilities to parse
-from the required TXT format and perform add, subtract, multiply, shift, and
-fold operations.
+This module defines an integer-indexed `Signal` with utilities to parse from
+the required TXT format and perform add, subtract, multiply, shift, fold,
+convolution and cross-correlation operations. Samples are held as sorted
+index/value arrays, or densely in a NumPy array when the indices are mostly
+contiguous (see `signal_app.storage`).
 """
 
 from __future__ import annotations
 
+import logging
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
-
-
-@dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from signal_app.binio import is_binary_file, read_binary, write_binary
+from signal_app.cache import ParseCache
+from signal_app.convolution import convolve, correlate
+from signal_app.instrument import instrumented
+from signal_app.storage import (
+    TransformedSamples,
+    combine,
+    compact,
+    from_pairs,
+    is_dense,
+    materialize,
+    samples_nbytes,
+    sorted_arrays,
+    weighted_sum,
+)
+from signal_app.txtio import parse_txt_row, read_txt_file, write_txt_file
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class Signal:
     """Discrete-time signal represented by a mapping from integer index to value.
 
-    We store sparse samples keyed by index. For plotting and operations, indices
-    are maintained as integers and values as floats.
+    We store samples keyed by index. For plotting and operations, indices are
+    maintained as integers and values as floats. A dict passed in is converted
+    to compact array storage automatically: `DenseSamples` when its indices are
+    mostly contiguous, `SparseSamples` otherwise.
     """
 
-    samples: Dict[int, float]
+    samples: Mapping[int, float]
     name: str | None = None
 
+    def __post_init__(self) -> None:
+        self.samples = compact(self.samples)
+
+    @property
+    def is_dense(self) -> bool:
+        """Whether samples are stored as a contiguous NumPy array."""
+        return is_dense(self.samples)
+
+    def memory_usage(self) -> int:
+        """Approximate bytes used by this signal and its sample storage.
+
+        Lazy views report the storage they share with their base signal, and
+        memory-mapped samples count the mapped file size.
+        """
+        return sys.getsizeof(self) + samples_nbytes(self.samples)
+
     @staticmethod
+    @instrumented("Signal.from_txt_lines")
     def from_txt_lines(lines: List[str], name: str | None = None) -> "Signal":
         """Create a Signal from text lines in the specified format.
 
@@ -51,68 +96,149 @@ class Signal:
             raise ValueError("Insufficient lines for provided N")
 
         for i in range(n):
-            row = lines[cursor + 1 + i].strip()
-            if not row:
-                raise ValueError(f"Missing row for sample {i+1}")
-            parts = row.split()
-            if len(parts) != 2:
-                raise ValueError(
-                    f"Line {i+2} must have exactly two entries: index value"
-                )
-            try:
-                idx = int(float(parts[0]))
-                val = float(parts[1])
-            except (TypeError, ValueError) as exc:
-                raise ValueError(f"Invalid index/value on line {i+2}") from exc
+            idx, val = parse_txt_row(lines[cursor + 1 + i], i)
             samples[idx] = val
 
         return Signal(samples=samples, name=name)
 
     @staticmethod
-    def from_txt_file(path: str, name: str | None = None) -> "Signal":
-        """Read a TXT file and parse a `Signal`."""
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.read().strip().splitlines()
+    @instrumented("Signal.from_txt_file")
+    def from_txt_file(
+        path: str,
+        name: str | None = None,
+        progress: Callable[[int], None] | None = None,
+        cache: ParseCache | None = None,
+    ) -> "Signal":
+        """Read a TXT file and parse a `Signal`.
+
+        The file is parsed in blocks by `signal_app.txtio`; ``progress`` gets
+        the bytes read so far after each block, and the throughput of each
+        load is logged at DEBUG level. With a ``cache`` (see
+        `signal_app.cache`) an unchanged file is only parsed once.
+        """
         if name is None:
             name = path
-        return Signal.from_txt_lines(lines, name=name)
+        if cache is not None:
+            return Signal(cache.load(path, progress=progress), name=name)
+        indices, values, stats = read_txt_file(path, progress=progress)
+        logger.debug("Parsed %s: %s", path, stats)
+        return Signal(from_pairs(indices, values), name=name)
+
+    @staticmethod
+    @instrumented("Signal.from_binary_file")
+    def from_binary_file(path: str, name: str | None = None) -> "Signal":
+        """Memory-map a binary signal file (see `signal_app.binio`)."""
+        samples, stored_name = read_binary(path)
+        if name is None:
+            name = stored_name or path
+        return Signal(samples, name=name)
+
+    @staticmethod
+    def from_file(
+        path: str,
+        name: str | None = None,
+        progress: Callable[[int], None] | None = None,
+        cache: ParseCache | None = None,
+    ) -> "Signal":
+        """Load a binary or TXT signal file, detected by its leading bytes.
+
+        ``cache`` is only used for TXT files; binary files are mapped directly.
+        """
+        if is_binary_file(path):
+            return Signal.from_binary_file(path, name=name)
+        return Signal.from_txt_file(path, name=name, progress=progress, cache=cache)
+
+    def to_txt_file(self, path: str) -> None:
+        """Write the signal in the TXT format."""
+        write_txt_file(path, *self.to_sorted_arrays())
+
+    def to_binary_file(self, path: str) -> None:
+        """Write the signal in the binary format (see `signal_app.binio`)."""
+        write_binary(path, self.samples, name=self.name)
 
     def to_sorted_series(self) -> Tuple[List[int], List[float]]:
-        """Return sorted indices and corresponding values for plotting."""
+        """Return sorted indices and corresponding values for plotting.
+
+        The storage is already ordered by index, so no sorting is needed.
+        """
         if not self.samples:
             return [], []
-        xs = sorted(self.samples.keys())
-        ys = [self.samples[i] for i in xs]
-        return xs, ys
+        xs, ys = sorted_arrays(self.samples)
+        return xs.tolist(), ys.tolist()
 
+    def to_sorted_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return sorted indices and values as int64/float64 NumPy arrays."""
+        return sorted_arrays(self.samples)
+
+    @instrumented("Signal.materialize")
+    def materialize(self, name: str | None = None) -> "Signal":
+        """Return a copy whose samples are computed (no lazy view)."""
+        return Signal(materialize(self.samples), name=name or self.name)
+
+    @instrumented("Signal.clone")
     def clone(self, name: str | None = None) -> "Signal":
         """Return a shallow copy, optionally with a new name."""
-        return Signal(samples=dict(self.samples), name=name or self.name)
+        return Signal(samples=self.samples.copy(), name=name or self.name)
 
     # Operations
+    @staticmethod
+    @instrumented("Signal.sum")
+    def sum(
+        signals: Sequence["Signal"],
+        weights: Sequence[float] | None = None,
+        name: str | None = None,
+    ) -> "Signal":
+        """Weighted pointwise sum of any number of signals in one pass.
+
+        ``Signal.sum([a, b, c], [1, -1, -1])`` equals ``a - b - c``; missing
+        indices are treated as 0 and weights default to 1.
+        """
+        return Signal(weighted_sum([s.samples for s in signals], weights), name=name)
+
+    @instrumented("Signal.add")
     def add(self, other: "Signal", name: str | None = None) -> "Signal":
         """Pointwise addition (missing indices treated as 0)."""
-        result: Dict[int, float] = dict(self.samples)
-        for idx, val in other.samples.items():
-            result[idx] = result.get(idx, 0.0) + val
-        return Signal(result, name=name)
+        return Signal(combine(self.samples, other.samples, 1.0), name=name)
 
+    @instrumented("Signal.subtract")
     def subtract(self, other: "Signal", name: str | None = None) -> "Signal":
         """Pointwise subtraction (self - other)."""
-        result: Dict[int, float] = dict(self.samples)
-        for idx, val in other.samples.items():
-            result[idx] = result.get(idx, 0.0) - val
-        return Signal(result, name=name)
-
+        return Signal(combine(self.samples, other.samples, -1.0), name=name)
+
+    @instrumented("Signal.convolve")
+    def convolve(
+        self,
+        other: "Signal",
+        method: str = "auto",
+        name: str | None = None,
+    ) -> "Signal":
+        """Linear convolution with ``other`` (see `signal_app.convolution`)."""
+        return Signal(convolve(self.samples, other.samples, method), name=name)
+
+    @instrumented("Signal.correlate")
+    def correlate(
+        self,
+        other: "Signal",
+        method: str = "auto",
+        name: str | None = None,
+    ) -> "Signal":
+        """Cross-correlation ``r[l] = sum_n self[n] * other[n - l]`` by lag ``l``."""
+        return Signal(correlate(self.samples, other.samples, method), name=name)
+
+    @instrumented("Signal.multiply")
     def multiply(self, scalar: float, name: str | None = None) -> "Signal":
-        """Scale signal by a scalar multiplier."""
-        return Signal({i: v * scalar for i, v in self.samples.items()}, name=name)
+        """Scale signal by a scalar multiplier (lazy view, see `TransformedSamples`)."""
+        return Signal(TransformedSamples.of(self.samples).scaled(scalar), name=name)
 
+    @instrumented("Signal.shift")
     def shift(self, k: int, name: str | None = None) -> "Signal":
-        """Shift indices by k: x(n-k). Positive k delays; negative k advances."""
-        return Signal({i + k: v for i, v in self.samples.items()}, name=name)
+        """Shift indices by k: x(n-k). Positive k delays; negative k advances.
 
-    def fold(self, name: str | None = None) -> "Signal":
-        """Time reversal: x(-n)."""
-        return Signal({-i: v for i, v in self.samples.items()}, name=name)
+        Returns a lazy view; no samples are copied.
+        """
+        return Signal(TransformedSamples.of(self.samples).shifted(k), name=name)
 
+    @instrumented("Signal.fold")
+    def fold(self, name: str | None = None) -> "Signal":
+        """Time reversal: x(-n). Returns a lazy view; no samples are copied."""
+        return Signal(TransformedSamples.of(self.samples).folded(), name=name)
@@ -0,0 +1,158 @@
+"""Spectra of signals: DFT magnitude and phase, and Welch power spectral density.
+
+Frequencies are in cycles per sample, from 0 to 0.5 (signals are real, so
+only the non-negative half is kept). The DFT is taken over the signal's
+index range with missing samples counted as 0, and its phase refers to
+index 0 rather than to the first sample: a signal starting at index ``s``
+carries the factor ``exp(-2j*pi*f*s)``, so shifting a signal changes only
+the phase slope, as for the DTFT.
+
+Transforms are memoized in a `SpectrumCache` keyed by the identity of the
+signal's sample storage and the transform parameters, so switching plot
+views of the same signal does not recompute (or even re-read) its samples.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+import numpy as np
+
+from signal_app.signals import Signal
+
+DEFAULT_SEGMENT = 256
+DEFAULT_OVERLAP = 0.5
+DEFAULT_CACHE_ENTRIES = 32
+
+
+@dataclass
+class Spectrum:
+    """``values`` at frequencies ``freqs``: complex DFT bins or a real PSD."""
+
+    freqs: np.ndarray
+    values: np.ndarray
+
+    @property
+    def magnitude(self) -> np.ndarray:
+        return np.abs(self.values)
+
+    @property
+    def phase(self) -> np.ndarray:
+        """Phase in radians, wrapped to ``(-pi, pi]``."""
+        return np.angle(self.values)
+
+
+def fft_size(n: int) -> int:
+    """Smallest power of two holding ``n`` samples."""
+    return 1 << max(n - 1, 0).bit_length()
+
+
+def dense_span(sig: Signal) -> Tuple[int, np.ndarray]:
+    """First index and the values over the index range (gaps are 0)."""
+    idx, vals = sig.to_sorted_arrays()
+    if len(idx) == 0:
+        return 0, np.empty(0, dtype=np.float64)
+    start = int(idx[0])
+    if idx[-1] - start + 1 == len(idx):
+        return start, vals
+    dense = np.zeros(int(idx[-1]) - start + 1, dtype=np.float64)
+    dense[idx - start] = vals
+    return start, dense
+
+
+def dft(sig: Signal, nfft: int | None = None) -> Spectrum:
+    """DFT of ``sig`` on ``nfft`` bins (default: the next power of two)."""
+    start, x = dense_span(sig)
+    if len(x) == 0:
+        raise ValueError("Cannot take the spectrum of an empty signal")
+    nfft = nfft or fft_size(len(x))
+    if nfft < len(x):
+        raise ValueError(f"FFT size {nfft} is shorter than the signal ({len(x)} samples)")
+    freqs = np.fft.rfftfreq(nfft)
+    values = np.fft.rfft(x, nfft)
+    if start:
+        values *= np.exp(-2j * np.pi * freqs * start)
+    return Spectrum(freqs, values)
+
+
+def welch_psd(
+    sig: Signal,
+    nperseg: int = DEFAULT_SEGMENT,
+    overlap: float = DEFAULT_OVERLAP,
+) -> Spectrum:
+    """One-sided power spectral density by Welch's method.
+
+    The signal is cut into Hann-windowed segments of ``nperseg`` samples
+    overlapping by the fraction ``overlap``, and their periodograms are
+    averaged. A signal shorter than one segment is a single segment.
+    """
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap must be in [0, 1)")
+    _start, x = dense_span(sig)
+    if len(x) == 0:
+        raise ValueError("Cannot take the spectrum of an empty signal")
+    nperseg = min(nperseg, len(x))
+    step = max(int(nperseg * (1 - overlap)), 1)
+    window = np.hanning(nperseg) if nperseg > 2 else np.ones(nperseg)
+    segments = np.lib.stride_tricks.sliding_window_view(x, nperseg)[::step]
+    power = np.abs(np.fft.rfft(segments * window, axis=1)) ** 2
+    psd = power.mean(axis=0) / (window * window).sum()
+    # Fold the negative frequencies in, except at DC and Nyquist.
+    psd[1 : len(psd) - (nperseg % 2 == 0)] *= 2
+    return Spectrum(np.fft.rfftfreq(nperseg), psd)
+
+
+class SpectrumCache:
+    """Least recently used spectra keyed by sample storage and parameters.
+
+    Sample storages are never modified in place (operations build new ones),
+    so the storage object identifies the samples in O(1). Each entry keeps
+    its storage alive, so the ``id`` in its key cannot be reused while the
+    entry exists. Safe to share between jobs; a spectrum requested by two
+    jobs at once may be computed twice.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, Tuple[object, Spectrum]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def dft(self, sig: Signal, nfft: int | None = None) -> Spectrum:
+        return self._get(("dft", nfft), sig, lambda: dft(sig, nfft))
+
+    def welch_psd(
+        self,
+        sig: Signal,
+        nperseg: int = DEFAULT_SEGMENT,
+        overlap: float = DEFAULT_OVERLAP,
+    ) -> Spectrum:
+        return self._get(("welch", nperseg, overlap), sig, lambda: welch_psd(sig, nperseg, overlap))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, params: tuple, sig: Signal, compute: Callable[[], Spectrum]) -> Spectrum:
+        storage = sig.samples
+        key = (id(storage),) + params
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            self.misses += 1
+        spectrum = compute()
+        with self._lock:
+            self._entries[key] = (storage, spectrum)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return spectrum
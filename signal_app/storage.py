@@ -0,0 +1,442 @@
+"""Sample containers backing `Signal`.
+
+A `Signal` keeps its samples in a read-only ``Mapping[int, float]``. Signals
+whose indices are mostly contiguous use `DenseSamples`, which stores a start
+index and a contiguous float64 array so operations can run vectorized. All
+others use `SparseSamples`: sorted parallel int64 index and float64 value
+arrays (16 bytes per sample, versus roughly 100 for a dict of boxed numbers),
+which may also be memory-mapped from a binary file without copying.
+`TransformedSamples` is a lazy shifted, folded or scaled view of any of these.
+The helpers here pick the representation automatically and let all kinds be
+combined; plain dicts are still accepted as input.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
+
+# Below this many samples a dense array's mask is not worth it; store sparse.
+DENSE_MIN_SAMPLES = 32
+# Fraction of the index span that must be populated to store densely.
+DENSE_MIN_FILL = 0.5
+
+
+class Samples(Mapping):
+    """Read-only samples that can be exported as sorted NumPy arrays."""
+
+    __slots__ = ()
+
+    def sorted_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return populated indices and their values in ascending index order."""
+        raise NotImplementedError
+
+    def materialize(self) -> Mapping[int, float]:
+        """Return concrete samples (lazy views compute theirs here)."""
+        return self
+
+    def copy(self) -> "Samples":
+        """Return a copy; arrays are shared since they are never mutated."""
+        return self
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the sample arrays (views report their base)."""
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.sorted_arrays()[0].tolist())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Samples):
+            a_idx, a_val = self.sorted_arrays()
+            b_idx, b_val = other.sorted_arrays()
+            return np.array_equal(a_idx, b_idx) and np.array_equal(a_val, b_val)
+        return super().__eq__(other)
+
+
+class DenseSamples(Samples):
+    """Samples on the contiguous index range ``[start, start + len(values))``.
+
+    ``mask`` marks which slots hold a sample (``None`` means all of them).
+    Slots outside the mask always hold 0.0 so arrays can be summed directly.
+    """
+
+    __slots__ = ("start", "values", "mask", "_count")
+
+    def __init__(
+        self,
+        start: int,
+        values: np.ndarray,
+        mask: np.ndarray | None = None,
+    ) -> None:
+        self.start = int(start)
+        self.values = np.asarray(values, dtype=np.float64)
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.all():
+                mask = None
+        self.mask = mask
+        self._count = (
+            len(self.values) if mask is None else int(np.count_nonzero(mask))
+        )
+
+    @property
+    def stop(self) -> int:
+        """One past the last index covered by the array."""
+        return self.start + len(self.values)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, idx: int) -> float:
+        pos = idx - self.start
+        if 0 <= pos < len(self.values) and (self.mask is None or self.mask[pos]):
+            return float(self.values[pos])
+        raise KeyError(idx)
+
+    def __contains__(self, idx: object) -> bool:
+        if not isinstance(idx, (int, np.integer)):
+            return False
+        pos = int(idx) - self.start
+        return 0 <= pos < len(self.values) and (self.mask is None or bool(self.mask[pos]))
+
+    def __repr__(self) -> str:
+        return f"DenseSamples(start={self.start}, count={self._count}, span={len(self.values)})"
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + (0 if self.mask is None else self.mask.nbytes)
+
+    def sorted_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self.mask is None:
+            return np.arange(self.start, self.stop, dtype=np.int64), self.values
+        pos = np.flatnonzero(self.mask)
+        return pos + self.start, self.values[pos]
+
+    def scaled(self, scalar: float) -> "DenseSamples":
+        """Return the samples multiplied by ``scalar``."""
+        values = self.values * scalar
+        if self.mask is not None:
+            values[~self.mask] = 0.0
+        return DenseSamples(self.start, values, self.mask)
+
+    def shifted(self, k: int) -> "DenseSamples":
+        """Return the samples moved by ``k`` indices without copying data."""
+        return DenseSamples(self.start + k, self.values, self.mask)
+
+    def folded(self) -> "DenseSamples":
+        """Return the samples time-reversed (``x(-n)``) as reversed views."""
+        mask = None if self.mask is None else self.mask[::-1]
+        return DenseSamples(-(self.stop - 1), self.values[::-1], mask)
+
+
+class SparseSamples(Samples):
+    """Samples at sorted, unique ``indices`` with matching ``values``.
+
+    The arrays are used as given (no copy), so they may be memory-mapped.
+    """
+
+    __slots__ = ("indices", "values")
+
+    def __init__(self, indices: np.ndarray, values: np.ndarray) -> None:
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, idx: int) -> float:
+        pos = int(np.searchsorted(self.indices, idx))
+        if pos < len(self.indices) and self.indices[pos] == idx:
+            return float(self.values[pos])
+        raise KeyError(idx)
+
+    def __contains__(self, idx: object) -> bool:
+        if not isinstance(idx, (int, np.integer)):
+            return False
+        pos = int(np.searchsorted(self.indices, idx))
+        return pos < len(self.indices) and self.indices[pos] == idx
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.indices.tolist())
+
+    def __repr__(self) -> str:
+        return f"SparseSamples(count={len(self.indices)})"
+
+    @property
+    def nbytes(self) -> int:
+        return self.indices.nbytes + self.values.nbytes
+
+    def sorted_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.indices, self.values
+
+    def scaled(self, scalar: float) -> "SparseSamples":
+        """Return the samples multiplied by ``scalar``."""
+        return SparseSamples(self.indices, self.values * scalar)
+
+    def shifted(self, k: int) -> "SparseSamples":
+        """Return the samples moved by ``k`` indices."""
+        return SparseSamples(self.indices + k, self.values)
+
+    def folded(self) -> "SparseSamples":
+        """Return the samples time-reversed (``x(-n)``)."""
+        return SparseSamples(-self.indices[::-1], self.values[::-1])
+
+
+class TransformedSamples(Samples):
+    """Lazy view of ``base`` with indices ``sign * n + offset`` scaled by ``scale``.
+
+    Shift, fold and scalar multiply compose into a new view of the same base
+    in O(1); the data is computed in a single pass only when arrays or
+    concrete samples are requested.
+    """
+
+    __slots__ = ("base", "sign", "offset", "scale")
+
+    def __init__(
+        self,
+        base: Mapping[int, float],
+        sign: int = 1,
+        offset: int = 0,
+        scale: float = 1.0,
+    ) -> None:
+        self.base = base
+        self.sign = sign
+        self.offset = int(offset)
+        self.scale = scale
+
+    @staticmethod
+    def of(samples: Mapping[int, float]) -> "TransformedSamples":
+        """Return ``samples`` as a view, reusing an existing view's base."""
+        if isinstance(samples, TransformedSamples):
+            return samples
+        return TransformedSamples(samples)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __getitem__(self, idx: int) -> float:
+        return self.base[self.sign * (idx - self.offset)] * self.scale
+
+    def __contains__(self, idx: object) -> bool:
+        if not isinstance(idx, (int, np.integer)):
+            return False
+        return self.sign * (int(idx) - self.offset) in self.base
+
+    def __repr__(self) -> str:
+        return (
+            f"TransformedSamples({self.base!r}, sign={self.sign}, "
+            f"offset={self.offset}, scale={self.scale})"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return samples_nbytes(self.base)
+
+    def scaled(self, scalar: float) -> "TransformedSamples":
+        return TransformedSamples(self.base, self.sign, self.offset, self.scale * scalar)
+
+    def shifted(self, k: int) -> "TransformedSamples":
+        return TransformedSamples(self.base, self.sign, self.offset + k, self.scale)
+
+    def folded(self) -> "TransformedSamples":
+        return TransformedSamples(self.base, -self.sign, -self.offset, self.scale)
+
+    def sorted_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        idx, vals = sorted_arrays(self.base)
+        if self.sign < 0:
+            idx, vals = idx[::-1], vals[::-1]
+        idx = self.sign * idx + self.offset if self.sign < 0 or self.offset else idx
+        return idx, (vals * self.scale if self.scale != 1.0 else vals)
+
+    def materialize(self) -> Mapping[int, float]:
+        base = self.base
+        if isinstance(base, DenseSamples):
+            dense = base.scaled(self.scale) if self.scale != 1.0 else base
+            if self.sign < 0:
+                dense = dense.folded()
+            return dense.shifted(self.offset)
+        if isinstance(base, Samples):
+            return SparseSamples(*self.sorted_arrays())
+        sign, offset, scale = self.sign, self.offset, self.scale
+        return {sign * i + offset: v * scale for i, v in base.items()}
+
+
+def materialize(samples: Mapping[int, float]) -> Mapping[int, float]:
+    """Return concrete samples for ``samples``, computing lazy views."""
+    if isinstance(samples, Samples):
+        return samples.materialize()
+    return samples
+
+
+def is_dense(samples: Mapping[int, float]) -> bool:
+    """Whether ``samples`` are (a view of) contiguous array storage."""
+    if isinstance(samples, TransformedSamples):
+        samples = samples.base
+    return isinstance(samples, DenseSamples)
+
+
+def samples_nbytes(samples: Mapping[int, float]) -> int:
+    """Approximate memory held by ``samples``, including boxed dict entries."""
+    if isinstance(samples, Samples):
+        return samples.nbytes
+    return sys.getsizeof(samples) + sum(
+        sys.getsizeof(i) + sys.getsizeof(v) for i, v in samples.items()
+    )
+
+
+def sorted_arrays(samples: Mapping[int, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(indices, values)`` arrays sorted by index for any samples mapping."""
+    if isinstance(samples, Samples):
+        return samples.sorted_arrays()
+    n = len(samples)
+    try:
+        idx = np.fromiter(samples.keys(), dtype=np.int64, count=n)
+    except OverflowError as exc:
+        raise ValueError("Sample indices must fit in a 64-bit integer") from exc
+    vals = np.fromiter(samples.values(), dtype=np.float64, count=n)
+    order = np.argsort(idx, kind="stable")
+    return idx[order], vals[order]
+
+
+def from_arrays(indices: np.ndarray, values: np.ndarray) -> Mapping[int, float]:
+    """Build the preferred container for unique ``indices`` and their ``values``."""
+    n = len(indices)
+    if n == 0:
+        return {}
+    lo = int(indices.min())
+    span = int(indices.max()) - lo + 1
+    if n < DENSE_MIN_SAMPLES or n < DENSE_MIN_FILL * span:
+        return SparseSamples(indices, values)
+    pos = indices - lo
+    dense = np.zeros(span, dtype=np.float64)
+    dense[pos] = values
+    mask = None
+    if n != span:
+        mask = np.zeros(span, dtype=bool)
+        mask[pos] = True
+    return DenseSamples(lo, dense, mask)
+
+
+def sort_unique(indices: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort by index, keeping the last value of a repeated index (file order).
+
+    ``values`` holds one entry per index along its first axis, so it may be
+    a value per sample or an (N, C) array of channel rows.
+    """
+    if len(indices) and (np.diff(indices) <= 0).any():
+        order = np.argsort(indices, kind="stable")
+        indices, values = indices[order], values[order]
+        last = np.ones(len(indices), dtype=bool)
+        last[:-1] = indices[1:] != indices[:-1]
+        indices, values = indices[last], values[last]
+    return indices, values
+
+
+def from_pairs(indices: np.ndarray, values: np.ndarray) -> Mapping[int, float]:
+    """Like `from_arrays`, but for unsorted indices; the last duplicate wins."""
+    return from_arrays(*sort_unique(indices, values))
+
+
+def compact(samples: Mapping[int, float]) -> Mapping[int, float]:
+    """Convert a dict (or other mapping) to array storage; keep `Samples` as is."""
+    if isinstance(samples, Samples):
+        return samples
+    if not samples:
+        return {}
+    if not isinstance(samples, dict):
+        samples = dict(samples)
+    return from_arrays(*sorted_arrays(samples))
+
+
+def combine(
+    a: Mapping[int, float],
+    b: Mapping[int, float],
+    sign: float = 1.0,
+) -> Mapping[int, float]:
+    """Return ``a + sign * b`` over the union of indices (missing treated as 0)."""
+    return weighted_sum([a, b], [1.0, sign])
+
+
+def _covers(parts: Sequence[DenseSamples], lo: int, span: int) -> bool:
+    """Whether the parts' index ranges together cover ``[lo, lo + span)``."""
+    reach = lo
+    for part in sorted(parts, key=lambda p: p.start):
+        if part.start > reach:
+            return False
+        reach = max(reach, part.stop)
+    return reach >= lo + span
+
+
+def weighted_sum(
+    parts: Sequence[Mapping[int, float]],
+    weights: Sequence[float] | None = None,
+) -> Mapping[int, float]:
+    """Return ``sum(w * p)`` over the union of indices in a single pass.
+
+    Terms are accumulated left to right, so the result matches chaining
+    `combine` pairwise, but only the result is allocated. Dense parts are
+    summed on one array; otherwise the sorted index arrays are merged.
+    """
+    if weights is None:
+        weights = [1.0] * len(parts)
+    elif len(weights) != len(parts):
+        raise ValueError("weights must match the number of signals")
+    pairs = [(materialize(p), w) for p, w in zip(parts, weights) if len(p)]
+    if not pairs:
+        return {}
+    parts, weights = [p for p, _ in pairs], [w for _, w in pairs]
+
+    if all(isinstance(p, DenseSamples) for p in parts):
+        lo = min(p.start for p in parts)
+        span = max(p.stop for p in parts) - lo
+        total = sum(len(p) for p in parts)
+        if total >= DENSE_MIN_FILL * span:
+            values = np.zeros(span, dtype=np.float64)
+            gaps = any(p.mask is not None for p in parts) or not _covers(parts, lo, span)
+            mask = np.zeros(span, dtype=bool) if gaps else None
+            for part, w in zip(parts, weights):
+                window = slice(part.start - lo, part.stop - lo)
+                if w == 1.0:
+                    values[window] += part.values
+                elif w == -1.0:
+                    values[window] -= part.values
+                else:
+                    values[window] += w * part.values
+                if mask is not None:
+                    mask[window] |= True if part.mask is None else part.mask
+            result_dense = DenseSamples(lo, values, mask)
+            if len(result_dense) >= DENSE_MIN_FILL * span:
+                return result_dense
+            return from_arrays(*result_dense.sorted_arrays())
+
+    arrays = [sorted_arrays(p) for p in parts]
+    scaled = [vals if w == 1.0 else w * vals for (_idx, vals), w in zip(arrays, weights)]
+    first = arrays[0][0]
+    if all(len(idx) == len(first) and np.array_equal(idx, first) for idx, _ in arrays[1:]):
+        # Same index set: no merge needed, sum the value arrays directly.
+        summed = scaled[0].copy() if len(scaled) > 1 else scaled[0]
+        for vals in scaled[1:]:
+            summed += vals
+        return from_arrays(first, summed)
+    idx, vals = _merge_sorted([a[0] for a in arrays], scaled)
+    starts = np.flatnonzero(np.concatenate(([True], idx[1:] != idx[:-1])))
+    return from_arrays(idx[starts], np.add.reduceat(vals, starts))
+
+
+def _merge_sorted(
+    indices: Sequence[np.ndarray],
+    values: Sequence[np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge sorted index runs, keeping equal indices in part order.
+
+    The stable sort detects the presorted runs and merges them in linear
+    time per run, so equal indices end up adjacent and in input order.
+    """
+    idx = np.concatenate(indices)
+    order = np.argsort(idx, kind="stable")
+    return idx[order], np.concatenate(values)[order]
@@ -0,0 +1,412 @@
+"""Streaming signals: live sources processed block by block.
+
+A live acquisition (a pipe, a socket or a file that keeps growing) is read
+on a background thread by `StreamSource` and handed out as `Block`\\ s of
+consecutive samples. Operations keep their state between blocks: `Scale`
+multiplies, `Delay` shifts by ``k`` samples through a delay line, and
+`Combine` adds or subtracts streams sample-aligned by index, and `Filtered`
+runs a stateful filter from `signal_app.filters`. A
+`StreamPipeline` ties sources and operations together and keeps the most
+recent samples in a bounded `RingBuffer` for display.
+
+Stream text format: one sample per line, either ``value`` or ``index
+value``. With pairs the first index sets where the stream starts and later
+samples are taken as consecutive. TXT signal files (``.txt``) are followed
+with their ``N`` header lines skipped.
+"""
+
+from __future__ import annotations
+
+import math
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from signal_app.filters import Filter
+from signal_app.signals import Signal
+from signal_app.storage import DenseSamples
+
+DEFAULT_CAPACITY = 1 << 16
+# Samples a source holds for the consumer before dropping the oldest.
+MAX_PENDING = 1 << 20
+# Seconds a followed file waits before looking for new data again.
+FOLLOW_INTERVAL = 0.05
+
+
+@dataclass
+class Block:
+    """Consecutive samples at indices ``start, start + 1, ...``."""
+
+    start: int
+    values: np.ndarray
+
+    @property
+    def stop(self) -> int:
+        return self.start + len(self.values)
+
+
+class RingBuffer:
+    """The latest ``capacity`` samples of a stream in a fixed array.
+
+    A block that does not continue the previous one (samples were dropped)
+    restarts the buffer at the new position.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float64)
+        self._count = 0
+        self._stop: int | None = None
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def stop(self) -> int | None:
+        """Index after the newest sample (None while empty)."""
+        return self._stop
+
+    def clear(self) -> None:
+        self._count = 0
+        self._stop = None
+
+    def extend(self, block: Block) -> None:
+        if self._stop is not None and block.start != self._stop:
+            self.clear()
+        values = block.values[-self.capacity:]
+        pos = self._count % self.capacity
+        first = min(len(values), self.capacity - pos)
+        self._data[pos:pos + first] = values[:first]
+        self._data[:len(values) - first] = values[first:]
+        self._count += len(values)
+        self._stop = block.stop
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and values of the retained samples, oldest first."""
+        n = len(self)
+        if n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        pos = self._count % self.capacity
+        values = self._data[:n] if n < self.capacity else np.roll(self._data, -pos)
+        return np.arange(self._stop - n, self._stop, dtype=np.int64), values.copy()
+
+    def to_signal(self, name: str | None = None) -> Signal:
+        """Snapshot of the retained samples as a `Signal`."""
+        indices, values = self.arrays()
+        if not len(indices):
+            return Signal({}, name=name)
+        return Signal(DenseSamples(int(indices[0]), values), name=name)
+
+
+class Scale:
+    """Multiply every sample by ``scalar``."""
+
+    def __init__(self, scalar: float) -> None:
+        self.scalar = scalar
+
+    def process(self, block: Block) -> Block:
+        return Block(block.start, block.values * self.scalar)
+
+
+class Delay:
+    """Delay by ``k >= 0`` samples: ``y[n] = x[n - k]``, zero before the start.
+
+    The last ``k`` input samples are carried to the next block in a delay
+    line. Advancing (``k < 0``) would need future samples, so it is refused.
+    """
+
+    def __init__(self, k: int) -> None:
+        if k < 0:
+            raise ValueError("A stream can only be delayed (k >= 0)")
+        self.k = k
+        self._line = np.zeros(k, dtype=np.float64)
+
+    def process(self, block: Block) -> Block:
+        if self.k == 0:
+            return block
+        buf = np.concatenate((self._line, block.values))
+        self._line = buf[len(block.values):]
+        return Block(block.start, buf[:len(block.values)])
+
+
+class Filtered:
+    """Run ``filt`` over the stream; its state carries across blocks."""
+
+    def __init__(self, filt: Filter) -> None:
+        self.filter = filt
+
+    def process(self, block: Block) -> Block:
+        return Block(block.start, self.filter.process(block.values))
+
+
+class Combine:
+    """Weighted sum of several streams, aligned sample by sample on index.
+
+    Blocks may arrive with different lengths; the unmatched tail of each
+    input is kept until the other inputs catch up.
+    """
+
+    def __init__(self, weights: Sequence[float]) -> None:
+        self.weights = list(weights)
+        self._pending: List[Block | None] = [None] * len(self.weights)
+
+    def push(self, i: int, block: Block) -> None:
+        pending = self._pending[i]
+        if pending is None or pending.stop != block.start:
+            self._pending[i] = block
+        else:
+            self._pending[i] = Block(pending.start, np.concatenate((pending.values, block.values)))
+
+    def drained(self, i: int) -> bool:
+        """Whether input ``i`` has no samples waiting to be matched."""
+        pending = self._pending[i]
+        return pending is None or not len(pending.values)
+
+    def pop(self) -> Block | None:
+        """The next aligned block of the sum, or None if an input is behind."""
+        while True:
+            if any(self.drained(i) for i in range(len(self._pending))):
+                return None
+            start = max(p.start for p in self._pending)
+            stop = min(p.stop for p in self._pending)
+            if stop > start:
+                break
+            # Drop samples no other input can match any more, then look again.
+            self._pending = [
+                Block(start, p.values[start - p.start:]) if p.start < start else p
+                for p in self._pending
+            ]
+        out = np.zeros(stop - start, dtype=np.float64)
+        for i, (p, w) in enumerate(zip(self._pending, self.weights)):
+            out += w * p.values[start - p.start:stop - p.start]
+            self._pending[i] = Block(stop, p.values[stop - p.start:])
+        return Block(start, out)
+
+
+def _parse_line(line: str) -> Tuple[int | None, float] | None:
+    parts = line.split()
+    if len(parts) == 1:
+        return None, float(parts[0])
+    if len(parts) == 2:
+        index = float(parts[0])
+        if not math.isfinite(index) or not -(2**63) <= index < 2**63:
+            raise ValueError(f"stream index {parts[0]!r} does not fit in a 64-bit integer")
+        return int(index), float(parts[1])
+    return None
+
+
+class StreamSource:
+    """Reads samples from a text stream on a background thread.
+
+    ``open_fn`` returns the text stream. With ``follow`` an end of file means
+    "no data yet" (a growing file); otherwise it ends the stream. The stream
+    is closed at the end unless ``owns_stream`` is false (stdin).
+    ``shutdown`` is called by `close` to interrupt a blocking read, such as
+    a socket waiting for data.
+    """
+
+    def __init__(
+        self,
+        open_fn: Callable[[], TextIO],
+        name: str,
+        follow: bool = False,
+        txt_header: bool = False,
+        max_pending: int = MAX_PENDING,
+        owns_stream: bool = True,
+        shutdown: Callable[[], None] | None = None,
+    ) -> None:
+        self.name = name
+        self.follow = follow
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.error: BaseException | None = None
+        self._open_fn = open_fn
+        self._owns_stream = owns_stream
+        self._shutdown = shutdown
+        self._skip_header = txt_header
+        self._lock = threading.Lock()
+        self._values: List[float] = []
+        self._start: int | None = None
+        self._stop_event = threading.Event()
+        self._ended = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"stream-{name}", daemon=True)
+        self._thread.start()
+
+    @property
+    def ended(self) -> bool:
+        """Whether the source is closed and every sample was read."""
+        with self._lock:
+            return self._ended.is_set() and not self._values
+
+    def close(self) -> None:
+        """Stop reading; the thread exits after the line it is waiting for."""
+        self._stop_event.set()
+        if self._shutdown is not None:
+            try:
+                self._shutdown()
+            except OSError:
+                pass  # not connected yet, or already closed
+
+    def read_block(self) -> Block | None:
+        """All samples received since the last call (None if there are none)."""
+        with self._lock:
+            if not self._values:
+                return None
+            block = Block(self._start, np.array(self._values, dtype=np.float64))
+            self._start += len(self._values)
+            self._values = []
+        return block
+
+    def _push(self, index: int | None, value: float) -> None:
+        with self._lock:
+            if self._start is None:
+                self._start = index if index is not None else 0
+            self._values.append(value)
+            excess = len(self._values) - self.max_pending
+            if excess > 0:
+                del self._values[:excess]
+                self._start += excess
+                self.dropped += excess
+
+    def _run(self) -> None:
+        try:
+            stream = self._open_fn()
+            try:
+                self._read(stream)
+            finally:
+                if self._owns_stream:
+                    stream.close()
+        except (OSError, ValueError) as exc:
+            self.error = exc
+        finally:
+            self._ended.set()
+
+    def _read(self, stream: TextIO) -> None:
+        partial = ""
+        while not self._stop_event.is_set():
+            line = stream.readline()
+            if not line:
+                if not self.follow:
+                    break
+                time.sleep(FOLLOW_INTERVAL)
+                continue
+            line = partial + line
+            if not line.endswith("\n") and self.follow:
+                partial = line  # the writer has not finished this line yet
+                continue
+            partial = ""
+            if not line.strip():
+                continue
+            parsed = _parse_line(line)
+            if parsed is None:
+                raise ValueError(f"{self.name}: cannot parse stream line {line.strip()!r}")
+            if self._skip_header:
+                if parsed[0] is None:
+                    continue
+                self._skip_header = False
+            self._push(*parsed)
+
+
+def open_stream(spec: str) -> StreamSource:
+    """Source for ``spec``: ``-`` (stdin), ``tcp://host:port`` or a file path."""
+    if spec == "-":
+        return StreamSource(lambda: sys.stdin, "stdin", owns_stream=False)
+    if spec.startswith("tcp://"):
+        host, _sep, port = spec[len("tcp://"):].rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Stream address must look like tcp://host:port, got {spec!r}")
+
+        connections: List[socket.socket] = []
+
+        def connect() -> TextIO:
+            sock = socket.create_connection((host, int(port)))
+            connections.append(sock)
+            stream = sock.makefile("r", encoding="utf-8")
+            sock.close()  # the connection stays open until ``stream`` is closed
+            return stream
+
+        def shutdown() -> None:
+            for sock in connections:
+                sock.shutdown(socket.SHUT_RDWR)
+
+        return StreamSource(connect, spec, shutdown=shutdown)
+    return StreamSource(
+        lambda: open(spec, "r", encoding="utf-8"),
+        spec,
+        follow=True,
+        txt_header=spec.lower().endswith(".txt"),
+    )
+
+
+class StreamPipeline:
+    """Sources combined with weights, then operations, into a ring buffer."""
+
+    def __init__(
+        self,
+        sources: Sequence[StreamSource],
+        weights: Sequence[float] | None = None,
+        operations: Sequence[Scale | Delay | Filtered] = (),
+        capacity: int = DEFAULT_CAPACITY,
+    ) -> None:
+        if not sources:
+            raise ValueError("A stream pipeline needs at least one source")
+        self.sources = list(sources)
+        self.combine = Combine(weights or [1.0] * len(self.sources))
+        self.operations = list(operations)
+        self.buffer = RingBuffer(capacity)
+
+    @property
+    def ended(self) -> bool:
+        """Whether no more output can come.
+
+        That is when every source has ended, or when one has ended with none
+        of its samples left to match, since the sum needs all inputs.
+        """
+        return all(src.ended for src in self.sources) or any(
+            src.ended and self.combine.drained(i) for i, src in enumerate(self.sources)
+        )
+
+    def step(self) -> int:
+        """Process everything available; return the number of new samples."""
+        for i, src in enumerate(self.sources):
+            block = src.read_block()
+            if block is not None:
+                self.combine.push(i, block)
+        produced = 0
+        block = self.combine.pop()
+        while block is not None:
+            for op in self.operations:
+                block = op.process(block)
+            self.buffer.extend(block)
+            produced += len(block.values)
+            block = self.combine.pop()
+        return produced
+
+    def close(self) -> None:
+        for src in self.sources:
+            src.close()
+
+
+def parse_stream_expression(text: str) -> Tuple[List[str], List[float]]:
+    """Split ``"a + b - c"`` into stream specs and their +1/-1 weights."""
+    specs: List[str] = []
+    weights: List[float] = []
+    sign = 1.0
+    for token in text.replace(" + ", "\0+\0").replace(" - ", "\0-\0").split("\0"):
+        token = token.strip()
+        if token in ("+", "-"):
+            sign = 1.0 if token == "+" else -1.0
+        elif token:
+            specs.append(token)
+            weights.append(sign)
+            sign = 1.0
+    if not specs:
+        raise ValueError("No stream source given")
+    return specs, weights
@@ -0,0 +1,501 @@
+"""Chunked, buffered parser for the TXT signal format.
+
+The file is read in fixed-size blocks of whole lines. Each block is checked
+and parsed column-wise with NumPy, so peak memory stays close to the output
+arrays plus one block. Blocks that do not pass the fast checks are re-parsed
+line by line with `parse_txt_row`, which `Signal.from_txt_lines` also uses,
+so both raise the same error messages.
+
+Multichannel files use the same header with rows ``index v1 v2 ... vC``;
+`read_txt_columns` parses them into one value column per channel.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import secrets
+import time
+import warnings
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator, List, Tuple
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+_INT64 = np.iinfo(np.int64)
+# Line boundaries of `str.splitlines`, as UTF-8 bytes.
+_LINE_BREAK = re.compile(rb"\r\n|[\n\r\v\f\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+
+@dataclass
+class ParseStats:
+    """Size and timing of one parse, for throughput reporting."""
+
+    samples: int
+    bytes_read: int
+    seconds: float
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.samples / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def megabytes_per_second(self) -> float:
+        if self.seconds <= 0:
+            return float("inf")
+        return self.bytes_read / self.seconds / 1e6
+
+    def __str__(self) -> str:
+        return (
+            f"{self.samples} samples, {self.bytes_read / 1e6:.1f} MB in "
+            f"{self.seconds:.3f}s ({self.megabytes_per_second:.1f} MB/s)"
+        )
+
+
+def _parse_index(token: str, i: int) -> int:
+    """Index of the i-th row; it must fit the int64 index arrays."""
+    try:
+        idx = int(float(token))
+    except (TypeError, ValueError, OverflowError) as exc:
+        raise ValueError(f"Invalid index/value on line {i+2}") from exc
+    if not _INT64.min <= idx <= _INT64.max:
+        raise ValueError(f"Index on line {i+2} does not fit in a 64-bit integer")
+    return idx
+
+
+def parse_txt_row(row: str, i: int) -> Tuple[int, float]:
+    """Parse the i-th sample row (0-based) for `from_txt_lines` and the block parser."""
+    row = row.strip()
+    if not row:
+        raise ValueError(f"Missing row for sample {i+1}")
+    parts = row.split()
+    if len(parts) != 2:
+        raise ValueError(f"Line {i+2} must have exactly two entries: index value")
+    idx = _parse_index(parts[0], i)
+    try:
+        val = float(parts[1])
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid index/value on line {i+2}") from exc
+    return idx, val
+
+
+class _BlockReader:
+    """Buffer over a binary file that hands out blocks of complete lines."""
+
+    def __init__(self, f: BinaryIO, chunk_size: int) -> None:
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = b""
+        self.eof = False
+        self.bytes_read = 0
+
+    def fill(self) -> bool:
+        """Append one chunk to the buffer; return False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.bytes_read += len(chunk)
+        self.buf += chunk
+        return True
+
+    def readline(self) -> bytes | None:
+        """Return the next line without its line break, or None at end of file.
+
+        Lines end wherever `str.splitlines` would end them.
+        """
+        while True:
+            match = _LINE_BREAK.search(self.buf)
+            # A CR at the end of the buffer may be the first half of a CRLF.
+            if match and (match.end() < len(self.buf) or match.group() != b"\r" or self.eof):
+                line, self.buf = self.buf[: match.start()], self.buf[match.end() :]
+                return line
+            if not self.fill():
+                if match:
+                    continue
+                if not self.buf:
+                    return None
+                line, self.buf = self.buf, b""
+                return line
+
+    def skip_whitespace(self) -> None:
+        """Drop leading whitespace, like `str.strip()` on the whole content."""
+        while True:
+            self.buf = self.buf.lstrip()
+            if self.buf or not self.fill():
+                return
+
+    def read_rest(self) -> bytes:
+        """Return everything left in the file, emptying the buffer."""
+        rest = self.buf + self.f.read()
+        self.buf = b""
+        self.eof = True
+        return rest
+
+    def rest_is_blank(self) -> bool:
+        """Whether everything left in the file is whitespace."""
+        checked = 0
+        while True:
+            if self.buf[checked:].strip():
+                return False
+            checked = len(self.buf)
+            if not self.fill():
+                return True
+
+    def _has_line_end(self) -> bool:
+        """Whether the buffer holds a complete LF, CRLF or CR line ending."""
+        last = len(self.buf) if self.eof else len(self.buf) - 1
+        return self.buf.find(b"\n") >= 0 or self.buf.find(b"\r", 0, last) >= 0
+
+    def _line_ends(self) -> np.ndarray:
+        """Offsets just past each complete LF, CRLF or CR line ending."""
+        arr = np.frombuffer(self.buf, dtype=np.uint8)
+        lf = arr == 10
+        ends = lf.copy()
+        ends[:-1] |= (arr[:-1] == 13) & ~lf[1:]
+        if self.eof and len(arr):
+            ends[-1] |= arr[-1] == 13
+        return np.flatnonzero(ends) + 1
+
+    def block(self, max_lines: int) -> bytes:
+        """Return up to ``max_lines`` complete lines (empty at end of file).
+
+        Only LF, CRLF and CR end a block; rarer line boundaries are left
+        inside it for the line-by-line path.
+        """
+        while (len(self.buf) < self.chunk_size or not self._has_line_end()) and self.fill():
+            pass
+        ends = self._line_ends()
+        if len(ends):
+            end = int(ends[min(len(ends), max_lines) - 1])
+        else:
+            end = len(self.buf)
+        block, self.buf = self.buf[:end], self.buf[end:]
+        return block
+
+
+def _parse_block_fast(block: bytes, columns: int = 2) -> np.ndarray | None:
+    """Parse a block of ``index value ...`` lines into an (L, columns) array.
+
+    Returns None if the block needs the exact line-by-line path: irregular
+    whitespace, a line without exactly ``columns`` tokens, a token that is
+    not a number, or an index that is not finite or does not fit in int64.
+    """
+    arr = np.frombuffer(block, dtype=np.uint8)
+    # Only space, tab, LF and CRLF are handled here; any other control byte
+    # or non-ASCII text follows `str.split()` / `str.splitlines()` exactly.
+    ws = arr <= 32
+    if (arr >= 128).any() or (ws & (arr != 32) & (arr != 9) & (arr != 10) & (arr != 13)).any():
+        return None
+    cr = np.flatnonzero(arr == 13)
+    if len(cr) and (cr[-1] + 1 >= len(arr) or (arr[cr + 1] != 10).any()):
+        return None
+    starts = ~ws
+    starts[1:] &= ws[:-1]
+    token_pos = np.flatnonzero(starts)
+    newlines = np.flatnonzero(arr == 10)
+    n_lines = len(newlines) + (0 if block.endswith(b"\n") else 1)
+    counts = np.bincount(np.searchsorted(newlines, token_pos), minlength=n_lines)
+    if len(counts) != n_lines or (counts != columns).any():
+        return None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            flat = np.fromstring(block, dtype=np.float64, sep=" ")
+    except (ValueError, DeprecationWarning):
+        return None
+    if len(flat) != columns * n_lines:
+        return None
+    pairs = flat.reshape(-1, columns)
+    if not (np.abs(pairs[:, 0]) < 2.0**63).all():
+        return None
+    return pairs
+
+
+def _read_header(reader: _BlockReader) -> int:
+    """Consume the optional ``0 / 0`` prefix and the N line; return N."""
+    reader.skip_whitespace()
+    first = reader.readline()
+    if first is None:
+        raise ValueError("Empty content")
+    header = first
+    if first.strip() == b"0":
+        second = reader.readline()
+        if second is not None and second.strip() == b"0" and not reader.rest_is_blank():
+            header = reader.readline() or b""
+        elif second is not None:
+            # Not a prefix: the second line is the first sample row.
+            reader.buf = second + b"\n" + reader.buf
+    try:
+        return int(header.decode("utf-8").strip())
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Header must contain integer N") from exc
+
+
+def _iter_blocks(
+    reader: _BlockReader,
+    n: int,
+    chunk_size: int,
+    progress: Callable[[int], None] | None = None,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield ``(indices, values)`` per block for the ``n`` rows after the header.
+
+    Fast-path blocks yield float64 column views (indices not yet cast).
+    """
+    # Lines per block, assuming short rows; a block may hold fewer.
+    lines_per_block = max(1, chunk_size // 16)
+    i = 0
+    while i < n:
+        block = reader.block(min(n - i, lines_per_block))
+        if progress is not None:
+            progress(reader.bytes_read)
+        if not block:
+            raise ValueError("Insufficient lines for provided N")
+        pairs = _parse_block_fast(block)
+        if pairs is not None:
+            i += len(pairs)
+            yield pairs[:, 0], pairs[:, 1]
+            continue
+        rows: List[str] = block.decode("utf-8").splitlines()
+        indices: List[int] = []
+        values: List[float] = []
+        for pos, row in enumerate(rows):
+            if i >= n:
+                break
+            try:
+                idx, val = parse_txt_row(row, i)
+            except ValueError:
+                # A short file is reported before any bad row, as when the
+                # whole file is split up front.
+                tail = "\n".join(rows[pos:]) + "\n"
+                tail += reader.read_rest().decode("utf-8", errors="replace")
+                if len(tail.rstrip().splitlines()) < n - i:
+                    raise ValueError("Insufficient lines for provided N") from None
+                raise
+            indices.append(idx)
+            values.append(val)
+            i += 1
+        yield np.array(indices, dtype=np.int64), np.array(values, dtype=np.float64)
+
+
+def read_txt_arrays(
+    f: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> Tuple[np.ndarray, np.ndarray, ParseStats]:
+    """Parse a TXT signal from a binary stream into index and value arrays.
+
+    Rows are returned in file order; duplicate indices are left to the caller.
+    ``progress`` is called with the number of bytes read after each block;
+    an exception it raises aborts the parse.
+    """
+    start_time = time.perf_counter()
+    reader = _BlockReader(f, chunk_size)
+    n = _read_header(reader)
+    indices = np.empty(max(n, 0), dtype=np.int64)
+    values = np.empty(max(n, 0), dtype=np.float64)
+    i = 0
+    for block_indices, block_values in _iter_blocks(reader, n, chunk_size, progress):
+        count = len(block_indices)
+        indices[i : i + count] = block_indices
+        values[i : i + count] = block_values
+        i += count
+    stats = ParseStats(
+        samples=n,
+        bytes_read=reader.bytes_read,
+        seconds=time.perf_counter() - start_time,
+    )
+    return indices, values, stats
+
+
+def read_txt_file(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> Tuple[np.ndarray, np.ndarray, ParseStats]:
+    """Open ``path`` and parse it with `read_txt_arrays`."""
+    with open(path, "rb") as f:
+        return read_txt_arrays(f, chunk_size=chunk_size, progress=progress)
+
+
+def iter_txt_file(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Parse ``path`` one block at a time, yielding index and value arrays.
+
+    Memory stays at about one block of ``chunk_size`` bytes whatever the file
+    size. Rows come in file order, as from `read_txt_arrays`.
+    """
+    with open(path, "rb") as f:
+        reader = _BlockReader(f, chunk_size)
+        n = _read_header(reader)
+        for indices, values in _iter_blocks(reader, n, chunk_size):
+            yield indices.astype(np.int64), values
+
+
+def parse_txt_columns_row(row: str, i: int, channels: int) -> Tuple[int, List[float]]:
+    """Parse the i-th row of a multichannel file: an index and ``channels`` values."""
+    row = row.strip()
+    if not row:
+        raise ValueError(f"Missing row for sample {i+1}")
+    parts = row.split()
+    if len(parts) != channels + 1:
+        raise ValueError(
+            f"Line {i+2} must have {channels + 1} entries: index and {channels} value(s)"
+        )
+    idx = _parse_index(parts[0], i)
+    try:
+        return idx, [float(v) for v in parts[1:]]
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid index/value on line {i+2}") from exc
+
+
+def read_txt_columns(
+    f: BinaryIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> Tuple[np.ndarray, np.ndarray, ParseStats]:
+    """Parse a multichannel TXT signal into indices and an (N, C) value array.
+
+    The channel count C is taken from the first row; every row must match.
+    """
+    start_time = time.perf_counter()
+    reader = _BlockReader(f, chunk_size)
+    n = _read_header(reader)
+    first = reader.block(1) if n > 0 else b""
+    if n > 0 and progress is not None:
+        progress(reader.bytes_read)
+    if n > 0 and not first.strip():
+        raise ValueError("Insufficient lines for provided N")
+    channels = max(len(first.split()) - 1, 1)
+    indices = np.empty(max(n, 0), dtype=np.int64)
+    values = np.empty((max(n, 0), channels), dtype=np.float64)
+    lines_per_block = max(1, chunk_size // (8 * (channels + 1)))
+    i = 0
+    block = first
+    while i < n:
+        if not block:
+            block = reader.block(min(n - i, lines_per_block))
+            if progress is not None:
+                progress(reader.bytes_read)
+            if not block:
+                raise ValueError("Insufficient lines for provided N")
+        rows = _parse_block_fast(block, channels + 1)
+        if rows is not None:
+            count = len(rows)
+            indices[i : i + count] = rows[:, 0]
+            values[i : i + count] = rows[:, 1:]
+            i += count
+        else:
+            for row in block.decode("utf-8").splitlines():
+                if i >= n:
+                    break
+                indices[i], values[i] = parse_txt_columns_row(row, i, channels)
+                i += 1
+        block = b""
+    stats = ParseStats(
+        samples=n * channels,
+        bytes_read=reader.bytes_read,
+        seconds=time.perf_counter() - start_time,
+    )
+    return indices, values, stats
+
+
+def read_txt_columns_file(
+    path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> Tuple[np.ndarray, np.ndarray, ParseStats]:
+    """Open ``path`` and parse it with `read_txt_columns`."""
+    with open(path, "rb") as f:
+        return read_txt_columns(f, chunk_size=chunk_size, progress=progress)
+
+
+def write_txt_columns(path: str, indices: np.ndarray, values: np.ndarray) -> None:
+    """Write a multichannel signal: rows ``index v1 ... vC`` for an (N, C) array."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"0\n0\n{len(indices)}\n")
+        for lo in range(0, len(indices), 1 << 14):
+            idx_chunk = indices[lo : lo + (1 << 14)].tolist()
+            val_chunk = values[lo : lo + (1 << 14)].tolist()
+            f.write(
+                "".join(
+                    f"{i} {' '.join(repr(v) for v in row)}\n"
+                    for i, row in zip(idx_chunk, val_chunk)
+                )
+            )
+
+
+def write_txt_file(
+    path: str,
+    indices: np.ndarray,
+    values: np.ndarray,
+    rows_per_chunk: int = 1 << 16,
+) -> None:
+    """Write sorted samples in the TXT format (with the ``0 / 0`` prefix).
+
+    Rows are formatted and written in chunks so memory does not grow with
+    the number of samples.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"0\n0\n{len(indices)}\n")
+        for lo in range(0, len(indices), rows_per_chunk):
+            idx_chunk = indices[lo : lo + rows_per_chunk].tolist()
+            val_chunk = values[lo : lo + rows_per_chunk].tolist()
+            f.write("".join(f"{i} {v!r}\n" for i, v in zip(idx_chunk, val_chunk)))
+
+
+class TxtWriter:
+    """Writes sorted samples in the TXT format incrementally.
+
+    The sample count is not known until the end, so the N line is reserved
+    as a fixed-width field and filled in by `close` (the parser strips the
+    padding). Rows go to a temporary file that replaces ``path`` on `close`,
+    so ``path`` may also be the file being read.
+    """
+
+    N_WIDTH = 20
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.length = 0
+        self._tmp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+        self._f = open(self._tmp_path, "x", encoding="utf-8")
+        self._f.write("0\n0\n")
+        self._n_pos = self._f.tell()
+        self._f.write(" " * self.N_WIDTH + "\n")
+
+    def write(self, indices: np.ndarray, values: np.ndarray, rows_per_chunk: int = 1 << 16) -> None:
+        """Append samples; indices must continue in increasing order."""
+        for lo in range(0, len(indices), rows_per_chunk):
+            idx_chunk = np.asarray(indices[lo : lo + rows_per_chunk]).tolist()
+            val_chunk = np.asarray(values[lo : lo + rows_per_chunk], dtype=np.float64).tolist()
+            self._f.write("".join(f"{i} {v!r}\n" for i, v in zip(idx_chunk, val_chunk)))
+        self.length += len(indices)
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self._f.seek(self._n_pos)
+        self._f.write(str(self.length).ljust(self.N_WIDTH))
+        self._f.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Close and delete the partial file; ``path`` is left as it was."""
+        self._f.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self) -> "TxtWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
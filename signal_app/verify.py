@@ -0,0 +1,215 @@
+"""Golden-file verification of `Signal` operations.
+
+A `GoldenCase` names an operation, its input files and the expected output
+file. Every file is parsed once per process and cached by path, size and
+modification time. Results are compared as whole arrays: indices must match
+exactly and values within a tolerance. A failing `VerifyResult` reports the
+first mismatching index and the maximum absolute error instead of a bare
+pass/fail. Large suites are spread over a process pool.
+
+Usage (from the directory holding the golden files)::
+
+    python -m signal_app.verify [--dir PATH] [--tol 0.01] [--processes N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from signal_app.signals import Signal
+from signal_app.storage import from_pairs, sorted_arrays
+from signal_app.txtio import read_txt_file
+
+DEFAULT_TOLERANCE = 0.01
+# Suites with at least this many cases run in a process pool.
+PARALLEL_MIN_CASES = 8
+
+_cache: Dict[Tuple[str, int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def load_arrays(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted ``(indices, values)`` of a TXT file, parsed once per process."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _cache:
+        indices, values, _stats = read_txt_file(path)
+        _cache[key] = sorted_arrays(from_pairs(indices, values))
+    return _cache[key]
+
+
+def load_signal(path: str) -> Signal:
+    """Signal for a TXT file, built from the cached arrays."""
+    indices, values = load_arrays(path)
+    return Signal(from_pairs(indices, values), name=path)
+
+
+@dataclass(frozen=True)
+class GoldenCase:
+    """Apply ``op`` (with ``arg``) to ``inputs`` and compare with ``expected``.
+
+    ``op`` is one of ``add``, ``subtract``, ``multiply``, ``shift``, ``fold``,
+    ``convolve`` or ``correlate``; binary ops take two inputs.
+    """
+
+    name: str
+    op: str
+    inputs: Tuple[str, ...]
+    expected: str
+    arg: float | None = None
+
+
+@dataclass
+class VerifyResult:
+    """Outcome of one case, with the location and size of any mismatch."""
+
+    name: str
+    passed: bool
+    reason: str = ""
+    first_mismatch: int | None = None
+    max_abs_error: float = 0.0
+
+    def __str__(self) -> str:
+        if self.passed:
+            return f"{self.name}: passed (max abs error {self.max_abs_error:.3g})"
+        text = f"{self.name}: FAILED, {self.reason}"
+        if self.first_mismatch is not None:
+            text += f"; first mismatch at n={self.first_mismatch}"
+        return text + f"; max abs error {self.max_abs_error:.3g}"
+
+
+def compare_arrays(
+    name: str,
+    indices: np.ndarray,
+    values: np.ndarray,
+    expected_indices: np.ndarray,
+    expected_values: np.ndarray,
+    tol: float = DEFAULT_TOLERANCE,
+) -> VerifyResult:
+    """Compare sorted sample arrays with the expected ones in one pass each."""
+    if len(indices) != len(expected_indices):
+        return VerifyResult(
+            name,
+            False,
+            f"length {len(indices)} != expected {len(expected_indices)}",
+            first_mismatch=_first_index_mismatch(indices, expected_indices),
+            max_abs_error=float("inf"),
+        )
+    bad_idx = np.flatnonzero(indices != expected_indices)
+    if len(bad_idx):
+        pos = int(bad_idx[0])
+        return VerifyResult(
+            name,
+            False,
+            f"index {int(indices[pos])} != expected {int(expected_indices[pos])} "
+            f"at position {pos}",
+            first_mismatch=int(expected_indices[pos]),
+            max_abs_error=float("inf"),
+        )
+    err = np.abs(values - expected_values)
+    max_err = float(err.max()) if len(err) else 0.0
+    bad_val = np.flatnonzero(~(err < tol))
+    if len(bad_val):
+        pos = int(bad_val[0])
+        return VerifyResult(
+            name,
+            False,
+            f"{len(bad_val)} value(s) off by >= {tol} "
+            f"(got {float(values[pos])!r}, expected {float(expected_values[pos])!r})",
+            first_mismatch=int(indices[pos]),
+            max_abs_error=max_err,
+        )
+    return VerifyResult(name, True, max_abs_error=max_err)
+
+
+def _first_index_mismatch(a: np.ndarray, b: np.ndarray) -> int | None:
+    n = min(len(a), len(b))
+    bad = np.flatnonzero(a[:n] != b[:n])
+    if len(bad):
+        return int(b[bad[0]])
+    longer = a if len(a) > len(b) else b
+    return int(longer[n]) if len(longer) > n else None
+
+
+def compute(case: GoldenCase) -> Signal:
+    """Evaluate the operation of ``case`` on its (cached) inputs."""
+    sigs = [load_signal(p) for p in case.inputs]
+    if case.op in ("add", "subtract", "convolve", "correlate"):
+        first, second = sigs
+        return getattr(first, case.op)(second)
+    (sig,) = sigs
+    if case.op == "multiply":
+        return sig.multiply(case.arg)
+    if case.op == "shift":
+        return sig.shift(int(case.arg))
+    if case.op == "fold":
+        return sig.fold()
+    raise ValueError(f"Unknown operation {case.op!r} in case {case.name!r}")
+
+
+def run_case(case: GoldenCase, tol: float = DEFAULT_TOLERANCE) -> VerifyResult:
+    """Run one case; errors become a failed result instead of an exception."""
+    try:
+        result = compute(case)
+        expected = load_arrays(case.expected)
+    except (OSError, ValueError) as exc:
+        return VerifyResult(case.name, False, f"{type(exc).__name__}: {exc}")
+    return compare_arrays(case.name, *result.to_sorted_arrays(), *expected, tol=tol)
+
+
+def run_cases(
+    cases: Sequence[GoldenCase],
+    tol: float = DEFAULT_TOLERANCE,
+    processes: int | None = None,
+) -> List[VerifyResult]:
+    """Run cases in order; large suites (or ``processes > 1``) use a pool."""
+    parallel = processes > 1 if processes is not None else len(cases) >= PARALLEL_MIN_CASES
+    if not parallel:
+        return [run_case(c, tol) for c in cases]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(run_case, cases, [tol] * len(cases), chunksize=4))
+
+
+def default_cases(directory: str = ".") -> List[GoldenCase]:
+    """The course test cases for ``Signal1.txt`` / ``Signal2.txt``."""
+
+    def p(name: str) -> str:
+        return os.path.join(directory, name)
+
+    s1, s2 = p("Signal1.txt"), p("Signal2.txt")
+    return [
+        GoldenCase("add", "add", (s1, s2), p("add.txt")),
+        GoldenCase("subtract", "subtract", (s1, s2), p("subtract.txt")),
+        GoldenCase("multiply by 5", "multiply", (s1,), p("mul5.txt"), 5),
+        GoldenCase("shift by 3", "shift", (s1,), p("delay3.txt"), 3),
+        GoldenCase("shift by -3", "shift", (s1,), p("advance3.txt"), -3),
+        GoldenCase("folding", "fold", (s1,), p("folding.txt")),
+    ]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m signal_app.verify",
+        description="Check Signal operations against golden TXT files.",
+    )
+    parser.add_argument("--dir", default=".", help="directory with the golden files")
+    parser.add_argument("--tol", type=float, default=DEFAULT_TOLERANCE, help="value tolerance")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+
+    results = run_cases(default_cases(args.dir), tol=args.tol, processes=args.processes)
+    for res in results:
+        print(res)
+    failed = sum(not r.passed for r in results)
+    print(f"{len(results) - failed}/{len(results)} cases passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
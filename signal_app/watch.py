@@ -0,0 +1,87 @@
+"""Polling file watcher driven by the Tk main loop.
+
+`FileWatcher` checks the size and modification time of watched files every
+``interval_ms`` through ``after()``, like `signal_app.jobs.JobManager`. A
+change is reported once the file has stopped changing for one poll, so a
+capture that is still being written is not read half-way.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+Stamp = Tuple[int, int]
+
+
+def _stamp(path: str) -> Stamp | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class FileWatcher:
+    """Calls ``on_change(path)`` on the main loop when a watched file changes."""
+
+    def __init__(
+        self,
+        after: Callable[[int, Callable[[], None]], Any],
+        on_change: Callable[[str], None],
+        interval_ms: int = 1000,
+    ) -> None:
+        self._after = after
+        self._on_change = on_change
+        self.interval_ms = interval_ms
+        # path -> (last reported stamp, stamp seen on the previous poll)
+        self._files: Dict[str, Tuple[Stamp | None, Stamp | None]] = {}
+        self._running = False
+        self._scheduled = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def watch(self, path: str) -> None:
+        """Start watching ``path`` from its current state."""
+        stamp = _stamp(path)
+        self._files[path] = (stamp, stamp)
+
+    def unwatch(self, path: str) -> None:
+        self._files.pop(path, None)
+
+    def start(self) -> None:
+        self._running = True
+        if not self._scheduled:
+            self._scheduled = True
+            self._after(self.interval_ms, self._poll)
+
+    def stop(self) -> None:
+        """Stop polling; the pending poll becomes a no-op."""
+        self._running = False
+
+    def poll(self) -> List[str]:
+        """Check all files once and return (and report) the changed ones."""
+        changed = []
+        for path, (reported, previous) in list(self._files.items()):
+            current = _stamp(path)
+            if current is None or current == reported:
+                self._files[path] = (reported, current)
+                continue
+            if current == previous:
+                # Unchanged since the last poll: the writer has finished.
+                self._files[path] = (current, current)
+                changed.append(path)
+            else:
+                self._files[path] = (reported, current)
+        for path in changed:
+            self._on_change(path)
+        return changed
+
+    def _poll(self) -> None:
+        self._scheduled = False
+        if not self._running:
+            return
+        self.poll()
+        self.start()
@@ -0,0 +1,66 @@
+"""Batch pipelines: validation, pairing and output naming."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from signal_app.batch import main, match_inputs, output_stems, parse_pipeline, run_pipeline
+from signal_app.signals import Signal
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "load A, frobnicate, write",
+        "load B, write",
+        "load A, add, write",
+        "load A, shift x, write",
+        "load A, fold",
+        "load A, write, write",
+        "load A, write _x, fold, write _x",
+    ],
+)
+def test_invalid_pipelines_raise(text):
+    with pytest.raises(ValueError):
+        parse_pipeline(text, ["A"])
+
+
+def test_pipeline_matches_signal_operations(tmp_path):
+    a, b = Signal({0: 1.0, 1: 2.0, 2: 3.0}), Signal({1: 10.0, 5: -1.0})
+    paths = {"A": str(tmp_path / "a.txt"), "B": str(tmp_path / "b.txt")}
+    a.to_txt_file(paths["A"])
+    b.to_txt_file(paths["B"])
+    steps = parse_pipeline("load A, load B, subtract, shift 3, write _d, fold, write", ["A", "B"])
+    result = run_pipeline(steps, paths, str(tmp_path))
+    assert result.error is None
+    expected = a.subtract(b).shift(3)
+    assert dict(Signal.from_file(result.outputs[0]).samples.items()) == dict(expected.samples.items())
+    folded = dict(Signal.from_file(result.outputs[1]).samples.items())
+    assert folded == dict(expected.fold().samples.items())
+
+
+def test_inputs_pair_by_wildcard_match(tmp_path):
+    for name in ("x_a.txt", "x_b.txt", "y_a.txt"):
+        Signal({0: 1.0}).to_txt_file(str(tmp_path / name))
+    jobs, unpaired = match_inputs(
+        {"A": str(tmp_path / "*_a.txt"), "B": str(tmp_path / "*_b.txt")}
+    )
+    assert jobs == [{"A": str(tmp_path / "x_a.txt"), "B": str(tmp_path / "x_b.txt")}]
+    assert unpaired == [str(tmp_path / "y_a.txt")]
+
+
+def test_output_stems_disambiguate_same_file_names():
+    jobs = [{"A": "run1/cap.txt"}, {"A": "run2/cap.txt"}, {"A": "run2/other.txt"}]
+    assert output_stems(jobs) == ["run1_cap", "run2_cap", "other"]
+
+
+def test_same_file_names_in_different_directories_do_not_overwrite(tmp_path):
+    for i in (1, 2):
+        os.makedirs(tmp_path / f"run{i}")
+        Signal({0: float(i)}).to_txt_file(str(tmp_path / f"run{i}" / "cap.txt"))
+    out = tmp_path / "out"
+    pattern = str(tmp_path / "run*" / "cap.txt")
+    assert main(["-p", "load A, write", "-i", pattern, "-o", str(out), "-j", "1"]) == 0
+    assert sorted(os.listdir(out)) == ["run1_cap_out.txt", "run2_cap_out.txt"]
@@ -0,0 +1,87 @@
+"""Binary signal files round-tripped through every storage kind."""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+from signal_app.binio import (
+    BinaryWriter,
+    binary_to_txt,
+    is_binary_file,
+    read_binary,
+    txt_to_binary,
+    write_binary,
+)
+from signal_app.signals import Signal
+from signal_app.storage import DenseSamples, SparseSamples
+
+SAMPLES = {
+    "dense": DenseSamples(-7, np.linspace(-1.0, 1.0, 100)),
+    "masked": DenseSamples(3, np.arange(50.0) * (np.arange(50) % 3 > 0), np.arange(50) % 3 > 0),
+    "sparse": SparseSamples(np.array([-900, -2, 0, 45, 10**12]), np.array([1.5, -2.0, 0.0, 4.0, 9.0])),
+}
+
+
+@pytest.mark.parametrize("kind", sorted(SAMPLES))
+def test_round_trip_keeps_samples_and_name(tmp_path, kind):
+    path = str(tmp_path / f"{kind}.sigbin")
+    write_binary(path, SAMPLES[kind], name="x(n)")
+    samples, name = read_binary(path)
+    assert is_binary_file(path)
+    assert name == "x(n)"
+    assert type(samples) is type(SAMPLES[kind])
+    assert dict(samples.items()) == dict(SAMPLES[kind].items())
+
+
+def test_other_value_dtypes_are_rejected(tmp_path):
+    path = str(tmp_path / "f32.sigbin")
+    write_binary(path, SAMPLES["dense"])
+    with open(path, "r+b") as f:
+        f.seek(12)  # the value dtype field of the header
+        f.write(b"<f4".ljust(8, b"\x00"))
+    with pytest.raises(ValueError, match="dtype"):
+        read_binary(path)
+
+
+def test_overwriting_a_mapped_file_keeps_the_loaded_samples(tmp_path):
+    path = str(tmp_path / "live.sigbin")
+    write_binary(path, DenseSamples(0, np.arange(200_000.0)))
+    loaded = Signal.from_binary_file(path)
+    Signal({0: 1.0, 5: 2.0}).to_binary_file(path)
+    with BinaryWriter(path) as writer:
+        writer.write(np.array([1, 9]), np.array([3.0, 4.0]))
+    # Truncating the mapped file in place would crash the process here.
+    assert float(loaded.to_sorted_arrays()[1].sum()) == sum(range(200_000))
+    assert dict(Signal.from_file(path).samples.items()) == {1: 3.0, 9: 4.0}
+    assert sorted(os.listdir(tmp_path)) == ["live.sigbin"]
+
+
+def test_failed_writes_leave_the_target_alone(tmp_path):
+    path = str(tmp_path / "keep.sigbin")
+    write_binary(path, SAMPLES["sparse"])
+    with pytest.raises(ValueError):
+        with BinaryWriter(path) as writer:
+            writer.write(np.array([5]), np.array([1.0]))
+            writer.write(np.array([2]), np.array([1.0]))
+    assert dict(read_binary(path)[0].items()) == dict(SAMPLES["sparse"].items())
+    assert sorted(os.listdir(tmp_path)) == ["keep.sigbin"]
+
+
+def test_empty_signal(tmp_path):
+    path = str(tmp_path / "empty.sigbin")
+    write_binary(path, {})
+    samples, _name = read_binary(path)
+    assert len(samples) == 0
+
+
+def test_txt_conversion_round_trip(tmp_path):
+    txt, binary, back = (str(tmp_path / n) for n in ("a.txt", "a.sigbin", "b.txt"))
+    Signal(dict(SAMPLES["sparse"].items())).to_txt_file(txt)
+    txt_to_binary(txt, binary)
+    binary_to_txt(binary, back)
+    assert not is_binary_file(txt)
+    loaded = [dict(Signal.from_file(p).samples.items()) for p in (txt, binary, back)]
+    assert loaded[0] == loaded[1] == loaded[2] == dict(SAMPLES["sparse"].items())
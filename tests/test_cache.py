@@ -0,0 +1,70 @@
+"""Parse cache hits, invalidation and eviction."""
+
+from __future__ import annotations
+
+import os
+
+from signal_app.binio import BINARY_SUFFIX
+from signal_app.cache import ParseCache
+from signal_app.signals import Signal
+
+
+def _write(path, n: int, offset: float = 0.0) -> dict:
+    samples = {i: float(i) + offset for i in range(n)}
+    Signal(samples).to_txt_file(str(path))
+    return samples
+
+
+def _entries(directory) -> list:
+    return sorted(name for name in os.listdir(directory) if name.endswith(BINARY_SUFFIX))
+
+
+def test_memory_then_disk_hits_return_parsed_samples(tmp_path):
+    path = tmp_path / "a.txt"
+    expected = _write(path, 100)
+    cache = ParseCache(str(tmp_path / "cache"))
+    assert dict(cache.load(str(path)).items()) == expected
+    assert dict(cache.load(str(path)).items()) == expected
+    fresh = ParseCache(str(tmp_path / "cache"))
+    assert dict(fresh.load(str(path)).items()) == expected
+    assert (cache.stats.misses, cache.stats.memory_hits) == (1, 1)
+    assert (fresh.stats.misses, fresh.stats.disk_hits) == (0, 1)
+
+
+def test_edited_file_is_parsed_again(tmp_path):
+    path = tmp_path / "a.txt"
+    _write(path, 100)
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.load(str(path))
+    expected = _write(path, 120, offset=0.5)
+    assert dict(cache.load(str(path)).items()) == expected
+    assert cache.stats.misses == 2
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = ParseCache(str(cache_dir))
+    paths = [str(tmp_path / f"{i}.txt") for i in range(3)]
+    entries = []
+    for i, path in enumerate(paths):
+        _write(path, 1000)
+        cache.load(path)
+        entry = os.path.join(cache_dir, cache.key(path) + BINARY_SUFFIX)
+        os.utime(entry, ns=(i * 10**9, i * 10**9))
+        entries.append(entry)
+    cache.max_bytes = sum(os.path.getsize(e) for e in entries[1:])
+    assert cache.evict() == 1
+    assert [os.path.exists(e) for e in entries] == [False, True, True]
+    assert cache.stats.evictions == 1
+
+
+def test_unreadable_entry_is_discarded(tmp_path):
+    path = tmp_path / "a.txt"
+    expected = _write(path, 50)
+    cache_dir = tmp_path / "cache"
+    ParseCache(str(cache_dir)).load(str(path))
+    (entry,) = _entries(cache_dir)
+    (cache_dir / entry).write_bytes(b"garbage")
+    cache = ParseCache(str(cache_dir))
+    assert dict(cache.load(str(path)).items()) == expected
+    assert cache.stats.misses == 1
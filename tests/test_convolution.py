@@ -0,0 +1,63 @@
+"""Convolution and correlation checked against direct double sums."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from signal_app import convolution
+from signal_app.convolution import METHODS, convolve_arrays
+from signal_app.signals import Signal
+
+
+def _dict_convolve(a: dict, b: dict) -> dict:
+    result = {}
+    for i, x in a.items():
+        for j, h in b.items():
+            result[i + j] = result.get(i + j, 0.0) + x * h
+    return result
+
+
+def _assert_matches(signal: Signal, expected: dict) -> None:
+    got = dict(signal.samples.items())
+    assert set(expected) <= set(got)
+    for idx in got:
+        assert got[idx] == pytest.approx(expected.get(idx, 0.0), abs=1e-9)
+
+
+def _signal_dict(rng, start: int, length: int, fill: float = 1.0) -> dict:
+    indices = np.arange(start, start + length)
+    indices = indices[rng.random(length) < fill]
+    return {int(i): float(v) for i, v in zip(indices, rng.normal(size=len(indices)))}
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("lengths", [(1, 1), (7, 300), (500, 450), (5000, 100)])
+def test_convolve_arrays_matches_numpy(method, lengths):
+    rng = np.random.default_rng(sum(lengths))
+    x, h = rng.normal(size=lengths[0]), rng.normal(size=lengths[1])
+    np.testing.assert_allclose(convolve_arrays(x, h, method), np.convolve(x, h), atol=1e-9)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_convolve_and_correlate_match_dict_reference(method):
+    rng = np.random.default_rng(4)
+    a = _signal_dict(rng, -20, 400)
+    # Two clusters separated by more than CLUSTER_GAP, with holes.
+    b = {**_signal_dict(rng, 5, 30, 0.7), **_signal_dict(rng, 2000, 20, 0.7)}
+    _assert_matches(Signal(a).convolve(Signal(b), method), _dict_convolve(a, b))
+    folded = {-i: v for i, v in b.items()}
+    _assert_matches(Signal(a).correlate(Signal(b), method), _dict_convolve(a, folded))
+
+
+def test_many_clusters_use_pairwise_products(monkeypatch):
+    monkeypatch.setattr(convolution, "MAX_CLUSTER_PAIRS", 4)
+    rng = np.random.default_rng(5)
+    a = {int(i): float(rng.normal()) for i in rng.choice(10**6, 40, replace=False)}
+    b = {int(i): float(rng.normal()) for i in rng.choice(10**6, 30, replace=False)}
+    _assert_matches(Signal(a).convolve(Signal(b)), _dict_convolve(a, b))
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        Signal({0: 1.0}).convolve(Signal({0: 1.0}), method="winograd")
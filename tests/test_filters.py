@@ -0,0 +1,148 @@
+"""Filters checked against direct formulas, in one piece and block by block."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from signal_app.filters import (
+    Biquad,
+    FIRFilter,
+    MovingAverage,
+    RunningStats,
+    butterworth,
+    filter_signal,
+    fir_lowpass,
+    make_filter,
+)
+from signal_app.signals import Signal
+
+
+def _response(filt, freqs: np.ndarray) -> np.ndarray:
+    """|H| of a cascade of sections at ``freqs`` (fractions of the sampling rate)."""
+    z = np.exp(-2j * np.pi * freqs)
+    h = np.ones_like(z)
+    for sec in filt.sections:
+        (b0, b1, b2), (a1, a2) = sec.b, sec.a
+        h *= (b0 + b1 * z + b2 * z * z) / (1 + a1 * z + a2 * z * z)
+    return np.abs(h)
+
+
+def _direct_biquad(sec: Biquad, x: np.ndarray) -> np.ndarray:
+    (b0, b1, b2), (a1, a2) = sec.b, sec.a
+    y = np.zeros(len(x))
+    for n in range(len(x)):
+        y[n] = b0 * x[n] + (b1 * x[n - 1] if n >= 1 else 0) + (b2 * x[n - 2] if n >= 2 else 0)
+        y[n] -= (a1 * y[n - 1] if n >= 1 else 0) + (a2 * y[n - 2] if n >= 2 else 0)
+    return y
+
+
+def _in_blocks(filt, x: np.ndarray, sizes) -> np.ndarray:
+    filt.reset()
+    out, lo = [], 0
+    for size in sizes:
+        out.append(filt.process(x[lo : lo + size]))
+        lo += size
+    out.append(filt.process(x[lo:]))
+    return np.concatenate(out)
+
+
+@pytest.mark.parametrize("kind", ["lowpass", "highpass"])
+@pytest.mark.parametrize("order", range(1, 7))
+def test_butterworth_half_power_at_cutoff_and_monotone(order, kind):
+    cutoff = 0.12
+    filt = butterworth(order, cutoff, kind)
+    assert len(filt.sections) == (order + 1) // 2
+    assert _response(filt, np.array([cutoff]))[0] == pytest.approx(1 / np.sqrt(2), rel=1e-9)
+    freqs = np.linspace(1e-4, 0.5 - 1e-4, 2000)
+    mag = _response(filt, freqs)
+    steps = np.diff(mag) if kind == "lowpass" else -np.diff(mag)
+    assert np.all(steps <= 1e-12)
+    edge = mag[0] if kind == "lowpass" else mag[-1]
+    assert edge == pytest.approx(1.0, abs=1e-6)
+
+
+def test_biquad_matches_direct_recursion_across_blocks():
+    x = np.random.default_rng(0).normal(size=3000)
+    filt = butterworth(4, 0.05)
+    expected = x
+    for sec in filt.sections:
+        expected = _direct_biquad(sec, expected)
+    np.testing.assert_allclose(_in_blocks(filt, x, [1, 2, 700, 5, 1500]), expected, atol=1e-10)
+
+
+def test_fir_matches_convolution_across_blocks():
+    x = np.random.default_rng(1).normal(size=1000)
+    taps = fir_lowpass(0.2, 31)
+    expected = np.convolve(x, taps)[: len(x)]
+    for method in ("direct", "fft"):
+        got = _in_blocks(FIRFilter(taps, method), x, [3, 1, 400, 17])
+        np.testing.assert_allclose(got, expected, atol=1e-12)
+
+
+def test_running_filters_match_windowed_reference():
+    x = np.random.default_rng(2).normal(size=500) + 100.0
+    n = 7
+    padded = np.concatenate((np.zeros(n - 1), x))
+    avg = np.array([padded[i : i + n].mean() for i in range(len(x))])
+    np.testing.assert_allclose(_in_blocks(MovingAverage(n), x, [2, 50, 1]), avg, atol=1e-9)
+    windows = [x[max(0, i - n + 1) : i + 1] for i in range(len(x))]
+    for stat, fn in (("mean", np.mean), ("var", np.var), ("std", np.std)):
+        expected = np.array([fn(w) for w in windows])
+        got = _in_blocks(RunningStats(n, stat), x, [1, 3, 60])
+        np.testing.assert_allclose(got, expected, atol=1e-8)
+
+
+def test_moving_average_keeps_precision_under_a_large_offset():
+    rng = np.random.default_rng(3)
+    x = 1e9 + rng.normal(size=20_000)
+    n = 5
+    expected = np.convolve(x - 1e9, np.ones(n) / n)[n - 1 : len(x)] + 1e9
+    got = _in_blocks(MovingAverage(n), x, [20_000])[n - 1 :]
+    np.testing.assert_allclose(got - 1e9, expected - 1e9, atol=1e-6)
+
+
+def test_filter_signal_fills_gaps_and_ignores_block_size():
+    sig = Signal({-3: 1.0, 0: 2.0, 4: -1.0, 9: 0.5})
+    dense = np.zeros(13)
+    for i, v in sig.samples.items():
+        dense[i + 3] = v
+    expected = _direct_biquad(butterworth(2, 0.2).sections[0], dense)
+    for block_size in (1, 4, 64):
+        out = filter_signal(sig, make_filter("iir-lowpass", 0.2), block_size=block_size)
+        idx, vals = out.to_sorted_arrays()
+        np.testing.assert_array_equal(idx, np.arange(-3, 10))
+        np.testing.assert_allclose(vals, _in_blocks(butterworth(4, 0.2), dense, []), atol=1e-12)
+    np.testing.assert_allclose(_in_blocks(butterworth(2, 0.2), dense, [5]), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "kind, value",
+    [("moving-average", 3), ("running-std", 4), ("fir-lowpass", 0.2), ("iir-highpass", 0.1)],
+)
+def test_filter_signal_skips_settled_gaps(kind, value):
+    huge = filter_signal(Signal({0: 1.0, 10**12: 2.0}), make_filter(kind, value))
+    idx, vals = huge.to_sorted_arrays()
+    assert idx[0] == 0 and idx[-1] == 10**12 and len(idx) < 10_000
+    # Where a gap was skipped, the dense result is 0 anyway.
+    sig = Signal({0: 1.0, 3: -1.0, 5000: 2.0, 5001: 0.5, 9000: 1.0})
+    sparse = filter_signal(sig, make_filter(kind, value), block_size=256)
+    dense = filter_signal(sig, make_filter(kind, value), block_size=10**5)
+    assert len(sparse.samples) < len(dense.samples)
+    got = dict(sparse.samples.items())
+    for i, v in dense.samples.items():
+        # A running std of zeros is sqrt(rounding error) in the dense pass.
+        assert got.get(i, 0.0) == pytest.approx(v, abs=1e-7)
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        butterworth(0, 0.1)
+    with pytest.raises(ValueError):
+        butterworth(2, 0.6)
+    with pytest.raises(ValueError):
+        make_filter("notch", 0.1)
+    for kind in ("moving-average", "running-std", "iir-lowpass"):
+        for value in (float("inf"), float("nan"), 0, -3):
+            with pytest.raises(ValueError):
+                make_filter(kind, value)
@@ -0,0 +1,57 @@
+"""Import-time budget for the GUI-free core.
+
+Batch workers and scripts import `signal_app.signals` only; it must not pull
+in Tkinter or Matplotlib, and the GUI module defers Matplotlib until its
+canvas is built. Imports run in a fresh interpreter so earlier imports in
+the test session do not hide the cost.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_MODULES = ("tkinter", "matplotlib")
+# Milliseconds `import signal_app.signals` may add on top of NumPy itself.
+CORE_BUDGET_MS = 250
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _loaded_after(module: str) -> set:
+    out = _run(f"import sys, {module}; print(' '.join(sys.modules))").stdout
+    return {name.split(".")[0] for name in out.split()}
+
+
+def _cumulative_us(importtime: str, module: str) -> int:
+    """Cumulative microseconds of ``module`` in ``-X importtime`` output."""
+    for line in importtime.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} not found in import timings")
+
+
+def test_core_import_skips_gui_modules():
+    loaded = _loaded_after("signal_app.signals")
+    assert not loaded.intersection(GUI_MODULES)
+
+
+def test_app_import_defers_matplotlib():
+    assert "matplotlib" not in _loaded_after("signal_app.app")
+
+
+def test_core_import_time_budget():
+    timings = _run("import signal_app.signals", "-X", "importtime").stderr
+    own_us = _cumulative_us(timings, "signal_app.signals") - _cumulative_us(timings, "numpy")
+    assert own_us < CORE_BUDGET_MS * 1000, f"signal_app.signals took {own_us / 1000:.0f} ms"
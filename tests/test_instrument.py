@@ -0,0 +1,100 @@
+"""Instrumentation: the on/off switch, aggregation and transparent wrapping."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from signal_app import instrument
+from signal_app.signals import Signal
+
+
+@pytest.fixture
+def profiling():
+    was_enabled = instrument.is_enabled()
+    instrument.enable()
+    instrument.reset()
+    yield
+    instrument.reset()
+    if not was_enabled:
+        instrument.disable()
+
+
+@pytest.mark.parametrize("value, expected", [("1", "True"), ("", "False")])
+def test_environment_switch(value, expected):
+    env = dict(os.environ, **{instrument.PROFILE_ENV: value})
+    out = subprocess.run(
+        [sys.executable, "-c", "from signal_app import instrument; print(instrument.is_enabled())"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == expected
+
+
+def test_disabled_calls_record_nothing(profiling):
+    instrument.disable()
+    Signal({0: 1.0}).add(Signal({1: 2.0}))
+    with instrument.timed("block"):
+        pass
+    assert instrument.stats() == {}
+
+
+def test_calls_are_aggregated_per_name(profiling):
+    sig = Signal({i: float(i) for i in range(100)})
+    sig.add(sig)
+    sig.add(sig)
+    lazy = sig.multiply(2.0)
+    lazy.materialize()
+    sig.clone()
+    with instrument.timed("block") as t:
+        t.samples, t.nbytes = 5, 40
+    stats = instrument.stats()
+    assert stats["Signal.add"].calls == 2
+    assert stats["Signal.add"].samples == 200
+    assert stats["Signal.add"].nbytes > 0
+    assert stats["Signal.multiply"].nbytes == 0  # a lazy view shares its parent's arrays
+    assert stats["Signal.materialize"].calls == stats["Signal.clone"].calls == 1
+    assert (stats["block"].samples, stats["block"].nbytes) == (5, 40)
+    assert stats["Signal.add"].mean_seconds == pytest.approx(stats["Signal.add"].seconds / 2)
+    assert instrument.last_call()[0] == "block"
+
+
+def test_wrapped_functions_keep_results_and_exceptions(profiling):
+    @instrument.instrumented("double")
+    def double(x, scale=2):
+        """Docstring kept."""
+        return x * scale
+
+    @instrument.instrumented("fail")
+    def fail():
+        raise KeyError("missing")
+
+    assert double(4, scale=3) == 12
+    assert double.__doc__ == "Docstring kept." and double.__name__ == "double"
+    with pytest.raises(KeyError, match="missing"):
+        fail()
+    instrument.disable()
+    assert double(5) == 10
+    with pytest.raises(KeyError):
+        fail()
+    assert set(instrument.stats()) == {"double"}
+
+
+def test_dumps(profiling, tmp_path):
+    instrument.record("op", 0.5, samples=3, nbytes=24)
+    instrument.record("op", 1.5)
+    instrument.dump_json(str(tmp_path / "stats.json"))
+    instrument.dump_csv(str(tmp_path / "stats.csv"))
+    with open(tmp_path / "stats.json", encoding="utf-8") as f:
+        (row,) = json.load(f)
+    assert row["calls"] == 2 and row["seconds"] == 2.0 and row["mean_seconds"] == 1.0
+    with open(tmp_path / "stats.csv", encoding="utf-8", newline="") as f:
+        (csv_row,) = list(csv.DictReader(f))
+    assert csv_row["name"] == "op" and csv_row["samples"] == "3"
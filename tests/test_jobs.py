@@ -0,0 +1,85 @@
+"""Job delivery through a fake ``after`` standing in for the Tk main loop."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from signal_app.jobs import CANCELLED, DONE, FAILED, JobManager
+
+
+class FakeLoop:
+    """Collects ``after`` callbacks and runs them on demand."""
+
+    def __init__(self) -> None:
+        self.scheduled = []
+
+    def after(self, _ms, fn) -> None:
+        self.scheduled.append(fn)
+
+    def run(self, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while self.scheduled:
+            assert time.monotonic() < deadline, "jobs did not finish"
+            time.sleep(0.002)
+            self.scheduled.pop(0)()
+
+
+@pytest.fixture
+def loop_and_manager():
+    loop = FakeLoop()
+    manager = JobManager(loop.after, max_workers=2)
+    yield loop, manager
+    manager.shutdown()
+
+
+def test_results_and_errors_are_delivered_on_the_loop(loop_and_manager):
+    loop, manager = loop_and_manager
+    delivered = []
+
+    def fail(_job):
+        raise ValueError("bad input")
+
+    done = manager.submit("add", lambda _job, a, b: a + b, 2, 3, on_done=delivered.append)
+    failed = manager.submit("fail", fail, on_error=delivered.append)
+    assert delivered == []  # nothing runs outside the loop
+    loop.run()
+    assert (done.status, failed.status) == (DONE, FAILED)
+    assert delivered[0] == 5 and isinstance(delivered[1], ValueError)
+    assert manager.active() == [] and not manager._polling
+
+
+def test_cancelled_jobs_deliver_nothing(loop_and_manager):
+    loop, manager = loop_and_manager
+    started = threading.Event()
+    delivered = []
+
+    def wait_for_cancel(job):
+        started.set()
+        while True:
+            job.report(0.5)
+            time.sleep(0.001)
+
+    running = manager.submit("run", wait_for_cancel, on_done=delivered.append)
+    started.wait(5)
+    manager.cancel(running)
+    loop.run()
+    assert running.status == CANCELLED
+    assert delivered == []
+
+
+def test_a_raising_callback_does_not_stop_delivery(loop_and_manager, capsys):
+    loop, manager = loop_and_manager
+    delivered = []
+
+    def broken(_result):
+        raise RuntimeError("widget destroyed")
+
+    manager.submit("first", lambda _job: 1, on_done=broken)
+    loop.run()
+    assert "widget destroyed" in capsys.readouterr().err
+    manager.submit("second", lambda _job: 2, on_done=delivered.append)
+    loop.run()
+    assert delivered == [2]
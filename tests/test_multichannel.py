@@ -0,0 +1,87 @@
+"""Multichannel batches checked channel by channel against `Signal`."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from signal_app.multichannel import SignalBatch, parse_channels
+from signal_app.signals import Signal
+
+
+def _items(sig: Signal) -> dict:
+    return dict(sig.samples.items())
+
+
+def _batch(seed: int, channels: int = 3) -> SignalBatch:
+    rng = np.random.default_rng(seed)
+    indices = np.sort(rng.choice(np.arange(-200, 200), size=120, replace=False))
+    return SignalBatch(indices, rng.normal(size=(channels, len(indices))), name="b")
+
+
+def _dense_items(batch: SignalBatch, c: int) -> dict:
+    return dict(zip(batch.indices.tolist(), batch.values[c].tolist()))
+
+
+def test_operations_match_per_channel_signals():
+    batch = _batch(0)
+    scaled = batch.multiply([1.0, -2.0, 0.5])
+    shifted, folded = batch.shift(4), batch.fold()
+    for c, factor in enumerate([1.0, -2.0, 0.5]):
+        sig = batch.channel(c)
+        assert _dense_items(scaled, c) == _items(sig.multiply(factor))
+        assert _dense_items(shifted, c) == _items(sig.shift(4))
+        assert _dense_items(folded, c) == _items(sig.fold())
+
+
+def test_add_and_subtract_broadcast_over_the_index_union():
+    a, b = _batch(1), _batch(2, channels=1)
+    other = Signal({5: 1.0, 1000: 2.0})
+    total, diff = a.add(b), a.subtract(other)
+    for c in range(a.channels):
+        # On a shared axis missing samples are 0, which `Signal` leaves out.
+        expected = a.channel(c).add(b.channel(0))
+        got = _dense_items(total, c)
+        assert {i: v for i, v in got.items() if i in _items(expected)} == _items(expected)
+        expected_diff = _items(a.channel(c).subtract(other))
+        assert {i: _dense_items(diff, c)[i] for i in expected_diff} == expected_diff
+    with pytest.raises(ValueError):
+        a.add(_batch(3, channels=2))
+
+
+def test_txt_duplicates_keep_the_last_row_like_signals(tmp_path):
+    path = tmp_path / "multi.txt"
+    path.write_text("4\n3 1 10\n1 2 20\n3 5 50\n2 6 60\n")
+    batch = SignalBatch.from_file(str(path))
+    np.testing.assert_array_equal(batch.indices, [1, 2, 3])
+    np.testing.assert_array_equal(batch.values, [[2, 6, 5], [20, 60, 50]])
+    single = tmp_path / "single.txt"
+    single.write_text("4\n3 1\n1 2\n3 5\n2 6\n")
+    assert _items(Signal.from_file(str(single))) == _dense_items(batch, 0)
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".sigbin"])
+def test_file_round_trip(tmp_path, suffix):
+    batch = _batch(4)
+    path = str(tmp_path / f"batch{suffix}")
+    if suffix == ".txt":
+        batch.to_txt_file(path)
+    else:
+        batch.to_binary_file(path)
+    loaded = SignalBatch.from_file(path)
+    np.testing.assert_array_equal(loaded.indices, batch.indices)
+    np.testing.assert_array_equal(loaded.values, batch.values)
+
+
+def test_from_signals_stacks_on_the_index_union():
+    signals = [Signal({0: 1.0, 2: 2.0}), Signal({1: 3.0})]
+    batch = SignalBatch.from_signals(signals)
+    np.testing.assert_array_equal(batch.indices, [0, 1, 2])
+    np.testing.assert_array_equal(batch.values, [[1, 0, 2], [0, 3, 0]])
+
+
+def test_parse_channels():
+    assert parse_channels("", 3) == [0, 1, 2]
+    assert parse_channels("0-1, 3", 4) == [0, 1, 3]
+    with pytest.raises(ValueError):
+        parse_channels("2-5", 4)
@@ -0,0 +1,102 @@
+"""Out-of-core operations in small chunks against the in-memory `Signal` ones."""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pytest
+
+from signal_app.binio import BinaryWriter
+from signal_app.outofcore import DiskSignal, weighted_sum
+from signal_app.signals import Signal
+from signal_app.txtio import TxtWriter
+
+CHUNK = 7
+
+
+def _items(sig: Signal) -> dict:
+    return dict(sig.samples.items())
+
+
+def _write(tmp_path, name: str, sig: Signal, suffix: str) -> DiskSignal:
+    path = str(tmp_path / f"{name}{suffix}")
+    if suffix == ".txt":
+        sig.to_txt_file(path)
+    else:
+        sig.to_binary_file(path)
+    return DiskSignal(path, chunk_size=CHUNK)
+
+
+def _signals():
+    rng = np.random.default_rng(0)
+    dense = Signal({i: float(v) for i, v in zip(range(-20, 40), rng.normal(size=60))})
+    sparse_idx = rng.choice(np.arange(-100, 100), size=45, replace=False)
+    sparse = Signal({int(i): float(v) for i, v in zip(sparse_idx, rng.normal(size=45))})
+    return dense, sparse
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".sigbin"])
+@pytest.mark.parametrize("out_suffix", [".txt", ".sigbin"])
+def test_unary_operations_match_memory(tmp_path, suffix, out_suffix):
+    for n, sig in enumerate(_signals()):
+        disk = _write(tmp_path, f"in{n}", sig, suffix)
+        out = str(tmp_path / f"out{n}")
+        cases = [
+            (disk.multiply(-1.5, out + "_m" + out_suffix), sig.multiply(-1.5)),
+            (disk.shift(-4, out + "_s" + out_suffix), sig.shift(-4)),
+            (disk.fold(out + "_f" + out_suffix), sig.fold()),
+        ]
+        for result, expected in cases:
+            assert _items(result.to_signal()) == _items(expected)
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".sigbin"])
+def test_merges_match_memory(tmp_path, suffix):
+    dense, sparse = _signals()
+    a, b = _write(tmp_path, "a", dense, suffix), _write(tmp_path, "b", sparse, suffix)
+    c = _write(tmp_path, "c", sparse.shift(3), suffix)
+    out = str(tmp_path / "out.sigbin")
+    assert _items(a.add(b, out).to_signal()) == pytest.approx(_items(dense.add(sparse)))
+    assert _items(a.subtract(b, out).to_signal()) == pytest.approx(_items(dense.subtract(sparse)))
+    weights = [0.5, -2.0, 3.0]
+    expected = Signal.sum([dense, sparse, sparse.shift(3)], weights=weights)
+    got = weighted_sum([a, b, c], weights, out).to_signal()
+    assert _items(got) == pytest.approx(_items(expected))
+    with pytest.raises(ValueError):
+        weighted_sum([a, b], [1.0], out)
+
+
+def test_txt_repeated_indices_keep_the_last_value_across_chunks(tmp_path):
+    path = tmp_path / "dup.txt"
+    rows = [f"{i // 3} {i}" for i in range(90)]
+    path.write_text("0\n0\n90\n" + "\n".join(rows) + "\n")
+    expected = _items(Signal.from_file(str(path)))
+    got = DiskSignal(str(path), chunk_size=2).multiply(1.0, str(tmp_path / "out.txt"))
+    assert _items(got.to_signal()) == expected
+    path.write_text("0\n0\n3\n2 1\n1 1\n3 1\n")
+    with pytest.raises(ValueError):
+        DiskSignal(str(path), chunk_size=1).multiply(1.0, str(tmp_path / "bad.txt"))
+
+
+@pytest.mark.parametrize("writer_cls, suffix", [(TxtWriter, ".txt"), (BinaryWriter, ".sigbin")])
+def test_incremental_writers_round_trip(tmp_path, writer_cls, suffix):
+    indices = np.array([-5, -4, 0, 3, 10, 11, 12], dtype=np.int64)
+    values = np.linspace(-1.0, 2.0, len(indices))
+    path = str(tmp_path / f"w{suffix}")
+    with writer_cls(path) as writer:
+        writer.write(indices[:3], values[:3])
+        writer.write(indices[3:3], values[3:3])
+        writer.write(indices[3:], values[3:])
+    loaded = Signal.from_file(path)
+    assert _items(loaded) == dict(zip(indices.tolist(), values.tolist()))
+
+
+@pytest.mark.parametrize("suffix", [".txt", ".sigbin"])
+def test_output_may_replace_the_input(tmp_path, suffix):
+    dense, _sparse = _signals()
+    disk = _write(tmp_path, "same", dense, suffix)
+    disk.multiply(2.0, disk.path)
+    disk.fold(disk.path)
+    assert _items(disk.to_signal()) == _items(dense.multiply(2.0).fold())
+    assert os.listdir(tmp_path) == [f"same{suffix}"]
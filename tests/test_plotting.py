@@ -0,0 +1,63 @@
+"""Level-of-detail helpers: min/max envelopes and visible ranges."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from signal_app.plotting import minmax_envelope, visible_slice
+
+
+def _bucket_extrema(xs: np.ndarray, ys: np.ndarray, buckets: int) -> dict:
+    """Min and max per bucket of ``[xs[0], xs[-1]]`` split evenly, by brute force."""
+    edges = np.linspace(xs[0], xs[-1], buckets + 1)
+    out = {}
+    for k in range(buckets):
+        inside = (xs >= edges[k]) & ((xs < edges[k + 1]) if k < buckets - 1 else True)
+        if inside.any():
+            first = xs[inside][0]
+            out[first] = (ys[inside].min(), ys[inside].max())
+    return out
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("buckets", [1, 7, 100])
+def test_envelope_keeps_every_bucket_extremum(sparse, buckets):
+    rng = np.random.default_rng(buckets)
+    if sparse:
+        xs = np.sort(rng.choice(np.arange(-10**6, 10**6), size=5000, replace=False))
+    else:
+        xs = np.arange(-2500, 2500)
+    ys = rng.normal(size=len(xs))
+    ys[123] = 50.0  # a single spike must survive decimation
+    env_x, env_y = minmax_envelope(xs, ys, buckets)
+    assert len(env_x) <= 2 * buckets
+    assert env_y.max() == 50.0 and env_y.min() == ys.min()
+    got = {x: (lo, hi) for x, lo, hi in zip(env_x[0::2], env_y[0::2], env_y[1::2])}
+    assert got == _bucket_extrema(xs, ys, buckets)
+    assert np.all(env_x[0::2] == env_x[1::2])
+
+
+def test_envelope_passes_short_series_through():
+    for n in (0, 1, 20):
+        xs, ys = np.arange(n), np.arange(n, dtype=float)
+        env_x, env_y = minmax_envelope(xs, ys, 10)
+        assert env_x is xs and env_y is ys
+
+
+def test_visible_slice_pads_one_sample_each_side():
+    xs = np.array([0, 10, 20, 30, 40])
+    assert visible_slice(xs, 12, 28) == slice(1, 4)
+    assert visible_slice(xs, 10, 30) == slice(0, 5)
+    assert visible_slice(xs, -100, 100) == slice(0, 5)
+
+
+def test_visible_slice_edges():
+    assert visible_slice(np.array([], dtype=np.int64), 0, 10) == slice(0, 0)
+    one = np.array([5])
+    assert visible_slice(one, 0, 10) == slice(0, 1)
+    assert visible_slice(one, 6, 10) == slice(0, 1)  # the neighbour to the left
+    xs = np.array([0, 10, 20])
+    # A view between two samples keeps both, so the line still crosses it.
+    assert visible_slice(xs, 12, 18) == slice(1, 3)
+    assert visible_slice(xs, 50, 60) == slice(2, 3)
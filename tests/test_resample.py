@@ -0,0 +1,89 @@
+"""Resampling checked against the defining upsample-filter-downsample sum."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from signal_app.resample import (
+    decimate,
+    downsample,
+    interpolate,
+    resample,
+    resample_filter,
+    upsample,
+)
+from signal_app.signals import Signal
+
+
+def _brute_force(samples: dict, up: int, down: int, half_width: int = 10) -> dict:
+    """``y[m] = sum_n x[n] h[m * down - n * up]`` over the input's time range."""
+    g = math.gcd(up, down)
+    up, down = up // g, down // g
+    h, reach = resample_filter(up, down, half_width)
+    lo, hi = min(samples), max(samples)
+    out = {}
+    for m in range(-((-lo * up) // down), (hi * up) // down + 1):
+        acc = 0.0
+        for n, v in samples.items():
+            k = m * down - n * up
+            if abs(k) <= reach:
+                acc += v * h[k + reach]
+        out[m] = acc
+    return out
+
+
+def _items(sig: Signal) -> dict:
+    return dict(sig.samples.items())
+
+
+@pytest.mark.parametrize("up, down", [(3, 2), (2, 3), (1, 4), (5, 1), (4, 6)])
+def test_dense_resample_matches_brute_force(up, down):
+    rng = np.random.default_rng(up * 10 + down)
+    samples = {n: float(v) for n, v in zip(range(-13, 30), rng.normal(size=43))}
+    got = _items(resample(Signal(samples), up, down))
+    expected = _brute_force(samples, up, down)
+    assert got.keys() == expected.keys()
+    np.testing.assert_allclose(list(got.values()), list(expected.values()), atol=1e-12)
+
+
+def test_sparse_resample_matches_brute_force_near_its_samples():
+    samples = {-400: 1.0, -399: -0.5, 0: 2.0, 250: 0.75, 1000: -1.0}
+    got = _items(resample(Signal(samples), 3, 2, half_width=4))
+    expected = _brute_force(samples, 3, 2, half_width=4)
+    assert got.keys() <= expected.keys()
+    for m, v in expected.items():
+        assert got.get(m, 0.0) == pytest.approx(v, abs=1e-12)
+
+
+def test_integer_cases_and_dc_gain():
+    ones = Signal({n: 1.0 for n in range(-50, 51)})
+    assert _items(decimate(ones, 3)) == pytest.approx(_brute_force(_items(ones), 1, 3))
+    assert _items(interpolate(ones, 2)) == pytest.approx(_brute_force(_items(ones), 2, 1))
+    # Away from the edges a constant passes with unit gain.
+    middle = [v for m, v in _items(interpolate(ones, 4)).items() if abs(m) < 100]
+    np.testing.assert_allclose(middle, 1.0, atol=0.01)
+    same = Signal({0: 1.0, 2: 2.0})
+    assert _items(resample(same, 3, 3)) == _items(same)
+    assert _items(resample(Signal({}), 2, 3)) == {}
+
+
+def test_upsample_and_downsample_move_indices():
+    sig = Signal({-3: 1.0, 0: 2.0, 4: 3.0, 6: -1.0})
+    assert _items(upsample(sig, 2)) == {-6: 1.0, 0: 2.0, 8: 3.0, 12: -1.0}
+    assert _items(downsample(sig, 2)) == {0: 2.0, 2: 3.0, 3: -1.0}
+    assert _items(downsample(Signal({1: 1.0}), 2)) == {}
+
+
+def test_invalid_factors():
+    sig = Signal({0: 1.0})
+    for fn in (
+        lambda: resample(sig, 0, 2),
+        lambda: resample(sig, 2, 1, half_width=0),
+        lambda: upsample(sig, 0),
+        lambda: downsample(sig, 0),
+    ):
+        with pytest.raises(ValueError):
+            fn()
@@ -0,0 +1,63 @@
+"""Spectra checked against direct DFT sums and a hand-rolled Welch average."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from signal_app.signals import Signal
+from signal_app.spectral import SpectrumCache, dft, fft_size, welch_psd
+
+
+def _naive_dft(samples: dict, freqs: np.ndarray) -> np.ndarray:
+    n = np.array(list(samples), dtype=np.float64)
+    x = np.array(list(samples.values()))
+    return np.exp(-2j * np.pi * np.outer(freqs, n)) @ x
+
+
+def test_dft_matches_direct_sum_including_gaps_and_offset():
+    samples = {-5: 1.0, -2: 0.5, 3: -2.0, 7: 0.25}
+    spectrum = dft(Signal(samples))
+    assert len(spectrum.freqs) == fft_size(13) // 2 + 1
+    np.testing.assert_allclose(spectrum.values, _naive_dft(samples, spectrum.freqs), atol=1e-12)
+
+
+def test_shift_changes_only_the_phase_slope():
+    sig = Signal({0: 1.0, 1: -1.0, 2: 3.0})
+    base, shifted = dft(sig, 16), dft(sig.shift(4), 16)
+    np.testing.assert_allclose(shifted.magnitude, base.magnitude, atol=1e-12)
+    np.testing.assert_allclose(
+        shifted.values, base.values * np.exp(-2j * np.pi * base.freqs * 4), atol=1e-12
+    )
+    with pytest.raises(ValueError):
+        dft(sig, 2)
+
+
+def test_welch_matches_manual_average():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=1000)
+    nperseg, step = 64, 32
+    window = np.hanning(nperseg)
+    starts = range(0, len(x) - nperseg + 1, step)
+    periodograms = [np.abs(np.fft.rfft(x[s : s + nperseg] * window)) ** 2 for s in starts]
+    expected = np.mean(periodograms, axis=0) / np.sum(window**2)
+    expected[1:-1] *= 2
+    got = welch_psd(Signal({i: v for i, v in enumerate(x)}), nperseg, 0.5)
+    np.testing.assert_allclose(got.values, expected, rtol=1e-12)
+    # Parseval: the PSD integrates to the mean power of the signal.
+    assert np.sum(got.values) / nperseg == pytest.approx(np.mean(x**2), rel=0.1)
+
+
+def test_cache_hits_per_storage_and_parameters():
+    cache = SpectrumCache(max_entries=2)
+    sig = Signal({0: 1.0, 1: 2.0, 5: -1.0})
+    first = cache.dft(sig)
+    assert cache.dft(sig) is first
+    assert cache.dft(Signal(sig.samples, name="alias")) is first
+    assert (cache.hits, cache.misses) == (2, 1)
+    cache.welch_psd(sig, 4)
+    equal_copy = Signal({0: 1.0, 1: 2.0, 5: -1.0})
+    assert cache.dft(equal_copy) is not first
+    assert len(cache) == 2
+    # The oldest entry (the first DFT) was evicted.
+    assert cache.dft(sig) is not first
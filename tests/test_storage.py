@@ -0,0 +1,68 @@
+"""Sample storage checked against plain dict arithmetic."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from signal_app.signals import Signal
+from signal_app.storage import DenseSamples, SparseSamples, compact, weighted_sum
+
+
+def _dict_sum(parts, weights):
+    result = {}
+    for part, w in zip(parts, weights):
+        for idx, val in part.items():
+            result[idx] = result.get(idx, 0.0) + w * val
+    return result
+
+
+def _random_dict(rng, dense: bool) -> dict:
+    if dense:
+        start = int(rng.integers(-50, 50))
+        indices = range(start, start + int(rng.integers(40, 200)))
+    else:
+        indices = rng.choice(np.arange(-5000, 5000), size=60, replace=False).tolist()
+    return {int(i): float(rng.normal()) for i in indices}
+
+
+def test_compact_picks_dense_or_sparse_storage():
+    rng = np.random.default_rng(0)
+    assert isinstance(compact(_random_dict(rng, dense=True)), DenseSamples)
+    assert isinstance(compact(_random_dict(rng, dense=False)), SparseSamples)
+    assert compact({}) == {}
+
+
+@pytest.mark.parametrize("dense_a", [True, False])
+@pytest.mark.parametrize("dense_b", [True, False])
+def test_operations_match_dict_reference(dense_a, dense_b):
+    rng = np.random.default_rng(1)
+    a, b = _random_dict(rng, dense_a), _random_dict(rng, dense_b)
+    sa, sb = Signal(a), Signal(b)
+    assert dict(sa.samples.items()) == a
+    assert dict(sa.add(sb).samples.items()) == _dict_sum([a, b], [1.0, 1.0])
+    assert dict(sa.subtract(sb).samples.items()) == _dict_sum([a, b], [1.0, -1.0])
+    assert dict(sa.multiply(2.5).samples.items()) == {i: 2.5 * v for i, v in a.items()}
+    assert dict(sa.shift(3).samples.items()) == {i + 3: v for i, v in a.items()}
+    assert dict(sa.fold().samples.items()) == {-i: v for i, v in a.items()}
+
+
+def test_weighted_sum_matches_dict_reference():
+    rng = np.random.default_rng(2)
+    parts = [_random_dict(rng, dense) for dense in (True, False, True, True)]
+    weights = [1.0, -1.0, 0.5, 2.0]
+    expected = _dict_sum(parts, weights)
+    result = weighted_sum([compact(p) for p in parts], weights)
+    assert sorted(result) == sorted(expected)
+    for idx, val in expected.items():
+        assert result[idx] == pytest.approx(val)
+
+
+def test_weighted_sum_masks_gaps_between_overlapping_dense_parts():
+    # 120 samples over a span of 100, yet indices 40..59 are not covered.
+    a = DenseSamples(0, np.arange(40.0))
+    b = DenseSamples(60, np.ones(40))
+    parts, weights = [a, a, b], [1.0, -0.5, 2.0]
+    result = weighted_sum(parts, weights)
+    assert 50 not in result
+    assert dict(result.items()) == _dict_sum(parts, weights)
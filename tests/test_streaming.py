@@ -0,0 +1,170 @@
+"""Streaming operations checked against the same operation on whole arrays."""
+
+from __future__ import annotations
+
+import io
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from signal_app.filters import make_filter
+from signal_app.streaming import (
+    Block,
+    Combine,
+    Delay,
+    Filtered,
+    RingBuffer,
+    StreamPipeline,
+    StreamSource,
+    open_stream,
+    parse_stream_expression,
+)
+
+
+def _blocks(values: np.ndarray, start: int, rng) -> list:
+    cuts = np.sort(rng.choice(np.arange(1, len(values)), size=8, replace=False))
+    return [
+        Block(start + lo, part)
+        for lo, part in zip(np.concatenate(([0], cuts)), np.split(values, cuts))
+    ]
+
+
+def _source(text: str) -> StreamSource:
+    return StreamSource(lambda: io.StringIO(text), "test")
+
+
+def _wait_ended(pipeline: StreamPipeline) -> None:
+    deadline = time.monotonic() + 5
+    while not pipeline.ended:
+        pipeline.step()
+        assert time.monotonic() < deadline, "stream did not end"
+        time.sleep(0.01)
+
+
+def test_combine_matches_offline_sum_for_any_block_split():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=500), rng.normal(size=480)
+    combine = Combine([1.0, -2.0])
+    out = []
+    # b starts 20 samples later, so a's first 20 samples are never matched.
+    for block_a, block_b in zip(_blocks(a, 0, rng), _blocks(b, 20, rng)):
+        combine.push(0, block_a)
+        combine.push(1, block_b)
+        block = combine.pop()
+        while block is not None:
+            out.append(block)
+            block = combine.pop()
+    assert out[0].start == 20
+    np.testing.assert_allclose(np.concatenate([blk.values for blk in out]), a[20:] - 2.0 * b)
+
+
+def test_combine_emits_after_dropping_unmatched_samples():
+    combine = Combine([1.0, 1.0])
+    combine.push(0, Block(0, np.arange(10.0)))
+    combine.push(1, Block(5, np.ones(3)))
+    block = combine.pop()
+    assert block.start == 5
+    np.testing.assert_array_equal(block.values, [6.0, 7.0, 8.0])
+
+
+@pytest.mark.parametrize(
+    "make_op, reference",
+    [
+        (lambda: Delay(7), lambda x: np.concatenate((np.zeros(7), x[:-7]))),
+        (
+            lambda: Filtered(make_filter("moving-average", 5)),
+            lambda x: np.convolve(x, np.full(5, 0.2))[: len(x)],
+        ),
+    ],
+)
+def test_stateful_operations_are_block_invariant(make_op, reference):
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=300)
+    op = make_op()
+    out = np.concatenate([op.process(block).values for block in _blocks(x, 0, rng)])
+    np.testing.assert_allclose(out, reference(x), atol=1e-12)
+
+
+def test_ring_buffer_keeps_latest_samples():
+    ring = RingBuffer(capacity=10)
+    for lo in range(0, 25, 4):
+        ring.extend(Block(lo, np.arange(lo, lo + 4, dtype=float)))
+    indices, values = ring.arrays()
+    np.testing.assert_array_equal(indices, np.arange(18, 28))
+    np.testing.assert_array_equal(values, np.arange(18, 28, dtype=float))
+
+
+def test_pipeline_ends_only_when_no_more_output_can_come():
+    short = _source("0 1\n1 2\n2 3\n")
+    text = "".join(f"{i} {i}\n" for i in range(50))
+
+    def open_late() -> io.StringIO:
+        time.sleep(0.2)  # the short source ends before this one has data
+        return io.StringIO(text)
+
+    long = StreamSource(open_late, "late")
+    pipeline = StreamPipeline([short, long], [1.0, 1.0])
+    _wait_ended(pipeline)
+    indices, values = pipeline.buffer.arrays()
+    np.testing.assert_array_equal(values, [1.0, 3.0, 5.0])
+    np.testing.assert_array_equal(indices, [0, 1, 2])
+    pipeline.close()
+
+
+def test_single_source_pipeline_reads_everything():
+    pipeline = StreamPipeline([_source("".join(f"{v}\n" for v in range(100)))])
+    _wait_ended(pipeline)
+    assert len(pipeline.buffer) == 100
+
+
+def _wait_source(src: StreamSource) -> None:
+    deadline = time.monotonic() + 5
+    while not src._ended.is_set():
+        assert time.monotonic() < deadline, "source did not stop"
+        time.sleep(0.01)
+
+
+def test_stdin_is_left_open(monkeypatch):
+    stdin = io.StringIO("1\n2\n")
+    monkeypatch.setattr(sys, "stdin", stdin)
+    src = open_stream("-")
+    _wait_source(src)
+    assert not stdin.closed
+    assert src.read_block().values.tolist() == [1.0, 2.0]
+
+
+def test_infinite_index_ends_the_source_with_an_error():
+    src = _source("0 1\ninf 2\n")
+    _wait_source(src)
+    assert isinstance(src.error, ValueError)
+
+
+def test_close_interrupts_a_waiting_socket():
+    server = socket.create_server(("127.0.0.1", 0))
+    accepted = []
+    threading.Thread(target=lambda: accepted.append(server.accept()), daemon=True).start()
+    src = open_stream(f"tcp://127.0.0.1:{server.getsockname()[1]}")
+    try:
+        deadline = time.monotonic() + 5
+        while not accepted:
+            assert time.monotonic() < deadline, "no connection"
+            time.sleep(0.01)
+        time.sleep(0.05)  # let the reader block in readline
+        src.close()
+        _wait_source(src)
+        assert src.error is None
+    finally:
+        for conn, _addr in accepted:
+            conn.close()
+        server.close()
+
+
+def test_parse_stream_expression():
+    assert parse_stream_expression("a.txt + tcp://h:1 - b.txt") == (
+        ["a.txt", "tcp://h:1", "b.txt"],
+        [1.0, 1.0, -1.0],
+    )
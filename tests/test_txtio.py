@@ -0,0 +1,105 @@
+"""TXT parsing checked against the line-by-line `Signal.from_txt_lines`."""
+
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pytest
+
+from signal_app.signals import Signal
+from signal_app.txtio import read_txt_arrays, read_txt_columns, read_txt_file, write_txt_file
+
+
+def _reference(content: str) -> dict:
+    return dict(Signal.from_txt_lines(content.strip().splitlines()).samples.items())
+
+
+def _parsed(content: str, chunk_size: int) -> dict:
+    indices, values, _stats = read_txt_arrays(io.BytesIO(content.encode()), chunk_size)
+    return dict(zip(indices.tolist(), values.tolist()))
+
+
+def _content(rng, n: int, prefix: bool, newline: str = "\n") -> str:
+    indices = rng.integers(-1000, 1000, size=n)
+    values = rng.normal(size=n)
+    rows = [f"{i} {v!r}" for i, v in zip(indices.tolist(), values.tolist())]
+    header = ["0", "0", str(n)] if prefix else [str(n)]
+    return newline.join(header + rows) + newline
+
+
+@pytest.mark.parametrize("chunk_size", [16, 100, 4096])
+@pytest.mark.parametrize("prefix", [True, False])
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+def test_blocks_match_line_parser(chunk_size, prefix, newline):
+    content = _content(np.random.default_rng(chunk_size), 300, prefix, newline)
+    assert _parsed(content, chunk_size) == _reference(content)
+
+
+def test_irregular_rows_take_the_exact_path():
+    content = "3\n  1\t2.5\n2   -1e3  \n3 .5\n"
+    assert _parsed(content, 8) == _reference(content) == {1: 2.5, 2: -1000.0, 3: 0.5}
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["", "x\n1 2\n", "3\n1 2\n2 3\n", "2\n1 2 3\n2 3\n", "2\n1 a\n2 3\n"],
+)
+def test_errors_match_line_parser(content):
+    with pytest.raises(ValueError) as expected:
+        Signal.from_txt_lines(content.strip().splitlines())
+    with pytest.raises(ValueError, match=str(expected.value)):
+        read_txt_arrays(io.BytesIO(content.encode()), 8)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 8, 4096])
+def test_header_lines_end_like_splitlines(chunk_size):
+    content = "0\r0\x0c3\u2028 1 2\r\n2 3\x1e3 4\r"
+    assert _parsed(content, chunk_size) == _reference(content) == {1: 2.0, 2: 3.0, 3: 4.0}
+
+
+def test_columns_report_progress_for_every_block():
+    small = b"1\n1 2 3\n"
+    seen = []
+    read_txt_columns(io.BytesIO(small), progress=seen.append)
+    assert seen == [len(small)]
+    content = "".join(f"{i} {i} {-i}\n" for i in range(200))
+    f = io.BytesIO(f"200\n{content}".encode())
+    seen.clear()
+    read_txt_columns(f, chunk_size=64, progress=seen.append)
+    assert len(seen) > 1 and seen == sorted(seen)
+    assert seen[-1] == len(f.getvalue())
+
+
+def test_duplicate_index_keeps_last_value(tmp_path):
+    path = tmp_path / "dup.txt"
+    path.write_text("3\n5 1\n4 2\n5 3\n")
+    assert dict(Signal.from_txt_file(str(path)).samples.items()) == {4: 2.0, 5: 3.0}
+
+
+def test_write_then_read_round_trips(tmp_path):
+    path = str(tmp_path / "out.txt")
+    indices = np.arange(-5, 995, dtype=np.int64)
+    values = np.random.default_rng(3).normal(size=len(indices))
+    write_txt_file(path, indices, values, rows_per_chunk=64)
+    read_indices, read_values, stats = read_txt_file(path, chunk_size=256)
+    assert stats.samples == len(indices)
+    np.testing.assert_array_equal(read_indices, indices)
+    np.testing.assert_array_equal(read_values, values)
+
+
+@pytest.mark.parametrize("index", ["9999999999999999999999999", "-1e30", "inf"])
+def test_index_outside_int64_is_a_line_numbered_error(tmp_path, index):
+    path = tmp_path / "big.txt"
+    path.write_text(f"2\n1 1\n{index} 2\n")
+    with pytest.raises(ValueError, match="line 3"):
+        Signal.from_txt_file(str(path))
+    with pytest.raises(ValueError, match="line 3"):
+        Signal.from_txt_lines(path.read_text().splitlines())
+    with pytest.raises(ValueError, match="line 3"):
+        read_txt_columns(io.BytesIO(path.read_bytes()))
+
+
+def test_dict_index_outside_int64_raises_value_error():
+    with pytest.raises(ValueError):
+        Signal({10**25: 1.0})
@@ -0,0 +1,76 @@
+"""The golden-file harness must pass the real files and catch broken ones."""
+
+from __future__ import annotations
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from signal_app import verify
+from signal_app.verify import GoldenCase, compare_arrays, default_cases, run_case, run_cases
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN = (
+    "Signal1.txt",
+    "Signal2.txt",
+    "add.txt",
+    "subtract.txt",
+    "mul5.txt",
+    "delay3.txt",
+    "advance3.txt",
+    "folding.txt",
+)
+
+
+@pytest.fixture
+def golden_dir(tmp_path):
+    for name in GOLDEN:
+        shutil.copy(os.path.join(ROOT, name), tmp_path / name)
+    return tmp_path
+
+
+def test_course_files_pass(capsys):
+    assert verify.main(["--dir", ROOT]) == 0
+    assert "6/6 cases passed" in capsys.readouterr().out
+
+
+def test_a_corrupted_expected_file_fails(golden_dir, capsys):
+    path = golden_dir / "add.txt"
+    lines = path.read_text().splitlines()
+    index, value = lines[5].split()
+    lines[5] = f"{index} {float(value) + 0.5}"
+    path.write_text("\n".join(lines) + "\n")
+    assert verify.main(["--dir", str(golden_dir)]) == 1
+    out = capsys.readouterr().out
+    assert "add: FAILED" in out and f"first mismatch at n={index}" in out
+    assert "5/6 cases passed" in out
+
+
+def test_wrong_operation_and_missing_files_fail(golden_dir):
+    s1 = str(golden_dir / "Signal1.txt")
+    wrong = GoldenCase("fold vs shift", "fold", (s1,), str(golden_dir / "delay3.txt"))
+    missing = GoldenCase("missing", "fold", (s1,), str(golden_dir / "nope.txt"))
+    assert not run_case(wrong).passed
+    result = run_case(missing)
+    assert not result.passed and result.reason.startswith("FileNotFoundError")
+
+
+def test_compare_arrays_reports_each_kind_of_mismatch():
+    idx, vals = np.array([0, 1, 2]), np.array([1.0, 2.0, 3.0])
+    assert compare_arrays("ok", idx, vals, idx, vals + 0.001).passed
+    shorter = compare_arrays("len", idx[:2], vals[:2], idx, vals)
+    assert not shorter.passed and shorter.first_mismatch == 2
+    moved = compare_arrays("idx", np.array([0, 1, 3]), vals, idx, vals)
+    assert not moved.passed and moved.first_mismatch == 2
+    nan = compare_arrays("nan", idx, np.array([1.0, np.nan, 3.0]), idx, vals)
+    assert not nan.passed and nan.first_mismatch == 1
+
+
+def test_parallel_run_matches_serial(golden_dir):
+    cases = default_cases(str(golden_dir))
+    serial = run_cases(cases, processes=1)
+    parallel = run_cases(cases, processes=2)
+    assert [(r.name, r.passed) for r in parallel] == [(r.name, r.passed) for r in serial]
+    assert all(r.passed for r in serial)
@@ -0,0 +1,82 @@
+"""File watcher driven by a fake ``after`` instead of the Tk main loop."""
+
+from __future__ import annotations
+
+import os
+
+from signal_app.watch import FileWatcher
+
+
+class FakeLoop:
+    def __init__(self) -> None:
+        self.scheduled = []
+
+    def after(self, _ms, fn) -> None:
+        self.scheduled.append(fn)
+
+    def tick(self) -> None:
+        """Run the polls scheduled so far (they reschedule themselves)."""
+        pending, self.scheduled = self.scheduled, []
+        for fn in pending:
+            fn()
+
+
+def _setup(tmp_path):
+    path = str(tmp_path / "capture.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("1\n0 1\n")
+    os.utime(path, ns=(10**18, 10**18))
+    loop, changes = FakeLoop(), []
+    watcher = FileWatcher(loop.after, changes.append)
+    watcher.watch(path)
+    watcher.start()
+    return path, loop, changes, watcher
+
+
+def test_mtime_change_is_reported_once_after_it_settles(tmp_path):
+    path, loop, changes, _watcher = _setup(tmp_path)
+    loop.tick()
+    assert changes == []
+    os.utime(path, ns=(2 * 10**18, 2 * 10**18))
+    loop.tick()
+    assert changes == []  # may still be written
+    loop.tick()
+    assert changes == [path]
+    loop.tick()
+    loop.tick()
+    assert changes == [path]
+
+
+def test_size_change_with_the_same_mtime_is_reported(tmp_path):
+    path, loop, changes, _watcher = _setup(tmp_path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("1 2\n")
+    os.utime(path, ns=(10**18, 10**18))
+    loop.tick()
+    loop.tick()
+    assert changes == [path]
+
+
+def test_deleted_file_is_not_reported_until_it_returns(tmp_path):
+    path, loop, changes, _watcher = _setup(tmp_path)
+    os.remove(path)
+    loop.tick()
+    loop.tick()
+    assert changes == []
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("1\n0 5\n")
+    loop.tick()
+    loop.tick()
+    assert changes == [path]
+
+
+def test_stop_and_unwatch(tmp_path):
+    path, loop, changes, watcher = _setup(tmp_path)
+    watcher.unwatch(path)
+    os.utime(path, ns=(3 * 10**18, 3 * 10**18))
+    loop.tick()
+    loop.tick()
+    assert changes == []
+    watcher.stop()
+    loop.tick()
+    assert loop.scheduled == [] and not watcher.running